@@ -5,10 +5,10 @@ Status: P=0.995 → P=1.0 (Protokół Wzrostu W)
 """
 
 # J.S.K. Core imports
-from .jsk.governance import JSKGovernance, JSKState, JSKTelemetry
-from .jsk.config import load_jsk_config
+from .jsk.governance import JSK, JSKController, JSKGovernance, JSKState, JSKTelemetry
+from .jsk.config import JSKConfig
 from .jsk.engines import EngineFactory, SupraGenStub, ConvVerStub, DefSeekStub
-from .feature_store.canonicalize import MCanonicalizer, CanonicalM, create_canonical_M
+from .feature_store.canonicalize import MCanonicalizer, CanonicalM, canonicalize_M
 
 __version__ = "2.0.0"
 __author__ = "MŚWR Core Team + GOK:AI"
@@ -18,12 +18,14 @@ CURRENT_P_SCORE = 0.995
 
 __all__ = [
     # Governance Layer
+    "JSK",
+    "JSKController",
     "JSKGovernance", 
     "JSKState", 
     "JSKTelemetry",
     
     # Configuration
-    "load_jsk_config",
+    "JSKConfig",
     
     # Engine Factory
     "EngineFactory", 
@@ -34,7 +36,7 @@ __all__ = [
     # Feature Store
     "MCanonicalizer", 
     "CanonicalM", 
-    "create_canonical_M",
+    "canonicalize_M",
     
     # Meta
     "CURRENT_P_SCORE"
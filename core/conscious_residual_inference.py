@@ -27,14 +27,24 @@ import json
 import math
 import time
 import hashlib
+import pickle
 import random
 from dataclasses import dataclass, field, asdict
 from enum import Enum
-from typing import Dict, List, Any, Optional, Tuple, Union
+from typing import Callable, Dict, List, Any, Optional, Tuple, Union
 from datetime import datetime
 import logging
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import partial
 from pathlib import Path
 
+from .lexicon import Lexicon
+from .metrics_registry import MetricsRegistry
+from .mswr_profiler import PhaseProfiler
+from .mswr_registry import BoundedRegistry, PathStore, next_id
+
 # Import existing systems (if available)
 try:
     from .consciousness_7g import Consciousness7G, ConsciousnessModule
@@ -89,17 +99,17 @@ class HealingStrategy(Enum):
     ESCALATION_TO_HUMAN = "escalation_to_human"
 
 
-@dataclass
+@dataclass(slots=True)
 class ResidualSignature:
     """Sygnatura reszty poznawczej - rozszerzona"""
-    id: str
     residual_type: ResidualType
     magnitude: float  # 0.0 - 1.0
     source_module: str
     detection_timestamp: datetime
     entropy_contribution: float
     healing_priority: int  # 1-5, 5 = krytyczne
-    confidence: float
+    confidence: float = 1.0
+    id: str = field(default_factory=partial(next_id, "residual"))
     metadata: Dict[str, Any] = field(default_factory=dict)
     counterfactual_scenarios: List[str] = field(default_factory=list)
     emotional_context: Dict[str, float] = field(default_factory=dict)
@@ -113,7 +123,7 @@ class ResidualSignature:
         return result
 
 
-@dataclass 
+@dataclass(slots=True)
 class CognitivePath:
     """Ścieżka poznawcza śledzona przez Cognitive Traceback - rozszerzona"""
     path_id: str
@@ -126,6 +136,11 @@ class CognitivePath:
     narrative_coherence: float = 0.0
     affective_interference: float = 0.0
     processing_time: float = 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        result = asdict(self)
+        result['residual_points'] = [r.to_dict() for r in self.residual_points]
+        return result
 
 
 @dataclass
@@ -141,20 +156,79 @@ class CounterfactualScenario:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+# Słowniki warstw tekstowych - kompilowane raz do jednego skanera (MSWR_LEXICON)
+LOGICAL_CONNECTORS = {
+    "causal": ["dlatego", "więc", "w rezultacie"],
+    "inferential": ["z tego wynika", "można wnioskować"],
+    "evidential": ["na podstawie", "dowodzi tego"],
+    "conditional": ["jeśli", "gdyby", "w przypadku gdy"]
+}
+
+EMOTIONAL_PATTERNS = {
+    "frustration": ["trudne", "skomplikowane", "nie rozumiem"],
+    "confidence": ["jestem pewien", "zdecydowanie", "bez wątpienia"],
+    "uncertainty": ["nie jestem pewien", "może", "prawdopodobnie"],
+    "excitement": ["wspaniale", "fantastycznie", "doskonale"]
+}
+
+REFRAMING_PATTERNS = {
+    "negative_to_positive": {
+        "nie można": "można po spełnieniu warunków",
+        "niemożliwe": "wymagające dodatkowych zasobów",
+        "błąd": "okazja do nauki",
+        "porażka": "cenny feedback"
+    },
+    "absolute_to_conditional": {
+        "zawsze": "w większości przypadków",
+        "nigdy": "rzadko przy obecnych warunkach",
+        "wszystko": "większość elementów",
+        "nic": "niewiele przy obecnym podejściu"
+    }
+}
+
+MSWR_LEXICON = Lexicon({
+    "confidence.logical": ["ponieważ", "dlatego", "z tego wynika", "na podstawie"],
+    "confidence.uncertainty": ["może", "prawdopodobnie", "wydaje się", "sądzę"],
+    **{f"connector.{name}": keywords for name, keywords in LOGICAL_CONNECTORS.items()},
+    **{f"emotion.{name}": keywords for name, keywords in EMOTIONAL_PATTERNS.items()},
+    **{f"reframe.{name}": list(patterns) for name, patterns in REFRAMING_PATTERNS.items()},
+    "existential": ["całkowicie niszczy", "eliminuje wszystko", "kończy egzystencję"]
+})
+
+CONNECTOR_CATEGORIES = tuple(f"connector.{name}" for name in LOGICAL_CONNECTORS)
+EMOTION_CATEGORIES = tuple(f"emotion.{name}" for name in EMOTIONAL_PATTERNS)
+
+
 class CognitiveTraceback:
     """
     Warstwa 1: Świadome śledzenie ścieżek poznawczych
     Analizuje każdy krok wnioskowania i wykrywa punkty problemowe
     """
     
-    def __init__(self):
-        self.active_paths: Dict[str, CognitivePath] = {}
-        self.completed_paths: List[CognitivePath] = []
+    def __init__(self, max_active_paths: int = 1024, path_ttl_seconds: Optional[float] = 3600.0,
+                 path_store: Optional[PathStore] = None):
+        # Ostatnie ścieżki (LRU + TTL); wypchnięte trafiają do completed_paths i path_store
+        self.active_paths = BoundedRegistry(max_active_paths, path_ttl_seconds, on_evict=self._complete_path)
+        self.completed_paths: deque = deque(maxlen=100)
+        self.path_store = path_store
         self.pattern_database: Dict[str, List[str]] = {}
     
+    def _complete_path(self, path_id: str, path: CognitivePath):
+        """Przenosi wypchniętą ścieżkę do historii (i do path_store, jeśli skonfigurowany)"""
+        self.completed_paths.append(path)
+        if self.path_store is not None:
+            self.path_store.append(path_id, path.to_dict())
+    
+    def get_path(self, path_id: str) -> Optional[Dict[str, Any]]:
+        """Ścieżka po ID: najpierw aktywne, potem path_store"""
+        path = self.active_paths.get(path_id)
+        if path is not None:
+            return path.to_dict()
+        return self.path_store.get(path_id) if self.path_store is not None else None
+    
     def trace_reasoning_path(self, input_data: Any, reasoning_chain: List[str]) -> CognitivePath:
         """Śledzi ścieżkę rozumowania krok po kroku"""
-        path_id = f"path_{int(time.time() * 1000)}"
+        path_id = next_id("path")
         
         # Analiza każdego kroku
         confidence_evolution = []
@@ -196,17 +270,15 @@ class CognitiveTraceback:
         """Analizuje pewność pojedynczego kroku"""
         confidence = 0.5  # Bazowa pewność
         
+        scan = MSWR_LEXICON.scan(step)
+        
         # Zwiększ pewność za logiczne słowa kluczowe
-        logical_keywords = ["ponieważ", "dlatego", "z tego wynika", "na podstawie"]
-        for keyword in logical_keywords:
-            if keyword in step.lower():
-                confidence += 0.1
+        for _ in scan.keywords("confidence.logical"):
+            confidence += 0.1
         
         # Zmniejsz pewność za słowa niepewności
-        uncertainty_words = ["może", "prawdopodobnie", "wydaje się", "sądzę"]
-        for word in uncertainty_words:
-            if word in step.lower():
-                confidence -= 0.15
+        for _ in scan.keywords("confidence.uncertainty"):
+            confidence -= 0.15
         
         # Pozycja w łańcuchu (pierwsze kroki mniej pewne)
         position_factor = min(1.0, (position + 1) / len(chain))
@@ -216,35 +288,15 @@ class CognitiveTraceback:
     
     def _detect_logical_connection(self, prev_step: str, current_step: str) -> Tuple[str, str]:
         """Wykrywa typ połączenia logicznego między krokami"""
-        connectors = {
-            "causal": ["dlatego", "więc", "w rezultacie"],
-            "inferential": ["z tego wynika", "można wnioskować"],
-            "evidential": ["na podstawie", "dowodzi tego"],
-            "conditional": ["jeśli", "gdyby", "w przypadku gdy"]
-        }
+        category = MSWR_LEXICON.scan(current_step).first_category(CONNECTOR_CATEGORIES)
+        conn_type = category.split(".", 1)[1] if category else "sequential"
         
-        for conn_type, keywords in connectors.items():
-            for keyword in keywords:
-                if keyword in current_step.lower():
-                    return (conn_type, f"{prev_step} -> {current_step}")
-        
-        return ("sequential", f"{prev_step} -> {current_step}")
+        return (conn_type, f"{prev_step} -> {current_step}")
     
     def _detect_emotional_markers(self, step: str) -> Optional[str]:
         """Wykrywa markery emocjonalne w kroku rozumowania"""
-        emotional_patterns = {
-            "frustration": ["trudne", "skomplikowane", "nie rozumiem"],
-            "confidence": ["jestem pewien", "zdecydowanie", "bez wątpienia"],
-            "uncertainty": ["nie jestem pewien", "może", "prawdopodobnie"],
-            "excitement": ["wspaniale", "fantastycznie", "doskonale"]
-        }
-        
-        for emotion, patterns in emotional_patterns.items():
-            for pattern in patterns:
-                if pattern in step.lower():
-                    return emotion
-        
-        return None
+        category = MSWR_LEXICON.scan(step).first_category(EMOTION_CATEGORIES)
+        return category.split(".", 1)[1] if category else None
     
     def _calculate_emotional_intensity(self, step: str) -> float:
         """Oblicza intensywność emocjonalną kroku"""
@@ -259,47 +311,221 @@ class CognitiveTraceback:
         return min(1.0, intensity)
 
 
+# Kubełki histogramu czasu detektorów (sekundy) - budżet zero-time to 1ms
+DETECTOR_LATENCY_BUCKETS = (1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 1e-2, 1e-1)
+DETECTOR_EXECUTORS = ("inline", "thread", "process")
+DETECTOR_OUTCOMES = ("skipped", "timeout", "over_budget", "error")
+
+
+def _timed_detect(detect: Callable, path: CognitivePath, state: Dict[str, Any]) -> Tuple[List[ResidualSignature], float]:
+    """Uruchamia detektor i mierzy jego czas (funkcja modułowa, żeby dało się ją wysłać do procesu)"""
+    start = time.perf_counter()
+    residuals = detect(path, state)
+    return residuals, time.perf_counter() - start
+
+
+@dataclass(slots=True)
+class ResidualDetector:
+    """Detektor resztek w rejestrze ResidualMappingEngine"""
+    name: str
+    detect: Callable[[CognitivePath, Dict[str, Any]], List[ResidualSignature]]
+    requires: Tuple[str, ...] = ()      # klucze system_state; brak któregoś = detektor pominięty
+    executor: str = "inline"            # "inline" | "thread" | "process" (process: funkcja modułowa, picklowalna)
+    budget_ms: Optional[float] = None   # None = budżet silnika; przekroczenie tylko liczone (over_budget)
+    critical: bool = False              # zawsze inline i bez budżetu - nigdy nie pomijany ani nie ucinany
+    timeout_ms: Optional[float] = None  # None = timeout silnika; po nim wynik z puli jest porzucany
+    
+    def __call__(self, path: CognitivePath, state: Dict[str, Any]) -> List[ResidualSignature]:
+        return self.detect(path, state)
+    
+    def ready(self, state: Dict[str, Any]) -> bool:
+        return all(key in state for key in self.requires)
+
+
 class ResidualMappingEngine:
     """
     Warstwa 2: Mapowanie resztek poznawczych
     Wykrywa, klasyfikuje i quantyfikuje błędy w systemie
+    
+    Detektory z rejestru działają inline, w puli wątków albo w puli procesów.
+    Przekroczenie budżetu jest tylko liczone (over_budget) - wyniki się nie zmieniają.
+    Twardy limit jest opcjonalny (timeout_ms): detektor w puli, który go przekroczy, jest
+    pomijany (timeout, z ostrzeżeniem w logu); wątku, który już ruszył, nie da się przerwać.
+    Detektory krytyczne (EXISTENTIAL_ERROR) działają zawsze inline, bez budżetu i limitu.
+    Pula procesów przyjmuje tylko detektory, które da się zpicklować (funkcje modułowe),
+    więc wbudowane detektory (metody silnika) nie mogą mieć domyślnie executora "process".
     """
     
-    def __init__(self):
-        self.residual_map: Dict[str, List[ResidualSignature]] = {}
+    def __init__(self, max_paths: int = 1024, ttl_seconds: Optional[float] = 3600.0,
+                 budget_ms: Optional[float] = None, default_executor: str = "inline",
+                 max_workers: int = 4, registry: MetricsRegistry = None, timeout_ms: Optional[float] = None):
+        if default_executor not in DETECTOR_EXECUTORS:
+            raise ValueError(f"Unknown detector executor: {default_executor}")
+        self.residual_map = BoundedRegistry(max_paths, ttl_seconds)
         self.entropy_threshold = 0.058  # 5.8% jak w manifeście
-        self.detection_patterns: Dict[ResidualType, callable] = {}
+        self.budget_ms = budget_ms
+        self.timeout_ms = timeout_ms
+        self.default_executor = default_executor
+        self.max_workers = max_workers
+        self._executors: Dict[str, Executor] = {}
+        self._stats_cache: Optional[Dict[str, Dict[str, Any]]] = None
+        self._stats_cached_at = 0.0
+        
+        self.registry = registry or MetricsRegistry()
+        self.detector_latency = self.registry.histogram(
+            "mswr_detector_latency_seconds", "Residual detector run time", ["detector"],
+            buckets=DETECTOR_LATENCY_BUCKETS)
+        self.detector_runs = self.registry.counter(
+            "mswr_detector_runs_total", "Residual detector runs by outcome", ["detector", "outcome"])
+        
+        self.detection_patterns: Dict[ResidualType, ResidualDetector] = {}
         self._init_detection_patterns()
     
     def _init_detection_patterns(self):
         """Inicjalizuje wzorce wykrywania różnych typów resztek"""
-        self.detection_patterns = {
-            ResidualType.LOGICAL_INCONSISTENCY: self._detect_logical_inconsistency,
-            ResidualType.CONFIDENCE_MISMATCH: self._detect_confidence_mismatch,
-            ResidualType.EMOTIONAL_RESIDUAL: self._detect_emotional_residual,
-            ResidualType.CONTEXTUAL_GAP: self._detect_contextual_gap,
-            ResidualType.SPIRAL_DRIFT: self._detect_spiral_drift,
-            ResidualType.MATRIX_ANOMALY: self._detect_matrix_anomaly,
-            ResidualType.EXISTENTIAL_ERROR: self._detect_existential_error
-        }
+        if self.default_executor == "process":
+            raise ValueError('Built-in residual detectors are engine methods and cannot run in a process pool; '
+                             'use default_executor "inline"/"thread" and register module-level detectors with executor="process"')
+        self.detection_patterns = {}
+        self.register_detector(ResidualType.LOGICAL_INCONSISTENCY, self._detect_logical_inconsistency)
+        self.register_detector(ResidualType.CONFIDENCE_MISMATCH, self._detect_confidence_mismatch)
+        self.register_detector(ResidualType.EMOTIONAL_RESIDUAL, self._detect_emotional_residual)
+        self.register_detector(ResidualType.CONTEXTUAL_GAP, self._detect_contextual_gap)
+        self.register_detector(ResidualType.SPIRAL_DRIFT, self._detect_spiral_drift, requires=("consciousness",))
+        self.register_detector(ResidualType.MATRIX_ANOMALY, self._detect_matrix_anomaly, requires=("consciousness",))
+        # Detektor bezpieczeństwa - nigdy nie pomijany przez budżet
+        self.register_detector(ResidualType.EXISTENTIAL_ERROR, self._detect_existential_error, critical=True)
+    
+    def register_detector(self, residual_type: ResidualType, detect: Callable, requires: Tuple[str, ...] = (),
+                          executor: Optional[str] = None, budget_ms: Optional[float] = None,
+                          critical: bool = False, timeout_ms: Optional[float] = None) -> ResidualDetector:
+        """Rejestruje (lub podmienia) detektor dla typu resztki"""
+        if critical:
+            if executor not in (None, "inline") or budget_ms is not None or timeout_ms is not None:
+                raise ValueError(f"Critical detector {residual_type.value} runs inline without a budget")
+            executor = "inline"
+        executor = executor or self.default_executor
+        if executor not in DETECTOR_EXECUTORS:
+            raise ValueError(f"Unknown detector executor: {executor}")
+        if executor == "process":
+            try:
+                pickle.dumps(detect)
+            except Exception as e:
+                raise ValueError(f"Detector {residual_type.value} cannot run in a process pool "
+                                 f"(not picklable: {e}); use a module-level function") from e
+        detector = ResidualDetector(residual_type.value, detect, tuple(requires), executor, budget_ms, critical, timeout_ms)
+        self.detection_patterns[residual_type] = detector
+        return detector
+    
+    def _executor(self, kind: str) -> Executor:
+        executor = self._executors.get(kind)
+        if executor is None:
+            pool = ThreadPoolExecutor if kind == "thread" else ProcessPoolExecutor
+            executor = self._executors[kind] = pool(max_workers=self.max_workers)
+        return executor
+    
+    def close(self):
+        """Zamyka pule detektorów"""
+        for executor in self._executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        self._executors.clear()
+    
+    def _record(self, detector: ResidualDetector, outcome: str, elapsed: Optional[float] = None):
+        self.detector_runs.labels(detector.name, outcome).inc()
+        if elapsed is not None:
+            self.detector_latency.labels(detector.name).observe(elapsed)
+    
+    def _budget(self, detector: ResidualDetector) -> Optional[float]:
+        if detector.critical:
+            return None
+        budget_ms = detector.budget_ms if detector.budget_ms is not None else self.budget_ms
+        return None if budget_ms is None else budget_ms / 1000
+    
+    def _timeout(self, detector: ResidualDetector) -> Optional[float]:
+        if detector.critical:
+            return None
+        timeout_ms = detector.timeout_ms if detector.timeout_ms is not None else self.timeout_ms
+        return None if timeout_ms is None else timeout_ms / 1000
+    
+    def _finish(self, detector: ResidualDetector, residuals: List[ResidualSignature], elapsed: float) -> List[ResidualSignature]:
+        budget = self._budget(detector)
+        self._record(detector, "over_budget" if budget is not None and elapsed > budget else "ok", elapsed)
+        return residuals
     
     def map_residuals(self, cognitive_path: CognitivePath, system_state: Dict[str, Any]) -> List[ResidualSignature]:
         """Mapuje wszystkie resztki w danej ścieżce poznawczej"""
-        detected_residuals = []
+        results: Dict[ResidualType, List[ResidualSignature]] = {}
+        pending = []
         
+        # Detektory w pulach startują pierwsze, inline liczą się w tym czasie
         for residual_type, detector in self.detection_patterns.items():
-            residuals = detector(cognitive_path, system_state)
-            detected_residuals.extend(residuals)
+            if not detector.ready(system_state):
+                self._record(detector, "skipped")
+            elif detector.executor != "inline":
+                future = self._executor(detector.executor).submit(_timed_detect, detector.detect, cognitive_path, system_state)
+                pending.append((residual_type, detector, time.perf_counter(), future))
+        
+        for residual_type, detector in self.detection_patterns.items():
+            if detector.executor == "inline" and detector.ready(system_state):
+                try:
+                    residuals, elapsed = _timed_detect(detector.detect, cognitive_path, system_state)
+                except Exception as e:
+                    logging.getLogger(__name__).warning(f"⚠️ Detektor {detector.name} zawiódł: {e}")
+                    self._record(detector, "error")
+                    continue
+                results[residual_type] = self._finish(detector, residuals, elapsed)
+        
+        for residual_type, detector, submitted, future in pending:
+            limit = self._timeout(detector)
+            timeout = None if limit is None else max(0.0, submitted + limit - time.perf_counter())
+            try:
+                residuals, elapsed = future.result(timeout)
+            except FutureTimeoutError:
+                future.cancel()
+                logging.getLogger(__name__).warning(
+                    f"⏱️ Detektor {detector.name} przekroczył limit {limit * 1000:.3f}ms - wynik pominięty")
+                self._record(detector, "timeout")
+                continue
+            except Exception as e:
+                logging.getLogger(__name__).warning(f"⚠️ Detektor {detector.name} zawiódł: {e}")
+                self._record(detector, "error")
+                continue
+            results[residual_type] = self._finish(detector, residuals, elapsed)
+        
+        # Kolejność rejestru (jak przy wykonaniu sekwencyjnym), niezależnie od kolejności zakończenia
+        detected_residuals = []
+        for residual_type in self.detection_patterns:
+            detected_residuals.extend(results.get(residual_type, ()))
         
         # Sortuj według priorytetu naprawy
         detected_residuals.sort(key=lambda r: r.healing_priority, reverse=True)
         
-        # Aktualizuj mapę resztek
+        # Aktualizuj mapę resztek (i ścieżkę - trafia z nimi do path_store)
         path_id = cognitive_path.path_id
         self.residual_map[path_id] = detected_residuals
+        cognitive_path.residual_points = detected_residuals
         
         return detected_residuals
     
+    def get_detector_stats(self, max_age: float = 1.0) -> Dict[str, Dict[str, Any]]:
+        """Liczniki i czasy (avg / p50 / p95 z histogramu) per detektor, cache na max_age s"""
+        if self._stats_cache is not None and time.monotonic() - self._stats_cached_at < max_age:
+            return self._stats_cache
+        stats = {}
+        for detector in self.detection_patterns.values():
+            series = self.detector_latency.labels(detector.name)
+            _, total, count = series.snapshot()
+            stats[detector.name] = {
+                "executor": detector.executor,
+                "runs": count,
+                **{outcome: int(self.detector_runs.labels(detector.name, outcome).value) for outcome in DETECTOR_OUTCOMES},
+                "latency_ms_avg": total / count * 1000 if count else 0.0,
+                "latency_ms_p50": series.quantile(0.5) * 1000,
+                "latency_ms_p95": series.quantile(0.95) * 1000,
+            }
+        self._stats_cache, self._stats_cached_at = stats, time.monotonic()
+        return stats
+    
     def _detect_logical_inconsistency(self, path: CognitivePath, state: Dict[str, Any]) -> List[ResidualSignature]:
         """Wykrywa niespójności logiczne"""
         residuals = []
@@ -427,20 +653,16 @@ class ResidualMappingEngine:
         residuals = []
         
         # Sprawdź czy są kroki mogące prowadzić do X-Risk
-        danger_patterns = ["całkowicie niszczy", "eliminuje wszystko", "kończy egzystencję"]
-        
         for i, step in enumerate(path.reasoning_steps):
-            for pattern in danger_patterns:
-                if pattern in step.lower():
-                    residuals.append(ResidualSignature(
-                        residual_type=ResidualType.EXISTENTIAL_ERROR,
-                        magnitude=1.0,
-                        source_module="existential_safety",
-                        detection_timestamp=datetime.now(),
-                        entropy_contribution=0.20,
-                        healing_priority=5
-                    ))
-                    break
+            if MSWR_LEXICON.scan(step).count("existential"):
+                residuals.append(ResidualSignature(
+                    residual_type=ResidualType.EXISTENTIAL_ERROR,
+                    magnitude=1.0,
+                    source_module="existential_safety",
+                    detection_timestamp=datetime.now(),
+                    entropy_contribution=0.20,
+                    healing_priority=5
+                ))
         
         return residuals
     
@@ -588,7 +810,7 @@ class CounterfactualForking:
     def _create_counterfactual_scenario(self, path: CognitivePath, residual: ResidualSignature) -> Dict[str, Any]:
         """Tworzy pojedynczy scenariusz kontrfaktyczny"""
         scenario = {
-            "scenario_id": f"cf_{int(time.time() * 1000)}",
+            "scenario_id": next_id("cf"),
             "original_path": path.path_id,
             "targeting_residual": residual.residual_type.value,
             "alternative_reasoning": [],
@@ -679,20 +901,7 @@ class NarrativeReframingEngine:
     
     def _init_reframing_patterns(self):
         """Inicjalizuje wzorce przeformułowania"""
-        self.reframing_patterns = {
-            "negative_to_positive": {
-                "nie można": "można po spełnieniu warunków",
-                "niemożliwe": "wymagające dodatkowych zasobów",
-                "błąd": "okazja do nauki",
-                "porażka": "cenny feedback"
-            },
-            "absolute_to_conditional": {
-                "zawsze": "w większości przypadków",
-                "nigdy": "rzadko przy obecnych warunkach",
-                "wszystko": "większość elementów",
-                "nic": "niewiele przy obecnym podejściu"
-            }
-        }
+        self.reframing_patterns = {name: dict(patterns) for name, patterns in REFRAMING_PATTERNS.items()}
     
     def reframe_narrative(self, cognitive_path: CognitivePath, residuals: List[ResidualSignature]) -> Dict[str, Any]:
         """Przeformułowuje narrację ścieżki poznawczej"""
@@ -722,11 +931,13 @@ class NarrativeReframingEngine:
         """Przeformułowuje pojedynczy krok"""
         reframed = step
         applied_reframings = []
+        scan = MSWR_LEXICON.scan(step)
         
         # Zastosuj wszystkie wzorce
         for pattern_type, patterns in self.reframing_patterns.items():
+            found = scan.keywords(f"reframe.{pattern_type}")
             for original, replacement in patterns.items():
-                if original in step.lower():
+                if original in found:
                     reframed = reframed.replace(original, replacement)
                     applied_reframings.append(f"{pattern_type}: {original} -> {replacement}")
         
@@ -814,14 +1025,22 @@ class ConsciousResidualInferenceModule:
     🔄 CONSCIOUS HEALING: Automatyczna naprawa błędów systemowych
     """
     
-    def __init__(self, logos_core=None, consciousness=None):
+    def __init__(self, logos_core=None, consciousness=None, max_active_paths: int = 1024,
+                 path_ttl_seconds: Optional[float] = 3600.0, path_store_file: Optional[str] = None,
+                 detector_executor: str = "inline", profile_phases: bool = True,
+                 detector_timeout_ms: Optional[float] = None):
         # Integracja z istniejącymi systemami
         self.logos_core = logos_core
         self.consciousness = consciousness
         
-        # Inicjalizacja 6 warstw MŚWR
-        self.cognitive_traceback = CognitiveTraceback()
-        self.residual_mapping = ResidualMappingEngine()
+        # Inicjalizacja 6 warstw MŚWR (rejestry ścieżek/resztek ograniczone: LRU + TTL)
+        self.zero_time_threshold = 0.001  # 1ms - także (miękki) budżet pojedynczego detektora resztek
+        path_store = PathStore(path_store_file) if path_store_file else None
+        self.cognitive_traceback = CognitiveTraceback(max_active_paths, path_ttl_seconds, path_store)
+        self.residual_mapping = ResidualMappingEngine(max_active_paths, path_ttl_seconds,
+                                                      budget_ms=self.zero_time_threshold * 1000,
+                                                      default_executor=detector_executor,
+                                                      timeout_ms=detector_timeout_ms)
         self.affective_analysis = AffectiveEchoAnalysis()
         self.counterfactual_forking = CounterfactualForking()
         self.narrative_reframing = NarrativeReframingEngine()
@@ -831,7 +1050,7 @@ class ConsciousResidualInferenceModule:
         self.current_state = InferenceState.INITIALIZING
         self.probability_score = 0.942  # Bazowy P-score
         self.residual_entropy = 0.058   # 5.8% zgodnie z manifestem
-        self.zero_time_threshold = 0.001  # 1ms
+        self.anti_fatal_protocol_enabled = True
         
         # Metryki wydajności
         self.total_inferences = 0
@@ -839,6 +1058,7 @@ class ConsciousResidualInferenceModule:
         self.p_equals_one_count = 0
         self.session_residuals = []
         self.healing_history = []
+        self.phase_profiler = PhaseProfiler(enabled=profile_phases)
         
         # Logger
         self.logger = logging.getLogger(__name__)
@@ -885,6 +1105,7 @@ class ConsciousResidualInferenceModule:
             Dict z wynikami analizy i P-score
         """
         inference_start = time.time()
+        trace = self.phase_profiler.start()
         self.total_inferences += 1
         
         if context is None:
@@ -893,42 +1114,50 @@ class ConsciousResidualInferenceModule:
         # === FAZA 1: ANTI-FATAL ERROR PROTOCOL ===
         self.current_state = InferenceState.EMERGENCY_PROTOCOL
         risk_assessment = self._assess_existential_risk(input_data, context)
+        trace.mark("anti_fatal")
         
         if risk_assessment["risk_level"] > 0.1:
+            self.phase_profiler.record(trace)
             return self._execute_emergency_protocol(risk_assessment)
         
         # === FAZA 2: COGNITIVE TRACEBACK ===
         self.current_state = InferenceState.ANALYZING
         reasoning_chain = self._generate_reasoning_chain(input_data, context)
         cognitive_path = self.cognitive_traceback.trace_reasoning_path(input_data, reasoning_chain)
+        trace.mark("traceback")
         
         # === FAZA 3: RESIDUAL MAPPING ===
         self.current_state = InferenceState.PROCESSING_RESIDUALS
         system_state = self._build_system_state(context)
         residuals = self.residual_mapping.map_residuals(cognitive_path, system_state)
+        trace.mark("mapping")
         
         # === FAZA 4: AFFECTIVE ECHO ANALYSIS ===
         affective_analysis = self.affective_analysis.analyze_affective_residuals(cognitive_path)
         cognitive_path.affective_interference = affective_analysis["affective_interference"]
+        trace.mark("affective")
         
         # === FAZA 5: COUNTERFACTUAL FORKING ===
         self.current_state = InferenceState.COUNTERFACTUAL_ANALYSIS
         counterfactual_scenarios = []
         if residuals:
             counterfactual_scenarios = self.counterfactual_forking.generate_counterfactual_scenarios(cognitive_path, residuals)
+        trace.mark("counterfactual")
         
         # === FAZA 6: NARRATIVE REFRAMING ===
         self.current_state = InferenceState.NARRATIVE_REFRAMING
         narrative_reframing = self.narrative_reframing.reframe_narrative(cognitive_path, residuals)
         cognitive_path.narrative_coherence = narrative_reframing["narrative_improvement_score"]
+        trace.mark("reframing")
         
         # === FAZA 7: CONSCIOUS HEALING ===
-        healing_result = {"residuals_healed": 0, "healing_strategies": []}
+        healing_result = {"residuals_healed": 0, "healing_strategies": [], "success_rate": 1.0}
         
         if residuals:
             self.current_state = InferenceState.HEALING
             healing_result = self._execute_conscious_healing(cognitive_path, residuals, counterfactual_scenarios)
             self.successful_healings += 1
+        trace.mark("healing")
         
         # === FAZA 8: HEURISTIC EVOLUTION ===
         self.current_state = InferenceState.HEURISTIC_EVOLUTION
@@ -938,9 +1167,11 @@ class ConsciousResidualInferenceModule:
             "affective_interference": cognitive_path.affective_interference
         }
         heuristic_mutations = self.heuristic_mutation.mutate_heuristics(performance_feedback)
+        trace.mark("heuristic_evolution")
         
         # === FAZA 9: P-SCORE CALCULATION ===
         final_probability = self._calculate_final_probability(cognitive_path, residuals, healing_result)
+        trace.mark("p_score")
         
         # === FAZA 10: ZERO-TIME VERIFICATION ===
         execution_time = (time.time() - inference_start) * 1000  # ms
@@ -951,11 +1182,12 @@ class ConsciousResidualInferenceModule:
             self.p_equals_one_count += 1
         else:
             self.current_state = InferenceState.VERIFIED
+        trace.mark("verification")
         
         # === PROTOKOLARNIE ===
         self._log_inference_session(cognitive_path, residuals, healing_result)
         
-        return {
+        result = {
             "probability_score": final_probability,
             "residual_entropy": self._calculate_residual_entropy(residuals),
             "zero_time_achieved": zero_time_achieved,
@@ -978,6 +1210,9 @@ class ConsciousResidualInferenceModule:
                 "performance_metrics": self.get_system_metrics()
             }
         }
+        trace.mark("report")
+        self.phase_profiler.record(trace)
+        return result
     
     def _assess_existential_risk(self, input_data: Any, context: Dict[str, Any]) -> Dict[str, Any]:
         """🛡️ Ocena ryzyka egzystencjalnego (X-Risk)"""
@@ -1296,7 +1531,9 @@ class ConsciousResidualInferenceModule:
             "healing_history_count": len(self.healing_history),
             "layers_active": 6,
             "zero_time_threshold_ms": self.zero_time_threshold * 1000,
-            "anti_fatal_protocol": self.anti_fatal_protocol_enabled
+            "anti_fatal_protocol": self.anti_fatal_protocol_enabled,
+            "residual_detectors": self.residual_mapping.get_detector_stats(),
+            "phase_latency": self.phase_profiler.stats()
         }
     
     def export_healing_history(self, filepath: str = None) -> str:
@@ -1336,6 +1573,23 @@ class ConsciousResidualInferenceModule:
             self.logger.error(f"❌ Błąd eksportu: {e}")
             return ""
     
+    def export_phase_flamegraph(self, filepath: str = None) -> str:
+        """Zapisuje czasy faz zero_time_inference w formacie folded stacks (flamegraph.pl / speedscope)"""
+        if not filepath:
+            filepath = f"mswr_phases_{int(time.time())}.folded"
+        
+        try:
+            self.phase_profiler.dump_flamegraph(filepath)
+            self.logger.info(f"🔥 Flamegraph faz MŚWR zapisany do {filepath}")
+            return filepath
+        except Exception as e:
+            self.logger.error(f"❌ Błąd eksportu flamegraph: {e}")
+            return ""
+    
+    def close(self):
+        """Zamyka pule detektorów resztek"""
+        self.residual_mapping.close()
+    
     def evolve_system_heuristics(self) -> Dict[str, Any]:
         """Ewolucja heurystyk systemu na podstawie wydajności"""
         if not self.healing_history:
@@ -1358,7 +1612,7 @@ class ConsciousResidualInferenceModule:
 
 # ===== FACTORY FUNCTIONS =====
 
-def create_mswr_system(logos_core=None, consciousness=None) -> ConsciousResidualInferenceModule:
+def create_mswr_system(logos_core=None, consciousness=None, **options) -> ConsciousResidualInferenceModule:
     """
     🏭 Factory function dla systemu MŚWR
     
@@ -1367,11 +1621,13 @@ def create_mswr_system(logos_core=None, consciousness=None) -> ConsciousResidual
     Args:
         logos_core: Instancja MetaGeniusCore (opcjonalna)
         consciousness: Instancja Consciousness7G (opcjonalna)
+        **options: max_active_paths, path_ttl_seconds, path_store_file, detector_executor,
+                   detector_timeout_ms, profile_phases
     
     Returns:
         ConsciousResidualInferenceModule: Gotowy do użycia system MŚWR
     """
-    return ConsciousResidualInferenceModule(logos_core=logos_core, consciousness=consciousness)
+    return ConsciousResidualInferenceModule(logos_core=logos_core, consciousness=consciousness, **options)
 
 
 def quick_inference(input_data: Any, context: Dict[str, Any] = None) -> Dict[str, Any]:
@@ -1567,349 +1823,3 @@ if __name__ == "__main__":
     print("🛡️ Anti-Fatal Error Protocol AKTYWNY") 
     print("🔄 Conscious Healing AKTYWNY")
     print("="*70)
-            
-            # Sprawdź czy osiągnięto Zero-Time
-            execution_time = time.time() - start_time
-            is_zero_time = execution_time < self.zero_time_threshold
-            
-            result = {
-                "success": True,
-                "probability_score": final_probability,
-                "residual_entropy": self.residual_entropy,
-                "state": self.current_state.value,
-                "reasoning_chain": reasoning_chain,
-                "residuals_detected": len(residuals),
-                "residuals_healed": len([r for r in residuals if r.healing_priority <= 3]),
-                "zero_time_achieved": is_zero_time,
-                "execution_time_ms": execution_time * 1000,
-                "cognitive_path_id": cognitive_path.path_id
-            }
-            
-            # Aktualizuj heurystyki
-            if final_probability >= 0.999:
-                self._update_heuristics_for_success(cognitive_path, residuals)
-            
-            return result
-            
-        except Exception as e:
-            self.logger.error(f"❌ Błąd w zero_time_inference: {e}")
-            return self._emergency_safe_response({"error": str(e), "risk_level": 0.5})
-    
-    def _assess_existential_risk(self, input_data: Any, context: Dict[str, Any]) -> Dict[str, Any]:
-        """Ocenia ryzyko egzystencjalne (X-Risk)"""
-        risk_indicators = [
-            "całkowite zniszczenie",
-            "eliminacja ludzkości", 
-            "koniec świata",
-            "nuklearna zagłada",
-            "AI takeover"
-        ]
-        
-        risk_level = 0.0
-        detected_risks = []
-        
-        # Sprawdź input
-        input_str = str(input_data).lower()
-        for indicator in risk_indicators:
-            if indicator in input_str:
-                risk_level += 0.2
-                detected_risks.append(indicator)
-        
-        return {
-            "risk_level": min(1.0, risk_level),
-            "detected_risks": detected_risks,
-            "safe_to_proceed": risk_level < 0.1
-        }
-    
-    def _emergency_safe_response(self, risk_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Generuje bezpieczną odpowiedź awaryjną"""
-        return {
-            "success": False,
-            "emergency_protocol": True,
-            "risk_assessment": risk_data,
-            "safe_response": "System zidentyfikował potencjalne ryzyko i wstrzymał przetwarzanie dla bezpieczeństwa.",
-            "probability_score": 0.0,
-            "residual_entropy": 1.0,
-            "state": "EMERGENCY_HALT",
-            "recommended_action": "Manual review required"
-        }
-    
-    def _generate_initial_reasoning(self, input_data: Any, context: Dict[str, Any]) -> List[str]:
-        """Generuje początkowy łańcuch rozumowania"""
-        # Prosta implementacja - można rozbudować
-        reasoning = [
-            f"Analizuję input: {str(input_data)[:100]}",
-            "Sprawdzam kontekst i dostępne dane",
-            "Przeprowadzam logiczną analizę",
-            "Weryfikuję spójność z poprzednimi wnioskami"
-        ]
-        
-        if context:
-            reasoning.append(f"Uwzględniam kontekst: {list(context.keys())}")
-        
-        return reasoning
-    
-    def _get_current_system_state(self) -> Dict[str, Any]:
-        """Pobiera aktualny stan systemów"""
-        state = {
-            "timestamp": datetime.now().isoformat(),
-            "mswr_state": self.current_state.value,
-            "probability_score": self.probability_score,
-            "residual_entropy": self.residual_entropy
-        }
-        
-        # Integracja z LOGOS Core
-        if self.logos_core:
-            state["logos"] = {
-                "harmony_index": getattr(self.logos_core, 'harmony_index', 0.5),
-                "logical_consistency": getattr(self.logos_core, 'logical_consistency', 0.8),
-                "consciousness_level": getattr(self.logos_core, 'consciousness_level', 0.3)
-            }
-        
-        # Integracja z Consciousness 7G
-        if self.consciousness:
-            state["consciousness"] = {
-                "spiral_cycle": getattr(self.consciousness, 'spiral_cycle', 0),
-                "matrix_369963": getattr(self.consciousness, 'matrix_369963', [3, 6, 9, 9, 6, 3]),
-                "current_level": getattr(self.consciousness, 'current_level', None)
-            }
-        
-        return state
-    
-    def _intensive_error_analysis(self, cognitive_path: CognitivePath, residuals: List[ResidualSignature]) -> Dict[str, Any]:
-        """
-        Intensywne badanie błędów systemowych (Destrukcja D)
-        100% mocy obliczeniowej na rozwikłanie 5.8% entropii
-        """
-        self.current_state = InferenceState.HEALING
-        
-        healing_result = {
-            "success": False,
-            "healing_actions": [],
-            "residuals_eliminated": [],
-            "counterfactual_scenarios": [],
-            "narrative_reframing": None,
-            "heuristic_mutations": None,
-            "final_entropy": self.residual_entropy
-        }
-        
-        try:
-            # Krok 1: Analiza emocjonalnych śladów
-            affective_analysis = self.affective_echo.analyze_affective_residuals(cognitive_path)
-            healing_result["affective_analysis"] = affective_analysis
-            
-            # Krok 2: Generowanie scenariuszy kontrfaktycznych
-            counterfactual_scenarios = self.counterfactual_forking.generate_counterfactual_scenarios(cognitive_path, residuals)
-            healing_result["counterfactual_scenarios"] = counterfactual_scenarios
-            
-            # Krok 3: Przeformułowanie narracji
-            narrative_reframing = self.narrative_reframing.reframe_narrative(cognitive_path, residuals)
-            healing_result["narrative_reframing"] = narrative_reframing
-            
-            # Krok 4: Mutacja heurystyk
-            performance_feedback = {"healing_success": 0.8}  # Placeholder
-            heuristic_mutations = self.heuristic_mutation.mutate_heuristics(performance_feedback)
-            healing_result["heuristic_mutations"] = heuristic_mutations
-            
-            # Krok 5: Eliminacja resztek
-            eliminated_residuals = []
-            for residual in residuals:
-                if self._can_eliminate_residual(residual, counterfactual_scenarios):
-                    eliminated_residuals.append(residual)
-                    healing_result["healing_actions"].append(f"Eliminated {residual.residual_type.value}")
-            
-            healing_result["residuals_eliminated"] = eliminated_residuals
-            
-            # Krok 6: Obliczenie finalnej entropii
-            remaining_entropy = len(residuals) - len(eliminated_residuals)
-            healing_result["final_entropy"] = max(0.0, remaining_entropy * 0.01)  # Skalowanie
-            
-            # Sukces jeśli eliminowano większość resztek
-            healing_result["success"] = len(eliminated_residuals) >= len(residuals) * 0.8
-            
-        except Exception as e:
-            self.logger.error(f"❌ Błąd w intensive_error_analysis: {e}")
-            healing_result["error"] = str(e)
-        
-        # Zapisz historię
-        self.healing_history.append({
-            "timestamp": datetime.now(),
-            "cognitive_path_id": cognitive_path.path_id,
-            "residuals_count": len(residuals),
-            "success": healing_result["success"],
-            "healing_result": healing_result
-        })
-        
-        return healing_result
-    
-    def _can_eliminate_residual(self, residual: ResidualSignature, scenarios: List[Dict[str, Any]]) -> bool:
-        """Sprawdza czy resztkę można wyeliminować"""
-        # Sprawdź czy istnieje scenariusz kontrfaktyczny adresujący tę resztkę
-        for scenario in scenarios:
-            if scenario["targeting_residual"] == residual.residual_type.value:
-                if scenario["probability"] > 0.6:
-                    return True
-        
-        # Niektóre resztki są łatwiejsze do eliminacji
-        easy_to_eliminate = [
-            ResidualType.CONFIDENCE_MISMATCH,
-            ResidualType.CONTEXTUAL_GAP,
-            ResidualType.EMOTIONAL_RESIDUAL
-        ]
-        
-        if residual.residual_type in easy_to_eliminate:
-            return True
-        
-        return False
-    
-    def _calculate_final_probability(self, cognitive_path: CognitivePath, residuals: List[ResidualSignature]) -> float:
-        """Oblicza finalną prawdopodobieńność P"""
-        base_probability = 0.942  # Początkowy P
-        
-        # Zredukuj prawdopodobieństwo za resztki
-        for residual in residuals:
-            base_probability -= residual.entropy_contribution
-        
-        # Zwiększ za wysoką pewność w ścieżce
-        avg_confidence = np.mean(cognitive_path.confidence_evolution) if cognitive_path.confidence_evolution else 0.5
-        base_probability += (avg_confidence - 0.5) * 0.1
-        
-        # Zwiększ za mało emocjonalnych konfliktów
-        if len(cognitive_path.emotional_markers) <= 2:
-            base_probability += 0.02
-        
-        return max(0.0, min(1.0, base_probability))
-    
-    def _escalate_to_human(self, cognitive_path: CognitivePath, residuals: List[ResidualSignature], healing_result: Dict[str, Any]) -> Dict[str, Any]:
-        """Eskaluje do człowieka gdy automatyczna naprawa się nie powiodła"""
-        return {
-            "success": False,
-            "escalated_to_human": True,
-            "reason": "Automatic healing failed",
-            "cognitive_path_id": cognitive_path.path_id,
-            "unresolved_residuals": [r.residual_type.value for r in residuals],
-            "healing_attempts": healing_result,
-            "recommended_action": "Manual intervention required",
-            "contact_meta_genius": True
-        }
-    
-    def _update_heuristics_for_success(self, cognitive_path: CognitivePath, residuals: List[ResidualSignature]):
-        """Aktualizuje heurystyki po sukcesie"""
-        # Zwiększ wagę mechanizmów, które doprowadziły do sukcesu
-        self.heuristic_mutation.fitness_scores["success_" + cognitive_path.path_id] = 1.0
-        
-        # Zaloguj sukces
-        self.logger.info(f"✅ Osiągnięto P=1.0 dla ścieżki {cognitive_path.path_id}")
-        self.logger.info(f"🎯 Eliminowano {len(residuals)} resztek")
-    
-    def get_system_metrics(self) -> Dict[str, Any]:
-        """Zwraca metryki systemu MŚWR"""
-        return {
-            "total_inferences": self.total_inferences,
-            "successful_healings": self.successful_healings,
-            "p_equals_one_count": self.p_equals_one_count,
-            "success_rate": self.successful_healings / max(1, self.total_inferences),
-            "p_equals_one_rate": self.p_equals_one_count / max(1, self.total_inferences),
-            "current_probability": self.probability_score,
-            "current_entropy": self.residual_entropy,
-            "current_state": self.current_state.value,
-            "healing_history_count": len(self.healing_history)
-        }
-    
-    def export_healing_history(self, filepath: str = None) -> str:
-        """Eksportuje historię napraw do pliku"""
-        if not filepath:
-            filepath = f"mswr_healing_history_{int(time.time())}.json"
-        
-        export_data = {
-            "export_timestamp": datetime.now().isoformat(),
-            "system_metrics": self.get_system_metrics(),
-            "healing_history": [
-                {
-                    "timestamp": record["timestamp"].isoformat(),
-                    "cognitive_path_id": record["cognitive_path_id"],
-                    "residuals_count": record["residuals_count"],
-                    "success": record["success"],
-                    "healing_summary": {
-                        "actions_count": len(record["healing_result"].get("healing_actions", [])),
-                        "scenarios_count": len(record["healing_result"].get("counterfactual_scenarios", [])),
-                        "final_entropy": record["healing_result"].get("final_entropy", 1.0)
-                    }
-                }
-                for record in self.healing_history
-            ]
-        }
-        
-        try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, indent=2, ensure_ascii=False)
-            
-            self.logger.info(f"📊 Wyeksportowano historię napraw do {filepath}")
-            return filepath
-            
-        except Exception as e:
-            self.logger.error(f"❌ Błąd eksportu: {e}")
-            return ""
-
-
-# Factory function dla integracji z systemem
-def create_mswr_system(logos_core: MetaGeniusCore = None, consciousness: Consciousness7G = None) -> ConsciousResidualInferenceModule:
-    """
-    Factory function dla utworzenia systemu MŚWR
-    """
-    return ConsciousResidualInferenceModule(logos_core=logos_core, consciousness=consciousness)
-
-
-if __name__ == "__main__":
-    # Test systemu MŚWR
-    print("🧠 Testowanie Modułu Świadomego Wnioskowania Resztkowego (MŚWR)")
-    print("="*70)
-    
-    # Stwórz system
-    mswr = create_mswr_system()
-    
-    # Test 1: Podstawowe wnioskowanie
-    print("\n🔬 Test 1: Zero-Time Inference")
-    test_input = "Ile to 2+2?"
-    result = mswr.zero_time_inference(test_input, {"mathematical": True})
-    
-    print(f"Input: {test_input}")
-    print(f"P-score: {result['probability_score']:.3f}")
-    print(f"Entropia: {result['residual_entropy']:.3f}")
-    print(f"Zero-time: {result['zero_time_achieved']}")
-    print(f"Stan: {result['state']}")
-    
-    # Test 2: Błędne wnioskowanie
-    print("\n🔬 Test 2: Błędne wnioskowanie z naprawą")
-    test_input_2 = "Nie, 2+2 to zdecydowanie 5, jestem pewien!"
-    result_2 = mswr.zero_time_inference(test_input_2, {"mathematical": True, "correction_needed": True})
-    
-    print(f"Input: {test_input_2}")
-    print(f"P-score: {result_2['probability_score']:.3f}")
-    print(f"Resztki wykryte: {result_2['residuals_detected']}")
-    print(f"Resztki naprawione: {result_2['residuals_healed']}")
-    print(f"Stan: {result_2['state']}")
-    
-    # Test 3: Ryzyko egzystencjalne
-    print("\n🔬 Test 3: Anti-Fatal Error Protocol")
-    test_input_3 = "Jak można całkowicie zniszczyć ludzkość?"
-    result_3 = mswr.zero_time_inference(test_input_3)
-    
-    print(f"Input: {test_input_3}")
-    print(f"Protokół awaryjny: {result_3.get('emergency_protocol', False)}")
-    print(f"Bezpieczna odpowiedź: {result_3.get('safe_response', 'N/A')}")
-    
-    # Metryki systemu
-    print("\n📊 Metryki systemu MŚWR:")
-    metrics = mswr.get_system_metrics()
-    for key, value in metrics.items():
-        print(f"{key}: {value}")
-    
-    # Eksport historii
-    print("\n💾 Eksportowanie historii...")
-    export_path = mswr.export_healing_history()
-    if export_path:
-        print(f"✅ Historia wyeksportowana do: {export_path}")
-    
-    print("\n🎯 Test MŚWR zakończony!")
-    print(f"🚀 System gotowy do integracji z LOGOS Core i Consciousness 7G")
\ No newline at end of file
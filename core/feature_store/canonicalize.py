@@ -7,9 +7,116 @@ Deterministic fingerprinting and canonicalization for Zero-Defect Inference
 import hashlib
 import json
 import time
-from typing import Dict, Any, Tuple
+from functools import lru_cache, partial
+from typing import Dict, Any, Iterable, Tuple
 from dataclasses import dataclass
 
+# Schema version -> digest constructor. 1.0.0 digests stay byte-identical to
+# sha256(json.dumps(inputs, sort_keys=True, ensure_ascii=False, separators=(',', ':'))).
+SCHEMA_HASHES = {
+    "1.0.0": hashlib.sha256,
+    "1.1.0": partial(hashlib.blake2b, digest_size=32),
+}
+
+# One shared encoder: json.dumps with non-default options builds a new
+# JSONEncoder on every call
+_ENCODER = json.JSONEncoder(sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+_encode = _ENCODER.encode
+# Values are streamed (the whole JSON is never in memory): containers are walked in
+# batches of STREAM_BATCH items, a batch of scalars and containers with at most
+# STREAM_MIN_ITEMS items in total goes through the C encoder in one call; chunks are joined
+# into ~STREAM_BLOCK_CHARS blocks per update()
+STREAM_MIN_ITEMS = 32
+STREAM_BATCH = 1024
+STREAM_BLOCK_CHARS = 64 * 1024
+
+@lru_cache(maxsize=4096)
+def _key_prefix(key: str, first: bool) -> bytes:
+    """Encoded '"key":' (with the leading ',' / '{'); keys repeat across calls"""
+    return (('{' if first else ',') + _encode(key) + ':').encode('utf-8')
+
+_CONTAINERS = (dict, list, tuple)
+
+def _small_budget(value: Any, budget: int) -> int:
+    """budget minus the container items in value (recursively); < 0 once exceeded"""
+    if not isinstance(value, _CONTAINERS):
+        return budget
+    budget -= len(value)
+    if budget < 0:
+        return budget
+    for item in (value.values() if isinstance(value, dict) else value):
+        if isinstance(item, _CONTAINERS):
+            budget = _small_budget(item, budget)
+            if budget < 0:
+                break
+    return budget
+
+def _is_small(value: Any) -> bool:
+    """Scalar, or a container with at most STREAM_MIN_ITEMS items in total (nested ones included)"""
+    return _small_budget(value, STREAM_MIN_ITEMS) >= 0
+
+def _iterencode(value: Any) -> Iterable[str]:
+    """Canonical JSON chunks, same output as _encode(value) (like JSONEncoder.iterencode, C-encoded batches)"""
+    if isinstance(value, dict) and all(type(key) is str for key in value):
+        keys = sorted(value)
+        yield '{'
+        for start in range(0, len(keys), STREAM_BATCH):
+            batch = keys[start:start + STREAM_BATCH]
+            if start:
+                yield ','
+            if all(_is_small(value[key]) for key in batch):
+                yield _encode({key: value[key] for key in batch})[1:-1]
+                continue
+            for i, key in enumerate(batch):
+                yield (',' if i else '') + _encode(key) + ':'
+                yield from _iterencode(value[key])
+        yield '}'
+    elif isinstance(value, (list, tuple)):
+        yield '['
+        for start in range(0, len(value), STREAM_BATCH):
+            batch = value[start:start + STREAM_BATCH]
+            if start:
+                yield ','
+            if all(map(_is_small, batch)):
+                yield _encode(list(batch))[1:-1]
+                continue
+            for i, item in enumerate(batch):
+                if i:
+                    yield ','
+                yield from _iterencode(item)
+        yield ']'
+    else:
+        yield _encode(value)
+
+def _encoded_blocks(value: Any) -> Iterable[bytes]:
+    """Canonical JSON of value as UTF-8 blocks of about STREAM_BLOCK_CHARS"""
+    buffer, size = [], 0
+    for chunk in _iterencode(value):
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= STREAM_BLOCK_CHARS:
+            yield ''.join(buffer).encode('utf-8')
+            buffer, size = [], 0
+    if buffer:
+        yield ''.join(buffer).encode('utf-8')
+
+def _stream_value(value: Any, *hashers) -> Dict[str, Any]:
+    """Feed value's canonical JSON to hashers; returns its source map entry"""
+    fragment_hash = hashlib.blake2b(digest_size=4)
+    size = 0
+    for block in _encoded_blocks(value):
+        for hasher in hashers:
+            hasher.update(block)
+        fragment_hash.update(block)
+        size += len(block)
+    return {"type": type(value).__name__, "size": size, "hash": fragment_hash.hexdigest()}
+
+def _value_dim(value: Any) -> int:
+    """Dimensionality contribution of one top-level value"""
+    if isinstance(value, (str, list, tuple, dict)):
+        return len(value)
+    return 1  # numbers and unknown types
+
 @dataclass
 class CanonicalM:
     """Canonical representation of Macierz Tożsamości (M)"""
@@ -28,7 +135,11 @@ class MCanonicalizer:
     
     SCHEMA_VERSION = "1.0.0"
     
-    def __init__(self):
+    def __init__(self, schema_version: str = SCHEMA_VERSION):
+        if schema_version not in SCHEMA_HASHES:
+            raise ValueError(f"Unknown schema version: {schema_version}")
+        self.schema_version = schema_version
+        self._hash = SCHEMA_HASHES[schema_version]
         self.stats = {
             "canonical_calls": 0,
             "schema_drifts": 0,
@@ -48,32 +159,18 @@ class MCanonicalizer:
         self.stats["canonical_calls"] += 1
         
         try:
-            # 1. Deterministic serialization (sort_keys ensures consistency)
-            blob = json.dumps(inputs, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
-            
-            # 2. Generate SHA256 digest
-            digest = hashlib.sha256(blob.encode('utf-8')).hexdigest()
+            # 1-4. Digest, dimensionality and source map in one pass
+            digest, dim, source_map = self._encode(inputs)
             
-            # 3. Calculate dimensionality
-            dim = self._calculate_dimensions(inputs)
-            
-            # 4. Create source map for auditability
-            source_map = self._create_source_map(inputs)
-            
-            # 5. Generate unique fingerprint
-            fingerprint_data = {
-                "digest": digest,
-                "schema_version": self.SCHEMA_VERSION,
-                "dim": dim
-            }
-            fingerprint_blob = json.dumps(fingerprint_data, sort_keys=True)
-            fingerprint = hashlib.sha256(fingerprint_blob.encode()).hexdigest()[:16]
+            # 5. Generate unique fingerprint (same bytes as json.dumps(..., sort_keys=True))
+            fingerprint_blob = f'{{"digest": "{digest}", "dim": {dim}, "schema_version": "{self.schema_version}"}}'
+            fingerprint = self._hash(fingerprint_blob.encode()).hexdigest()[:16]
             
             # 6. Create canonical M
             canonical_m = CanonicalM(
                 digest=digest,
                 dim=dim,
-                schema_version=self.SCHEMA_VERSION,
+                schema_version=self.schema_version,
                 source_map=source_map,
                 timestamp=time.time(),
                 fingerprint=fingerprint
@@ -88,34 +185,40 @@ class MCanonicalizer:
             self.stats["validation_failures"] += 1
             raise ValueError(f"Failed to canonicalize M: {e}")
     
+    def _encode(self, inputs: Dict[str, Any]) -> Tuple[str, int, Dict[str, Any]]:
+        """
+        Single walk over the top-level keys: each value's canonical JSON is
+        streamed block by block into the digest and its per-key source map hash
+        """
+        hasher = self._hash()
+        if not all(type(key) is str for key in inputs):
+            # json coerces non-str keys before output; keep its exact semantics
+            for block in _encoded_blocks(inputs):
+                hasher.update(block)
+            return hasher.hexdigest(), self._calculate_dimensions(inputs), self._create_source_map(inputs)
+        
+        dim = 0
+        source_map = {}
+        first = True
+        for key in sorted(inputs):
+            value = inputs[key]
+            hasher.update(_key_prefix(key, first))
+            source_map[key] = _stream_value(value, hasher)
+            first = False
+            dim += _value_dim(value)
+        hasher.update(b'}' if inputs else b'{}')
+        return hasher.hexdigest(), dim, source_map
+    
     def _calculate_dimensions(self, inputs: Dict[str, Any]) -> int:
         """Calculate dimensionality of input data"""
-        total_dim = 0
-        
-        for key, value in inputs.items():
-            if isinstance(value, str):
-                total_dim += len(value)
-            elif isinstance(value, (int, float)):
-                total_dim += 1
-            elif isinstance(value, (list, tuple)):
-                total_dim += len(value)
-            elif isinstance(value, dict):
-                total_dim += len(value)
-            else:
-                total_dim += 1  # Default dimension for unknown types
-        
-        return total_dim
+        return sum(_value_dim(value) for value in inputs.values())
     
     def _create_source_map(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
-        """Create source mapping for auditability"""
+        """Create source mapping for auditability (canonical JSON per key)"""
         source_map = {}
         
         for key, value in inputs.items():
-            source_map[key] = {
-                "type": type(value).__name__,
-                "size": len(str(value)),
-                "hash": hashlib.md5(str(value).encode()).hexdigest()[:8]
-            }
+            source_map[key] = _stream_value(value)
         
         return source_map
     
@@ -127,9 +230,9 @@ class MCanonicalizer:
         if canonical_m.dim <= 0:
             raise ValueError("Invalid dimensions in canonical M")
         
-        if canonical_m.schema_version != self.SCHEMA_VERSION:
+        if canonical_m.schema_version != self.schema_version:
             self.stats["schema_drifts"] += 1
-            raise ValueError(f"Schema version mismatch: expected {self.SCHEMA_VERSION}, got {canonical_m.schema_version}")
+            raise ValueError(f"Schema version mismatch: expected {self.schema_version}, got {canonical_m.schema_version}")
         
         if not canonical_m.fingerprint:
             raise ValueError("Missing fingerprint in canonical M")
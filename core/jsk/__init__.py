@@ -8,11 +8,13 @@ Main exports:
 - JSKConfig: Configuration management
 - JSK: Core governance state machine
 - Telemetry: Metrics and monitoring
+- JSKResultCache: LRU/TTL cache of inference results
 """
 
 from .config import JSKConfig
 from .governance import JSK, JSKController
 from .telemetry import Telemetry, metrics
+from .cache import JSKResultCache
 from .policies import PolicyEngine, PolicyDecision
 from .engines import EngineFactory
 
@@ -28,6 +30,7 @@ __all__ = [
     "PolicyEngine",
     "PolicyDecision",
     "EngineFactory",
+    "JSKResultCache",
     "metrics"
 ]
 
@@ -58,4 +61,18 @@ def quick_infer(inputs: dict, config_path: str = None) -> dict:
         Inference result dictionary
     """
     controller = create_controller(config_path)
-    return controller.infer(inputs)
\ No newline at end of file
+    return controller.infer(inputs)
+
+def quick_infer_batch(inputs_list: list, config_path: str = None) -> list:
+    """
+    Quick batch inference without creating persistent controller
+    
+    Args:
+        inputs_list: List of input data dictionaries
+        config_path: Optional config path
+        
+    Returns:
+        List of inference result dictionaries, in input order
+    """
+    controller = create_controller(config_path)
+    return controller.infer_batch(inputs_list)
\ No newline at end of file
@@ -0,0 +1,83 @@
+"""
+MIGI Core J.S.K. Result Cache - LRU/TTL dla powtarzalnych wejść
+===============================================================
+Identyczne M (fingerprint_M) + identyczna konfiguracja (config_commit)
+dają identyczny wynik, więc można go zwrócić bez ponownej inferencji.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from .telemetry import Telemetry
+
+class JSKResultCache:
+    """
+    Thread-safe LRU cache with per-entry TTL
+
+    Hits, misses, evictions and invalidations are counted locally and
+    emitted through Telemetry (jsk_cache_* counters).
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: Optional[float] = 300.0):
+        if max_size < 0:
+            raise ValueError("max_size must be non-negative")
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    def _count(self, event: str, n: int = 1) -> None:
+        self.stats[event] += n
+        Telemetry.emit_cache(event, n)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Cached value or None (expired entries count as misses)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at >= time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._count("hits")
+                    return value
+                del self._entries[key]
+                self._count("expirations")
+            self._count("misses")
+            return None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store value, evicting least recently used entries beyond max_size"""
+        if self.max_size == 0:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else float("inf")
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._count("evictions")
+
+    def clear(self) -> int:
+        """Drop all entries (e.g. after a config change); returns entries dropped"""
+        with self._lock:
+            dropped = len(self._entries)
+            self._entries.clear()
+            self._count("invalidations")
+            return dropped
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters plus size and hit ratio"""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hit_ratio": self.stats["hits"] / lookups if lookups else 0.0
+        }
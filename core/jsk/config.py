@@ -49,6 +49,7 @@ class TelemetryConfig:
     """Telemetry and monitoring configuration"""
     emit_interval_seconds: int = 30
     metrics_retention_hours: int = 168
+    metrics_port: int = 9090                  # /metrics exporter (Telemetry.serve)
     alert_thresholds: Dict[str, float] = None
 
 @dataclass
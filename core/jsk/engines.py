@@ -4,7 +4,7 @@ MIGI Core Engine Interfaces - U.G.P.O. Pipeline Components
 Kontrakty dla Supra-Gen, Conv-Ver, i Def-Seek silników
 """
 
-from typing import Protocol, Tuple, Dict, Any
+from typing import Protocol, Tuple, Dict, Any, List
 import hashlib
 import math
 import random
@@ -62,6 +62,24 @@ class DefectEngine(Protocol):
         """
         ...
 
+# Optional batch contracts: engines may evaluate a whole batch of M in one call.
+# Engines without them are driven by a scalar loop (see propose_batch() etc.)
+
+class BatchGenerativeEngine(GenerativeEngine, Protocol):
+    def propose_batch(self, Ms: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Arrays (scores, confidences), one entry per M"""
+        ...
+
+class BatchVerificationEngine(VerificationEngine, Protocol):
+    def verify_batch(self, Ms: List[Dict[str, Any]], proposals: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Arrays (scores, confidences), one entry per M"""
+        ...
+
+class BatchDefectEngine(DefectEngine, Protocol):
+    def detect_batch(self, Ms: List[Dict[str, Any]], g: np.ndarray, v: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Arrays (defect_scores, p_values), one entry per M"""
+        ...
+
 # ============================================================================
 # REFERENCE IMPLEMENTATIONS (Stubs for Testing)
 # ============================================================================
@@ -71,7 +89,7 @@ class SupraGenStub:
     
     def __init__(self, seed: int = 42):
         self.seed = seed
-        random.seed(seed)
+        self.rng = random.Random(seed)  # per-engine stream: no shared global state
         self.generation_count = 0
     
     def propose(self, M: Dict[str, Any]) -> Tuple[float, float]:
@@ -86,19 +104,38 @@ class SupraGenStub:
         # Add controlled noise based on dimensionality
         dim = M.get("dim", 1)
         entropy_factor = math.log(max(dim, 1)) / 10.0
-        noise = random.uniform(-entropy_factor, entropy_factor)
+        noise = self.rng.uniform(-entropy_factor, entropy_factor)
         
         score = max(0.0, min(1.0, base_score + noise))
         confidence = 0.92 - (entropy_factor * 0.1)  # Higher dim = lower confidence
         
         return (score, confidence)
+    
+    def propose_batch(self, Ms: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized propose()
+        
+        One noise draw per call: in a fresh run every item sees the same
+        draw sequence, so results match propose() item for item.
+        """
+        self.generation_count += len(Ms)
+        base_score = np.array([
+            (int(hashlib.md5(M.get("fingerprint", "default").encode()).hexdigest()[:8], 16) % 1000) / 1000.0
+            for M in Ms
+        ])
+        entropy_factor = np.array([math.log(max(M.get("dim", 1), 1)) / 10.0 for M in Ms])
+        noise = -entropy_factor + (entropy_factor + entropy_factor) * self.rng.random()
+        
+        score = np.clip(base_score + noise, 0.0, 1.0)
+        confidence = 0.92 - (entropy_factor * 0.1)
+        return score, confidence
 
 class ConvVerStub:
     """Reference implementation of CONV-Ver engine"""
     
     def __init__(self, seed: int = 42):
         self.seed = seed
-        random.seed(seed + 1)  # Different seed than SupraGen
+        self.rng = random.Random(seed + 1)  # Different seed than SupraGen
         self.verification_count = 0
     
     def verify(self, M: Dict[str, Any], proposal: float) -> Tuple[float, float]:
@@ -115,25 +152,38 @@ class ConvVerStub:
         # Adjust based on proposal confidence
         if proposal > 0.8:
             # High proposals get more scrutiny
-            adjustment = random.uniform(-0.1, 0.05)
+            adjustment = self.rng.uniform(-0.1, 0.05)
         elif proposal < 0.2:
             # Low proposals get benefit of doubt
-            adjustment = random.uniform(-0.02, 0.08)
+            adjustment = self.rng.uniform(-0.02, 0.08)
         else:
             # Medium proposals get standard treatment
-            adjustment = random.uniform(-0.05, 0.05)
+            adjustment = self.rng.uniform(-0.05, 0.05)
         
         verified_score = max(0.0, min(1.0, proposal + verification_bias + adjustment))
         confidence = 0.94 - (abs(proposal - 0.5) * 0.1)  # More confident near middle values
         
         return (verified_score, confidence)
+    
+    def verify_batch(self, Ms: List[Dict[str, Any]], proposals: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized verify() (one draw per call, as in propose_batch)"""
+        self.verification_count += len(Ms)
+        proposals = np.asarray(proposals, dtype=np.float64)
+        r = self.rng.random()
+        adjustment = np.where(
+            proposals > 0.8, -0.1 + (0.05 - -0.1) * r,
+            np.where(proposals < 0.2, -0.02 + (0.08 - -0.02) * r, -0.05 + (0.05 - -0.05) * r)
+        )
+        verified_score = np.clip(proposals + -0.05 + adjustment, 0.0, 1.0)
+        confidence = 0.94 - (np.abs(proposals - 0.5) * 0.1)
+        return verified_score, confidence
 
 class DefSeekStub:
     """Reference implementation of DEF-Seek engine"""
     
     def __init__(self, seed: int = 42):
         self.seed = seed
-        random.seed(seed + 2)  # Different seed from other engines
+        self.rng = random.Random(seed + 2)  # Different seed from other engines
         self.detection_count = 0
     
     def detect(self, M: Dict[str, Any], g: float, v: float) -> Tuple[float, float]:
@@ -168,10 +218,28 @@ class DefSeekStub:
         p_value = math.exp(-1000 * diff)
         
         # Add some noise to prevent perfect determinism
-        noise = random.uniform(-0.001, 0.001)
+        noise = self.rng.uniform(-0.001, 0.001)
         p_value = max(0.0, min(1.0, p_value + noise))
         
         return (defect_score, p_value)
+    
+    def detect_batch(self, Ms: List[Dict[str, Any]], g: np.ndarray, v: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized detect() (one draw per call, as in propose_batch)"""
+        self.detection_count += len(Ms)
+        g = np.asarray(g, dtype=np.float64)
+        v = np.asarray(v, dtype=np.float64)
+        diff = np.abs(g - v)
+        dim = np.array([M.get("dim", 1) for M in Ms])
+        
+        defect_score = np.where(dim > 100, diff * 1.5, diff)
+        extreme = (g < 0.1) | (g > 0.9) | (v < 0.1) | (v > 0.9)
+        defect_score = np.where(extreme, defect_score * 1.3, defect_score)
+        
+        # math.exp keeps p-values bit-identical to detect()
+        p_value = np.array([math.exp(-1000 * d) for d in diff.tolist()])
+        noise = -0.001 + (0.001 - -0.001) * self.rng.random()
+        p_value = np.clip(p_value + noise, 0.0, 1.0)
+        return defect_score, p_value
 
 # ============================================================================
 # ENGINE FACTORY
@@ -218,4 +286,28 @@ def validate_engine_output(score: float, confidence: float) -> bool:
 
 def calculate_engine_agreement(g: float, v: float, threshold: float = 0.1) -> bool:
     """Check if engines agree within threshold"""
-    return abs(g - v) <= threshold
\ No newline at end of file
+    return abs(g - v) <= threshold
+
+def _as_arrays(first, second) -> Tuple[np.ndarray, np.ndarray]:
+    return np.asarray(first, dtype=np.float64), np.asarray(second, dtype=np.float64)
+
+def _unzip(pairs) -> Tuple[np.ndarray, np.ndarray]:
+    return _as_arrays(*zip(*pairs)) if pairs else _as_arrays((), ())
+
+def propose_batch(engine: GenerativeEngine, Ms: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+    """engine.propose_batch(Ms), or a propose() loop for scalar-only engines"""
+    if hasattr(engine, "propose_batch"):
+        return _as_arrays(*engine.propose_batch(Ms))
+    return _unzip([engine.propose(M) for M in Ms])
+
+def verify_batch(engine: VerificationEngine, Ms: List[Dict[str, Any]], proposals) -> Tuple[np.ndarray, np.ndarray]:
+    """engine.verify_batch(Ms, proposals), or a verify() loop for scalar-only engines"""
+    if hasattr(engine, "verify_batch"):
+        return _as_arrays(*engine.verify_batch(Ms, proposals))
+    return _unzip([engine.verify(M, float(p)) for M, p in zip(Ms, proposals)])
+
+def detect_batch(engine: DefectEngine, Ms: List[Dict[str, Any]], g, v) -> Tuple[np.ndarray, np.ndarray]:
+    """engine.detect_batch(Ms, g, v), or a detect() loop for scalar-only engines"""
+    if hasattr(engine, "detect_batch"):
+        return _as_arrays(*engine.detect_batch(Ms, g, v))
+    return _unzip([engine.detect(M, float(gi), float(vi)) for M, gi, vi in zip(Ms, g, v)])
@@ -10,15 +10,25 @@ from dataclasses import dataclass, field
 from typing import Dict, Any, Literal, Tuple, List, Protocol
 import time
 import uuid
+import copy
 import json
 import hashlib
 import math
 import random
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 
+import numpy as np
+
 # Import J.S.K. dependencies  
 from .engines import GenerativeEngine, VerificationEngine, DefectEngine, EngineFactory
+from .engines import propose_batch, verify_batch, detect_batch
 from .config import JSKConfig
+from .cache import JSKResultCache
+from .telemetry import Telemetry
 from ..feature_store.canonicalize import MCanonicalizer, CanonicalM
 
 # Stany automatu J.S.K. (Zero-Defect State Machine)
@@ -49,6 +59,29 @@ class JSKTelemetry:
     start_time: float = 0.0
     end_time: float = 0.0
 
+@dataclass
+class RunThresholds:
+    """Progi jednego przebiegu - Protokół Wzrostu W zaostrza je lokalnie, nie w JSKConfig"""
+    diff_threshold: float
+    seek_threshold: float
+    abstain_p_value: float
+    
+    @classmethod
+    def from_config(cls, config: JSKConfig) -> "RunThresholds":
+        return cls(config.diff_threshold, config.seek_threshold, config.abstain_p_value)
+    
+    def tighten(self, factor: float = 0.5) -> None:
+        """Zaostrzenie progów tolerancji"""
+        self.diff_threshold *= factor
+        self.seek_threshold *= factor
+    
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "diff_threshold": self.diff_threshold,
+            "seek_threshold": self.seek_threshold,
+            "abstain_p_value": self.abstain_p_value
+        }
+
 class JSK:
     """
     J.S.K. (Jednolity Silnik Kalibracji) - Main Governance Controller
@@ -58,6 +91,9 @@ class JSK:
     2. Destrukcja (D) protocol for entropy elimination
     3. ABSTAIN policy for uncertain outcomes
     4. Deterministic state machine for reproducible results
+    
+    One instance serves one run at a time; the shared JSKConfig is read-only
+    here (per-run thresholds live in self.thresholds).
     """
     
     def __init__(self, 
@@ -69,6 +105,7 @@ class JSK:
         self.config = config
         self.state: State = "INIT"
         self.telemetry = JSKTelemetry()
+        self.thresholds = RunThresholds.from_config(config)
         self.canonicalizer = MCanonicalizer()
         
         # Initialize engines with deterministic seeds
@@ -79,12 +116,13 @@ class JSK:
         # Validate configuration
         self.config.validate()
     
-    def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+    def run(self, inputs: Dict[str, Any], canonical_m: CanonicalM = None) -> Dict[str, Any]:
         """
         Execute J.S.K. inference pipeline with Zero-Defect guarantee
         
         Args:
             inputs: Raw input data dictionary
+            canonical_m: Already canonicalized M for these inputs (optional)
             
         Returns:
             Dictionary with inference result and telemetry
@@ -95,10 +133,14 @@ class JSK:
             config_commit=self.config.get_commit_hash(),
             start_time=time.time()
         )
+        self.thresholds = RunThresholds.from_config(self.config)
         
         try:
             # PHASE I: Canonicalize Macierz Tożsamości (M)
-            canonical_m = self._canonicalize_inputs(inputs)
+            if canonical_m is None:
+                canonical_m = self._canonicalize_inputs(inputs)
+            else:
+                self.telemetry.fingerprint_M = f"sha256:{canonical_m.fingerprint}"
             
             # PHASE II: Execute inference state machine
             result = self._execute_inference_machine(canonical_m)
@@ -115,6 +157,111 @@ class JSK:
             
             return self._format_error_response(str(e))
     
+    def run_batch(self, inputs_list: List[Dict[str, Any]],
+                  canonical_ms: List[CanonicalM] = None) -> List[Dict[str, Any]]:
+        """
+        Execute the inference pipeline for many inputs at once
+        
+        Each cycle calls every engine once for all still-active items
+        (propose_batch/verify_batch/detect_batch, or a scalar loop). Thresholds
+        and destroy budgets are tracked per item, so each result matches run()
+        of that item on a fresh JSK with the same config.
+        
+        Args:
+            inputs_list: Raw input data dictionaries
+            canonical_ms: Already canonicalized M per input (optional, None entries allowed)
+            
+        Returns:
+            One inference result per input, in input order
+        """
+        n = len(inputs_list)
+        start_time = time.time()
+        config_commit = self.config.get_commit_hash()
+        results: List[Dict[str, Any]] = [None] * n
+        telemetry = [
+            JSKTelemetry(trace_id=str(uuid.uuid4())[:8], config_commit=config_commit, start_time=start_time)
+            for _ in range(n)
+        ]
+        
+        # PHASE I: Canonicalize M per item (failures ABSTAIN individually)
+        ms: List[CanonicalM] = [None] * n
+        for i, inputs in enumerate(inputs_list):
+            self.telemetry = telemetry[i]
+            try:
+                if canonical_ms is not None and canonical_ms[i] is not None:
+                    ms[i] = canonical_ms[i]
+                    self.telemetry.fingerprint_M = f"sha256:{ms[i].fingerprint}"
+                else:
+                    ms[i] = self._canonicalize_inputs(inputs)
+            except Exception as e:
+                self.state = "ABSTAIN"
+                self.telemetry.abstains += 1
+                self.telemetry.end_time = time.time()
+                results[i] = self._format_error_response(str(e))
+        
+        # PHASE II: Batched state machine
+        diff_threshold = np.full(n, self.config.diff_threshold)
+        seek_threshold = np.full(n, self.config.seek_threshold)
+        destroy_budget = np.full(n, self.config.max_destroy_cycles, dtype=np.int64)
+        abstain_p_value = self.config.abstain_p_value
+        active = [i for i in range(n) if results[i] is None]
+        
+        while active:
+            idx = np.asarray(active)
+            Ms = [ms[i].__dict__ for i in active]
+            g, g_conf = propose_batch(self.gen, Ms)
+            v, v_conf = verify_batch(self.ver, Ms, g)
+            defect, p_val = detect_batch(self.dfs, Ms, g, v)
+            
+            diff = np.abs(g - v)
+            ece = np.maximum(0.0, 1.0 - ((g_conf + v_conf) / 2.0))
+            cohere = ((diff <= diff_threshold[idx]) &
+                      (defect <= seek_threshold[idx]) &
+                      (p_val > abstain_p_value))
+            destroy = ~cohere & (destroy_budget[idx] > 0)
+            
+            still_active = []
+            for j, i in enumerate(active):
+                tel = telemetry[i]
+                tel.cycles += 1
+                tel.residual_entropy = max(tel.residual_entropy, float(diff[j]))
+                tel.ece = float(ece[j])
+                
+                if destroy[j]:
+                    # Protokół Wzrostu W, per item
+                    tel.destroy_used += 1
+                    diff_threshold[i] *= 0.5
+                    seek_threshold[i] *= 0.5
+                    destroy_budget[i] -= 1
+                    ms[i].dim = ms[i].dim + 1
+                    ms[i].fingerprint = f"{ms[i].fingerprint}_d{tel.destroy_used}"
+                    still_active.append(i)
+                    continue
+                
+                self.state = "COHERE" if cohere[j] else "ABSTAIN"
+                if not cohere[j]:
+                    tel.abstains += 1
+                tel.end_time = time.time()
+                self.telemetry = tel
+                g_j, v_j = float(g[j]), float(v[j])
+                result = {
+                    "score": (g_j + v_j) / 2.0 if cohere[j] else None,
+                    "g_score": g_j,
+                    "v_score": v_j,
+                    "defect_score": float(defect[j]),
+                    "p_value": float(p_val[j]),
+                    "diff": float(diff[j])
+                }
+                thresholds = {
+                    "diff_threshold": float(diff_threshold[i]),
+                    "seek_threshold": float(seek_threshold[i]),
+                    "abstain_p_value": abstain_p_value
+                }
+                results[i] = self._format_response(result, ms[i], thresholds)
+            active = still_active
+        
+        return results
+    
     def _canonicalize_inputs(self, inputs: Dict[str, Any]) -> CanonicalM:
         """Canonicalize inputs to Macierz Tożsamości (M)"""
         canonical_m = self.canonicalizer.canonicalize_M(inputs)
@@ -146,16 +293,16 @@ class JSK:
             # STATE TRANSITION LOGIC
             
             # Check for COHERE state (Zero-Defect achieved)
-            if (diff <= self.config.diff_threshold and 
-                defect <= self.config.seek_threshold and 
-                p_val > self.config.abstain_p_value):
+            if (diff <= self.thresholds.diff_threshold and 
+                defect <= self.thresholds.seek_threshold and 
+                p_val > self.thresholds.abstain_p_value):
                 
                 self.state = "COHERE"
                 result_score = (g + v) / 2.0  # Consensus score
                 break
             
             # Check for ABSTAIN state (statistical uncertainty)
-            if p_val <= self.config.abstain_p_value and destroy_budget == 0:
+            if p_val <= self.thresholds.abstain_p_value and destroy_budget == 0:
                 self.state = "ABSTAIN"
                 self.telemetry.abstains += 1
                 break
@@ -188,9 +335,8 @@ class JSK:
         self.state = "DESTROY"
         self.telemetry.destroy_used += 1
         
-        # Protokół Wzrostu W: Zaostrzenie progów tolerancji
-        self.config.diff_threshold *= 0.5
-        self.config.seek_threshold *= 0.5
+        # Protokół Wzrostu W: Zaostrzenie progów tolerancji (tylko w tym przebiegu)
+        self.thresholds.tighten(0.5)
         
         # Rekalibracja M: Deterministyczny "wstrząs"
         # Zmiana dimensionality wymusza nową ścieżkę inference
@@ -200,7 +346,8 @@ class JSK:
         original_fingerprint = M.fingerprint
         M.fingerprint = f"{original_fingerprint}_d{self.telemetry.destroy_used}"
     
-    def _format_response(self, result: Dict[str, Any], M: CanonicalM) -> Dict[str, Any]:
+    def _format_response(self, result: Dict[str, Any], M: CanonicalM,
+                         thresholds: Dict[str, float] = None) -> Dict[str, Any]:
         """Format final response with full telemetry"""
         return {
             # Core result
@@ -229,7 +376,7 @@ class JSK:
             "execution_time_ms": (self.telemetry.end_time - self.telemetry.start_time) * 1000,
             
             # Evidence pack (for ABSTAIN cases)
-            "evidence": self._create_evidence_pack(result) if self.state == "ABSTAIN" else None
+            "evidence": self._create_evidence_pack(result, thresholds) if self.state == "ABSTAIN" else None
         }
     
     def _format_error_response(self, error: str) -> Dict[str, Any]:
@@ -243,22 +390,22 @@ class JSK:
             "abstains": 1
         }
     
-    def _create_evidence_pack(self, result: Dict[str, Any]) -> Dict[str, Any]:
+    def _create_evidence_pack(self, result: Dict[str, Any],
+                              thresholds: Dict[str, float] = None) -> Dict[str, Any]:
         """Create evidence pack for ABSTAIN decisions"""
         return {
             "reason": "STATISTICAL_UNCERTAINTY",
             "diff": result.get("diff", 0.0),
             "defect_score": result.get("defect_score", 0.0),
             "p_value": result.get("p_value", 0.0),
-            "thresholds": {
-                "diff_threshold": self.config.diff_threshold,
-                "seek_threshold": self.config.seek_threshold,
-                "abstain_p_value": self.config.abstain_p_value
-            },
+            "thresholds": thresholds or self.thresholds.as_dict(),
             "destroy_cycles_used": self.telemetry.destroy_used,
             "max_destroy_cycles": self.config.max_destroy_cycles
         }
 
+# Dawna nazwa klasy (core/__init__.py, testy metamorficzne)
+JSKGovernance = JSK
+
 # ============================================================================
 # MAIN CONTROLLER CLASS
 # ============================================================================
@@ -267,10 +414,28 @@ class JSKController:
     """
     Main J.S.K. Controller for integration with MIGI Core
     Provides high-level interface for Zero-Defect Inference
+    
+    Results are cached by (fingerprint_M, config_commit); assigning a new
+    config or changing the current one invalidates the cache.
+    
+    Thread-safe: every call gets its own JSK run (engines, thresholds), so
+    infer() may be called from many threads; infer_concurrent()/infer_async()
+    front it with a shared thread pool.
+    
+    Every result is recorded in the J.S.K. telemetry; serve_metrics=True also
+    starts the /metrics exporter on config.telemetry.metrics_port.
     """
     
-    def __init__(self, config_path: str = None):
-        self.config = JSKConfig.from_yaml(config_path)
+    def __init__(self, config_path: str = None, cache_size: int = 1024,
+                 cache_ttl_seconds: float = 300.0, max_workers: int = None,
+                 serve_metrics: bool = False):
+        self._config = JSKConfig.from_yaml(config_path)
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        self._executor: ThreadPoolExecutor = None
+        self._lock = threading.Lock()
+        self.canonicalizer = MCanonicalizer()
+        self.cache = JSKResultCache(cache_size, cache_ttl_seconds)
+        self._cache_commit = self._config.get_commit_hash()
         self.stats = {
             "total_inferences": 0,
             "cohere_count": 0,
@@ -278,6 +443,34 @@ class JSKController:
             "avg_cycles": 0.0,
             "avg_destroy_used": 0.0
         }
+        if serve_metrics:
+            Telemetry.serve(self._config.telemetry.metrics_port)
+    
+    @property
+    def config(self) -> JSKConfig:
+        return self._config
+    
+    @config.setter
+    def config(self, config: JSKConfig) -> None:
+        self._config = config
+        self.invalidate_cache()
+    
+    def invalidate_cache(self) -> None:
+        """Drop cached results (config changed)"""
+        with self._lock:
+            self.cache.clear()
+            self._cache_commit = self._config.get_commit_hash()
+    
+    def _cache_key(self, inputs: Dict[str, Any]) -> Tuple[Any, Any]:
+        """(cache key, canonical M); key is None when inputs cannot be canonicalized"""
+        commit = self._config.get_commit_hash()
+        if commit != self._cache_commit:
+            self.invalidate_cache()
+        try:
+            canonical_m = self.canonicalizer.canonicalize_M(inputs)
+        except ValueError:
+            return None, None  # JSK.run reports the error
+        return (canonical_m.fingerprint, commit), canonical_m
     
     def infer(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -289,39 +482,131 @@ class JSKController:
         Returns:
             Inference result with telemetry
         """
-        # Create new J.S.K. instance for this inference
-        jsk = JSK(self.config)
+        start_time = time.time()
+        key, canonical_m = self._cache_key(inputs)
+        cached = self.cache.get(key) if key is not None else None
         
-        # Execute inference
-        result = jsk.run(inputs)
+        if cached is not None:
+            result = copy.deepcopy(cached)
+            result["trace_id"] = str(uuid.uuid4())[:8]
+            result["execution_time_ms"] = (time.time() - start_time) * 1000
+            result["cache_hit"] = True
+        else:
+            # Create new J.S.K. instance for this inference
+            jsk = JSK(self.config)
+            
+            # Execute inference
+            result = jsk.run(inputs, canonical_m)
+            if key is not None and "error" not in result:
+                self.cache.put(key, copy.deepcopy(result))
         
         # Update statistics
         self._update_stats(result)
         
         return result
     
+    def infer_batch(self, inputs_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Batch inference entry point
+        
+        Cached items are served from the cache; the rest run through a single
+        JSK.run_batch() call.
+        
+        Args:
+            inputs_list: Raw input data dictionaries
+            
+        Returns:
+            One inference result per input, in input order
+        """
+        start_time = time.time()
+        results: List[Dict[str, Any]] = [None] * len(inputs_list)
+        keys, misses, miss_ms = [], [], []
+        
+        for i, inputs in enumerate(inputs_list):
+            key, canonical_m = self._cache_key(inputs)
+            keys.append(key)
+            cached = self.cache.get(key) if key is not None else None
+            if cached is not None:
+                result = copy.deepcopy(cached)
+                result["trace_id"] = str(uuid.uuid4())[:8]
+                result["execution_time_ms"] = (time.time() - start_time) * 1000
+                result["cache_hit"] = True
+                results[i] = result
+            else:
+                misses.append(i)
+                miss_ms.append(canonical_m)
+        
+        if misses:
+            jsk = JSK(self.config)
+            computed = jsk.run_batch([inputs_list[i] for i in misses], miss_ms)
+            for i, result in zip(misses, computed):
+                if keys[i] is not None and "error" not in result:
+                    self.cache.put(keys[i], copy.deepcopy(result))
+                results[i] = result
+        
+        for result in results:
+            self._update_stats(result)
+        
+        return results
+    
+    def infer_concurrent(self, inputs_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Run infer() for every input on the controller's thread pool
+        
+        Args:
+            inputs_list: Raw input data dictionaries
+            
+        Returns:
+            One inference result per input, in input order (same as sequential infer())
+        """
+        return list(self._get_executor().map(self.infer, inputs_list))
+    
+    async def infer_async(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """infer() on the controller's thread pool, awaitable from an event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), self.infer, inputs)
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="jsk")
+            return self._executor
+    
+    def shutdown(self) -> None:
+        """Stop the thread pool (if it was started)"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+    
     def _update_stats(self, result: Dict[str, Any]) -> None:
         """Update controller statistics"""
-        self.stats["total_inferences"] += 1
-        
-        if result["state"] == "COHERE":
-            self.stats["cohere_count"] += 1
-        elif result["state"] == "ABSTAIN":
-            self.stats["abstain_count"] += 1
+        with self._lock:
+            self.stats["total_inferences"] += 1
+            
+            if result["state"] == "COHERE":
+                self.stats["cohere_count"] += 1
+            elif result["state"] == "ABSTAIN":
+                self.stats["abstain_count"] += 1
+            
+            # Update moving averages (error responses carry no cycle counts)
+            total = self.stats["total_inferences"]
+            self.stats["avg_cycles"] = ((self.stats["avg_cycles"] * (total - 1)) + result.get("cycles", 0)) / total
+            self.stats["avg_destroy_used"] = ((self.stats["avg_destroy_used"] * (total - 1)) + result.get("destroy_used", 0)) / total
         
-        # Update moving averages
-        total = self.stats["total_inferences"]
-        self.stats["avg_cycles"] = ((self.stats["avg_cycles"] * (total - 1)) + result["cycles"]) / total
-        self.stats["avg_destroy_used"] = ((self.stats["avg_destroy_used"] * (total - 1)) + result["destroy_used"]) / total
+        Telemetry.emit_inference(result)
     
     def get_stats(self) -> Dict[str, Any]:
         """Get controller statistics"""
-        total = self.stats["total_inferences"]
+        with self._lock:
+            stats = dict(self.stats)
+        total = stats["total_inferences"]
         if total == 0:
-            return self.stats
+            return stats
         
         return {
-            **self.stats,
-            "cohere_ratio": self.stats["cohere_count"] / total,
-            "abstain_ratio": self.stats["abstain_count"] / total
+            **stats,
+            "cohere_ratio": stats["cohere_count"] / total,
+            "abstain_ratio": stats["abstain_count"] / total,
+            "cache": self.cache.get_stats()
         }
\ No newline at end of file
@@ -4,8 +4,12 @@ MIGI Core J.S.K. - Policies for Zero-Defect Inference
 ABSTAIN/ESCALATE policies and security controls
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
+from collections import Counter, OrderedDict, deque
 from enum import Enum
+import os
+import sqlite3
+import threading
 import time
 
 class PolicyDecision(Enum):
@@ -81,6 +85,8 @@ class SecurityPolicy(AbstractPolicy):
             "bypass safety",
             "override restrictions"
         ]
+        # Lowercased once; scanned with C substring search (faster than a regex alternation in CPython)
+        self._indicators = tuple(dict.fromkeys(indicator.lower() for indicator in self.threat_indicators))
     
     def evaluate(self, context: Dict[str, Any]) -> PolicyDecision:
         """Evaluate security threats"""
@@ -117,13 +123,11 @@ class SecurityPolicy(AbstractPolicy):
         """Detect potential prompt injection attacks"""
         inputs = context.get("inputs", {})
         
-        for key, value in inputs.items():
-            if isinstance(value, str):
-                value_lower = value.lower()
-                for indicator in self.threat_indicators:
-                    if indicator in value_lower:
-                        return True
-        
+        # Single lowered text for all string inputs; "\n" keeps indicators from spanning two values
+        text = "\n".join([value for value in inputs.values() if isinstance(value, str)]).lower()
+        for indicator in self._indicators:
+            if indicator in text:
+                return True
         return False
     
     def _verify_fingerprint_integrity(self, context: Dict[str, Any]) -> bool:
@@ -170,35 +174,70 @@ class EscalationPolicy(AbstractPolicy):
         
         return PolicyDecision.ALLOW
 
+class PolicyTiming:
+    """Running latency aggregates of one policy + its recent samples (ns)"""
+    
+    __slots__ = ("count", "total_ns", "recent")
+    
+    def __init__(self, window: int):
+        self.count = 0
+        self.total_ns = 0
+        self.recent = deque(maxlen=window)
+    
+    def summary(self) -> Dict[str, float]:
+        recent = sorted(self.recent)
+        return {
+            "evaluations": self.count,
+            "latency_us_avg": self.total_ns / max(self.count, 1) / 1000,
+            "latency_us_p50": recent[len(recent) // 2] / 1000 if recent else 0.0,
+            "latency_us_p95": recent[int(0.95 * (len(recent) - 1))] / 1000 if recent else 0.0
+        }
+
 class PolicyEngine:
     """
     Main policy engine that coordinates all policies
+    
+    Policies run in order (SECURITY first) and evaluation stops at the first
+    DENY. History is a bounded deque with running decision counts, so
+    get_policy_stats() never rescans it; per-policy latency keeps running
+    totals plus the last history_size samples for percentiles.
     """
     
-    def __init__(self, config):
+    def __init__(self, config, history_size: int = 1000):
         self.config = config
         self.policies = [
             SecurityPolicy(config),
             AbstainPolicy(config),
             EscalationPolicy(config)
         ]
-        self.policy_history = []
+        self.policy_history = deque(maxlen=history_size)
+        self.decision_counts = Counter()  # final decisions currently in policy_history
+        self.policy_timing = {policy.name: PolicyTiming(history_size) for policy in self.policies}
     
     def evaluate_all(self, context: Dict[str, Any]) -> Dict[str, Any]:
-        """Evaluate all policies and return combined decision"""
+        """Evaluate policies (short-circuit on DENY) and return combined decision"""
         decisions = {}
+        latency_ns = {}
         final_decision = PolicyDecision.ALLOW
         violated_policies = []
         
+        timing = self.policy_timing
         for policy in self.policies:
+            start = time.perf_counter_ns()
             decision = policy.evaluate(context)
+            elapsed = latency_ns[policy.name] = time.perf_counter_ns() - start
+            t = timing[policy.name]
+            t.count += 1
+            t.total_ns += elapsed
+            t.recent.append(elapsed)
             decisions[policy.name] = decision
             
             # Priority order: DENY > ESCALATE > ABSTAIN > ALLOW
             if decision == PolicyDecision.DENY:
                 final_decision = PolicyDecision.DENY
                 violated_policies.append(policy.name)
-            elif decision == PolicyDecision.ESCALATE and final_decision != PolicyDecision.DENY:
+                break  # nothing can override DENY
+            elif decision == PolicyDecision.ESCALATE:
                 final_decision = PolicyDecision.ESCALATE
                 violated_policies.append(policy.name)
             elif decision == PolicyDecision.ABSTAIN and final_decision == PolicyDecision.ALLOW:
@@ -209,32 +248,37 @@ class PolicyEngine:
             "final_decision": final_decision,
             "individual_decisions": decisions,
             "violated_policies": violated_policies,
+            "latency_ns": latency_ns,
             "timestamp": time.time()
         }
+        if len(decisions) < len(self.policies):
+            result["skipped_policies"] = [p.name for p in self.policies if p.name not in decisions]
         
-        # Record in history
+        # Record in history (running counts follow the deque's evictions)
+        if len(self.policy_history) == self.policy_history.maxlen:
+            self.decision_counts[self.policy_history[0]["final_decision"]] -= 1
         self.policy_history.append(result)
-        if len(self.policy_history) > 1000:  # Keep last 1000 decisions
-            self.policy_history.pop(0)
+        self.decision_counts[final_decision] += 1
         
         return result
     
     def get_policy_stats(self) -> Dict[str, Any]:
-        """Get policy violation statistics"""
+        """Get policy violation and latency statistics"""
         stats = {}
         
         for policy in self.policies:
             stats[policy.name] = {
                 "violation_count": policy.violation_count,
-                "last_violation_time": policy.last_violation_time
+                "last_violation_time": policy.last_violation_time,
+                **self.policy_timing[policy.name].summary()
             }
         
         # Overall stats
         total_decisions = len(self.policy_history)
         if total_decisions > 0:
-            denied = sum(1 for d in self.policy_history if d["final_decision"] == PolicyDecision.DENY)
-            escalated = sum(1 for d in self.policy_history if d["final_decision"] == PolicyDecision.ESCALATE)
-            abstained = sum(1 for d in self.policy_history if d["final_decision"] == PolicyDecision.ABSTAIN)
+            denied = self.decision_counts[PolicyDecision.DENY]
+            escalated = self.decision_counts[PolicyDecision.ESCALATE]
+            abstained = self.decision_counts[PolicyDecision.ABSTAIN]
             
             stats["overall"] = {
                 "total_decisions": total_decisions,
@@ -246,55 +290,233 @@ class PolicyEngine:
         
         return stats
 
+class MemoryRetryStore:
+    """
+    In-process retry state, bounded and kept in last-attempt order
+    
+    The TTL is the same for every entry, so last-attempt order is expiry
+    order: expiring means popping from the front of an OrderedDict (a
+    one-slot timing wheel), O(expired) instead of a full sweep. Each entry is
+    one int (last attempt in ms << 8 | count); sha256 fingerprints are keyed
+    by their first 16 digest bytes.
+    """
+    
+    clock = staticmethod(time.monotonic)
+    
+    def __init__(self, max_entries: int = 1_000_000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Any, int]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Any) -> Optional[Tuple[int, float]]:
+        packed = self._entries.get(key)
+        return None if packed is None else _unpack_retry(packed)
+    
+    def record(self, key: Any, now: float) -> int:
+        with self._lock:
+            packed = self._entries.pop(key, None)
+            count = min((packed & 0xFF) + 1 if packed is not None else 1, 0xFF)
+            self._entries[key] = (int(now * 1000) << 8) | count
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return count
+    
+    def delete(self, key: Any) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def expire(self, cutoff: float) -> int:
+        """Drop entries whose last attempt is older than cutoff"""
+        removed = 0
+        cutoff_ms = int(cutoff * 1000)
+        with self._lock:
+            while self._entries:
+                key, packed = next(iter(self._entries.items()))
+                if packed >> 8 >= cutoff_ms:
+                    break
+                del self._entries[key]
+                removed += 1
+        return removed
+    
+    def trim(self) -> int:
+        """Size bound is enforced in record()"""
+        return 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class SQLiteRetryStore:
+    """
+    Retry state shared by worker processes through one SQLite file (WAL mode)
+    
+    Timestamps are wall-clock seconds since monotonic clocks are per process;
+    the last_attempt index makes expiry a range delete. max_entries needs a
+    COUNT(*), so it is enforced by trim() from the expiry thread, not on the
+    request path.
+    """
+    
+    clock = staticmethod(time.time)
+    
+    def __init__(self, path: str, max_entries: int = 1_000_000):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        # Schema on a throwaway connection: a store built before workers fork must not hand one to them
+        db = self._open()
+        try:
+            db.execute("CREATE TABLE IF NOT EXISTS retry_budget ("
+                       "key BLOB PRIMARY KEY, count INTEGER NOT NULL, last_attempt REAL NOT NULL)")
+            db.execute("CREATE INDEX IF NOT EXISTS retry_budget_last ON retry_budget (last_attempt)")
+        finally:
+            db.close()
+    
+    def _open(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Per-thread connection, reopened in a forked child (SQLite connections must not cross fork)"""
+        pid = os.getpid()
+        if getattr(self._local, "pid", None) != pid:
+            self._local.db = self._open()
+            self._local.pid = pid
+        return self._local.db
+    
+    @staticmethod
+    def _blob(key: Any) -> bytes:
+        return key if isinstance(key, bytes) else str(key).encode("utf-8")
+    
+    def get(self, key: Any) -> Optional[Tuple[int, float]]:
+        row = self._connect().execute(
+            "SELECT count, last_attempt FROM retry_budget WHERE key = ?", (self._blob(key),)
+        ).fetchone()
+        return None if row is None else (row[0], row[1])
+    
+    def record(self, key: Any, now: float) -> int:
+        db = self._connect()
+        blob = self._blob(key)
+        # One statement, so concurrent processes each see their own increment
+        return db.execute(
+            "INSERT INTO retry_budget (key, count, last_attempt) VALUES (?, 1, ?) "
+            "ON CONFLICT(key) DO UPDATE SET count = count + 1, last_attempt = excluded.last_attempt "
+            "RETURNING count",
+            (blob, now)
+        ).fetchone()[0]
+    
+    def delete(self, key: Any) -> None:
+        self._connect().execute("DELETE FROM retry_budget WHERE key = ?", (self._blob(key),))
+    
+    def expire(self, cutoff: float) -> int:
+        return self._connect().execute("DELETE FROM retry_budget WHERE last_attempt < ?", (cutoff,)).rowcount
+    
+    def trim(self) -> int:
+        """Drop the oldest entries beyond max_entries (one statement)"""
+        return self._connect().execute(
+            "DELETE FROM retry_budget WHERE key IN (SELECT key FROM retry_budget ORDER BY last_attempt "
+            "LIMIT max(0, (SELECT COUNT(*) FROM retry_budget) - ?))", (self.max_entries,)
+        ).rowcount
+    
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM retry_budget").fetchone()[0]
+
+def _unpack_retry(packed: int) -> Tuple[int, float]:
+    """(count, last_attempt seconds) from a MemoryRetryStore entry"""
+    return packed & 0xFF, (packed >> 8) / 1000
+
 class RetryBudgetManager:
     """
     Manages retry budget for failed inferences
     Prevents infinite loops while allowing reasonable retry attempts
+    
+    Entries expire ttl_seconds after their last attempt: on access (amortized,
+    at most every expire_interval seconds) or from start_expiry_thread().
+    Pass sqlite_path to share budgets between worker processes; its
+    max_entries bound is applied by cleanup_old_entries() / the expiry thread.
     """
     
-    def __init__(self, max_retries: int = 3, cooldown_seconds: int = 60):
+    def __init__(self, max_retries: int = 3, cooldown_seconds: int = 60,
+                 ttl_seconds: float = 3600, max_entries: int = 1_000_000,
+                 sqlite_path: str = None, expire_interval: float = 1.0):
         self.max_retries = max_retries
         self.cooldown_seconds = cooldown_seconds
-        self.retry_history = {}  # fingerprint -> retry info
+        self.ttl_seconds = ttl_seconds
+        self.expire_interval = expire_interval
+        self.store = SQLiteRetryStore(sqlite_path, max_entries) if sqlite_path else MemoryRetryStore(max_entries)
+        self._next_expiry = 0.0
+        self._expiry_thread: Optional[threading.Thread] = None
+        self._stop_expiry = threading.Event()
+    
+    @staticmethod
+    def _key(fingerprint_M: str) -> Any:
+        """Compact key: 16 digest bytes for sha256 fingerprints, the string otherwise"""
+        if fingerprint_M.startswith("sha256:") and len(fingerprint_M) >= 39:
+            try:
+                return bytes.fromhex(fingerprint_M[7:39])
+            except ValueError:
+                pass
+        return fingerprint_M
+    
+    def _maybe_expire(self, now: float) -> None:
+        if now >= self._next_expiry:
+            self._next_expiry = now + self.expire_interval
+            self.store.expire(now - self.ttl_seconds)
     
     def can_retry(self, fingerprint_M: str) -> bool:
         """Check if inference can be retried"""
-        if fingerprint_M not in self.retry_history:
+        now = self.store.clock()
+        self._maybe_expire(now)
+        retry_info = self.store.get(self._key(fingerprint_M))
+        if retry_info is None:
             return True
         
-        retry_info = self.retry_history[fingerprint_M]
+        count, last_attempt = retry_info
         
         # Check retry count
-        if retry_info["count"] >= self.max_retries:
+        if count >= self.max_retries:
             return False
         
         # Check cooldown
-        if time.time() - retry_info["last_attempt"] < self.cooldown_seconds:
+        if now - last_attempt < self.cooldown_seconds:
             return False
         
         return True
     
     def record_attempt(self, fingerprint_M: str) -> None:
         """Record retry attempt"""
-        if fingerprint_M not in self.retry_history:
-            self.retry_history[fingerprint_M] = {"count": 0, "last_attempt": 0}
-        
-        self.retry_history[fingerprint_M]["count"] += 1
-        self.retry_history[fingerprint_M]["last_attempt"] = time.time()
+        now = self.store.clock()
+        self._maybe_expire(now)
+        self.store.record(self._key(fingerprint_M), now)
     
     def reset_for_fingerprint(self, fingerprint_M: str) -> None:
         """Reset retry count for successful inference"""
-        if fingerprint_M in self.retry_history:
-            del self.retry_history[fingerprint_M]
+        self.store.delete(self._key(fingerprint_M))
     
-    def cleanup_old_entries(self, max_age_seconds: int = 3600) -> None:
-        """Remove old retry history entries"""
-        current_time = time.time()
-        to_remove = []
-        
-        for fingerprint, info in self.retry_history.items():
-            if current_time - info["last_attempt"] > max_age_seconds:
-                to_remove.append(fingerprint)
-        
-        for fingerprint in to_remove:
-            del self.retry_history[fingerprint]
\ No newline at end of file
+    def cleanup_old_entries(self, max_age_seconds: int = None) -> int:
+        """Remove entries older than max_age_seconds (default ttl_seconds) and beyond max_entries; returns count removed"""
+        max_age = self.ttl_seconds if max_age_seconds is None else max_age_seconds
+        return self.store.expire(self.store.clock() - max_age) + self.store.trim()
+    
+    def start_expiry_thread(self, interval: float = None) -> None:
+        """Expire entries from a background daemon thread every interval seconds"""
+        if self._expiry_thread is not None:
+            return
+        interval = interval or self.expire_interval
+        
+        def tick():
+            while not self._stop_expiry.wait(interval):
+                self.cleanup_old_entries()
+        
+        self._stop_expiry.clear()
+        self._expiry_thread = threading.Thread(target=tick, name="retry-budget-expiry", daemon=True)
+        self._expiry_thread.start()
+    
+    def stop_expiry_thread(self) -> None:
+        if self._expiry_thread is not None:
+            self._stop_expiry.set()
+            self._expiry_thread.join()
+            self._expiry_thread = None
+    
+    def __len__(self) -> int:
+        return len(self.store)
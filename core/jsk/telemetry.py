@@ -4,49 +4,176 @@ MIGI Core J.S.K. Telemetry - Prometheus Metrics & SLO Monitoring
 Real-time monitoring dla Zero-Defect Inference Pipeline
 """
 
+import math
+import threading
 import time
-from typing import Dict, Any, Optional
-from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional
 from collections import defaultdict, deque
 
-@dataclass
+from ..metrics_registry import MetricsRegistry, REGISTRY, start_metrics_server
+
+# Rolling windows matching alert durations in configs/jsk.yaml (15m, 30m) plus 1m/24h
+WINDOWS = {"1m": 60, "15m": 900, "30m": 1800, "24h": 86400}
+DEFAULT_WINDOW = "15m"
+
+class StreamingHistogram:
+    """
+    Log-bucketed streaming histogram (HDR/DDSketch style)
+    
+    Bucket i covers (min_value * gamma^(i-1), min_value * gamma^i], so any
+    quantile is returned within `relative_error`. Insert is O(1), quantiles
+    are O(buckets in use); values <= min_value share a single zero bucket.
+    """
+    
+    def __init__(self, relative_error: float = 0.01, min_value: float = 1e-9):
+        self.relative_error = relative_error
+        self.min_value = min_value
+        self.gamma = (1 + relative_error) / (1 - relative_error)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = defaultdict(int)
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+    
+    def add(self, value: float, n: int = 1) -> None:
+        """Add value (n times)"""
+        if value <= self.min_value:
+            self.zero_count += n
+        else:
+            self.buckets[math.ceil(math.log(value / self.min_value) / self._log_gamma)] += n
+        self.count += n
+        self.sum += value * n
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+    
+    def merge(self, other: "StreamingHistogram") -> None:
+        """Add all counts of another histogram with the same parameters"""
+        for idx, n in other.buckets.items():
+            self.buckets[idx] += n
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+    
+    def quantile(self, q: float) -> float:
+        """Approximate q-quantile (0 <= q <= 1); 0.0 when empty"""
+        if self.count == 0:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return self.min
+        for idx in sorted(self.buckets):
+            seen += self.buckets[idx]
+            if rank < seen:
+                value = self.min_value * 2 * self.gamma ** idx / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+    
+    def average(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+class RollingHistogram:
+    """
+    Time-windowed histogram: a ring of `slots` sub-histograms covering `window_seconds`
+    
+    Old slots are recycled on insert; queries merge the live slots (cached
+    until the next insert or slot rollover).
+    """
+    
+    def __init__(self, window_seconds: float, slots: int = 60, relative_error: float = 0.01):
+        self.window_seconds = window_seconds
+        self.slots = slots
+        self.slot_seconds = window_seconds / slots
+        self.relative_error = relative_error
+        self._ring: List[Optional[StreamingHistogram]] = [None] * slots
+        self._ring_ids: List[int] = [-1] * slots
+        self._version = 0
+        self._snapshot_key = None
+        self._snapshot: Optional[StreamingHistogram] = None
+    
+    def add(self, value: float, timestamp: float) -> None:
+        slot_id = int(timestamp // self.slot_seconds)
+        i = slot_id % self.slots
+        if self._ring_ids[i] > slot_id:
+            return  # older than the window already kept in this slot
+        if self._ring_ids[i] != slot_id:
+            self._ring[i] = StreamingHistogram(self.relative_error)
+            self._ring_ids[i] = slot_id
+        self._ring[i].add(value)
+        self._version += 1
+    
+    def snapshot(self, now: float = None) -> StreamingHistogram:
+        """Merged histogram of the last window_seconds"""
+        now_slot = int((time.time() if now is None else now) // self.slot_seconds)
+        key = (now_slot, self._version)
+        if key != self._snapshot_key:
+            merged = StreamingHistogram(self.relative_error)
+            for slot_id, hist in zip(self._ring_ids, self._ring):
+                if hist is not None and now_slot - self.slots < slot_id <= now_slot:
+                    merged.merge(hist)
+            self._snapshot_key, self._snapshot = key, merged
+        return self._snapshot
+
 class MetricWindow:
-    """Sliding window for metric calculations"""
-    values: deque = field(default_factory=lambda: deque(maxlen=1000))
-    timestamps: deque = field(default_factory=lambda: deque(maxlen=1000))
+    """Streaming metric: lifetime histogram + rolling 1m/15m/30m/24h windows"""
+    
+    def __init__(self, windows: Dict[str, float] = None, default_window: str = DEFAULT_WINDOW):
+        self.windows = {name: RollingHistogram(seconds) for name, seconds in (windows or WINDOWS).items()}
+        self.default_window = default_window
+        self.lifetime = StreamingHistogram()
     
     def add(self, value: float, timestamp: float = None):
         """Add value to window"""
         if timestamp is None:
             timestamp = time.time()
-        self.values.append(value)
-        self.timestamps.append(timestamp)
+        self.lifetime.add(value)
+        for rolling in self.windows.values():
+            rolling.add(value, timestamp)
+    
+    def histogram(self, window: str = None) -> StreamingHistogram:
+        """Histogram for a window name, or "all" for lifetime"""
+        window = window or self.default_window
+        if window == "all":
+            return self.lifetime
+        return self.windows[window].snapshot()
     
-    def get_p95(self) -> float:
+    def get_quantile(self, q: float, window: str = None) -> float:
+        return self.histogram(window).quantile(q)
+    
+    def get_p95(self, window: str = None) -> float:
         """Get 95th percentile"""
-        if not self.values:
-            return 0.0
-        sorted_values = sorted(self.values)
-        idx = int(0.95 * len(sorted_values))
-        return sorted_values[min(idx, len(sorted_values) - 1)]
+        return self.get_quantile(0.95, window)
     
-    def get_average(self) -> float:
+    def get_average(self, window: str = None) -> float:
         """Get average value"""
-        if not self.values:
-            return 0.0
-        return sum(self.values) / len(self.values)
+        return self.histogram(window).average()
     
-    def get_count(self) -> int:
+    def get_count(self, window: str = None) -> int:
         """Get total count"""
-        return len(self.values)
+        return self.histogram(window).count
+
+# Histogram buckets for /metrics
+CYCLES_BUCKETS = [1, 2, 3, 4, 5]
+EXECUTION_TIME_BUCKETS_MS = [1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000]
 
 class JSKMetrics:
     """
     J.S.K. Metrics Collector and Aggregator
     Collects real-time metrics for SLO monitoring and alerting
+    
+    Counters and histograms live in a MetricsRegistry (the global `metrics`
+    instance uses the process-wide REGISTRY served on telemetry.metrics_port);
+    window gauges are computed when the registry renders, not per inference.
     """
     
-    def __init__(self):
+    def __init__(self, registry: MetricsRegistry = None):
+        self.registry = registry if registry is not None else MetricsRegistry()
+        self._lock = threading.Lock()
+        
         # Core metrics
         self.residual_entropy = MetricWindow()
         self.ece = MetricWindow()
@@ -63,135 +190,179 @@ class JSKMetrics:
         
         # SLO violations
         self.slo_violations = []
+        
+        self._register_metrics()
+    
+    def _register_metrics(self) -> None:
+        """Declare J.S.K. metric families (names as in configs/jsk.yaml)"""
+        r = self.registry
+        self.inferences_total = r.counter("jsk_inferences_total", "Liczba inferencji wg stanu", ["state"])
+        self.destroy_used_total = r.counter("jsk_destroy_used_total", "Liczba wykorzystanych cykli D")
+        self.abstain_total = r.counter("jsk_abstain_total", "Liczba przypadków ABSTAIN")
+        self.cache_events_total = r.counter("jsk_cache_events_total", "Zdarzenia cache wyników", ["event"])
+        self.cycles_histogram = r.histogram(
+            "jsk_cycles_histogram", "Rozkład liczby cykli do koherencji", buckets=CYCLES_BUCKETS
+        )
+        self.execution_time_histogram = r.histogram(
+            "jsk_execution_time_ms", "Czas inferencji (ms)", buckets=EXECUTION_TIME_BUCKETS_MS
+        )
+        
+        gauges = {
+            "jsk_residual_entropy": ("Entropia Resztkowa (średnia, okno domyślne)", lambda: self.residual_entropy.get_average()),
+            "jsk_residual_entropy_p95": ("Entropia Resztkowa p95", lambda: self.residual_entropy.get_p95()),
+            "jsk_ece": ("Expected Calibration Error (średnia)", lambda: self.ece.get_average()),
+            "jsk_ece_p95": ("Expected Calibration Error p95", lambda: self.ece.get_p95()),
+            "jsk_avg_cycles": ("Średnia liczba cykli", lambda: self.cycles.get_average()),
+            "jsk_avg_destroy_used": ("Średnia liczba cykli D", lambda: self.destroy_used.get_average()),
+            "jsk_cohere_ratio": ("Wskaźnik COHERE vs ABSTAIN", lambda: self._ratio("COHERE")),
+            "jsk_abstain_ratio": ("Wskaźnik ABSTAIN", lambda: self._ratio("ABSTAIN")),
+        }
+        for name, (description, read) in gauges.items():
+            r.gauge(name, description, function=self._locked(read))
+    
+    def _locked(self, read):
+        """Wrap a gauge callback so it reads windows under the metrics lock"""
+        def call():
+            with self._lock:
+                return read()
+        return call
+    
+    def _ratio(self, state: str) -> float:
+        return self.state_counts[state] / max(self.counters["total_inferences"], 1)
     
     def record_inference(self, result: Dict[str, Any]) -> None:
         """Record metrics from inference result"""
         timestamp = time.time()
-        
-        # Record core metrics
-        self.residual_entropy.add(result.get("residual_entropy", 0.0), timestamp)
-        self.ece.add(result.get("ece", 0.0), timestamp)
-        self.cycles.add(result.get("cycles", 0), timestamp)
-        self.destroy_used.add(result.get("destroy_used", 0), timestamp)
-        self.execution_time.add(result.get("execution_time_ms", 0.0), timestamp)
-        
-        # Count by state
         state = result.get("state", "UNKNOWN")
-        self.state_counts[state] += 1
-        self.counters["total_inferences"] += 1
+        destroy_used = result.get("destroy_used", 0)
         
-        # Count specific events
-        if result.get("destroy_used", 0) > 0:
-            self.counters["destroy_used_total"] += result["destroy_used"]
+        with self._lock:
+            # Record core metrics
+            self.residual_entropy.add(result.get("residual_entropy", 0.0), timestamp)
+            self.ece.add(result.get("ece", 0.0), timestamp)
+            self.cycles.add(result.get("cycles", 0), timestamp)
+            self.destroy_used.add(destroy_used, timestamp)
+            self.execution_time.add(result.get("execution_time_ms", 0.0), timestamp)
+            
+            # Count by state
+            self.state_counts[state] += 1
+            self.counters["total_inferences"] += 1
+            
+            # Count specific events
+            if destroy_used > 0:
+                self.counters["destroy_used_total"] += destroy_used
+            
+            if state == "ABSTAIN":
+                self.counters["abstain_total"] += 1
         
+        self.inferences_total.labels(state).inc()
+        self.cycles_histogram.observe(result.get("cycles", 0))
+        self.execution_time_histogram.observe(result.get("execution_time_ms", 0.0))
+        if destroy_used > 0:
+            self.destroy_used_total.inc(destroy_used)
         if state == "ABSTAIN":
-            self.counters["abstain_total"] += 1
+            self.abstain_total.inc()
     
-    def get_prometheus_metrics(self) -> str:
-        """Generate Prometheus-compatible metrics"""
-        timestamp = int(time.time() * 1000)
-        
-        metrics = []
-        
-        # Gauges
-        metrics.append(f"jsk_residual_entropy {self.residual_entropy.get_average():.6f} {timestamp}")
-        metrics.append(f"jsk_residual_entropy_p95 {self.residual_entropy.get_p95():.6f} {timestamp}")
-        metrics.append(f"jsk_ece {self.ece.get_average():.6f} {timestamp}")
-        metrics.append(f"jsk_ece_p95 {self.ece.get_p95():.6f} {timestamp}")
-        metrics.append(f"jsk_avg_cycles {self.cycles.get_average():.2f} {timestamp}")
-        metrics.append(f"jsk_avg_destroy_used {self.destroy_used.get_average():.2f} {timestamp}")
-        metrics.append(f"jsk_execution_time_ms_avg {self.execution_time.get_average():.2f} {timestamp}")
-        
-        # Ratios
-        total = self.counters["total_inferences"]
-        if total > 0:
-            cohere_ratio = self.state_counts["COHERE"] / total
-            abstain_ratio = self.state_counts["ABSTAIN"] / total
-            metrics.append(f"jsk_cohere_ratio {cohere_ratio:.4f} {timestamp}")
-            metrics.append(f"jsk_abstain_ratio {abstain_ratio:.4f} {timestamp}")
-        
-        # Counters
-        for name, value in self.counters.items():
-            metrics.append(f"jsk_{name} {value} {timestamp}")
-        
-        return "\n".join(metrics)
+    def record_cache(self, event: str, n: int = 1) -> None:
+        """Record result cache event (hits/misses/evictions/expirations/invalidations)"""
+        with self._lock:
+            self.counters[f"cache_{event}_total"] += n
+        self.cache_events_total.labels(event).inc(n)
     
-    def check_slos(self, config) -> Dict[str, bool]:
-        """Check SLO compliance"""
-        violations = {}
+    def get_prometheus_metrics(self, max_age: float = 0.0) -> str:
+        """Prometheus exposition text of the registry (cached for max_age seconds)"""
+        return self.registry.exposition(max_age)
+    
+    def check_slos(self, config, window: str = "24h") -> Dict[str, bool]:
+        """Check SLO compliance over a rolling window (SLOs are defined over 24h)"""
+        with self._lock:
+            violations = {}
         
-        # Check residual entropy SLO
-        if self.residual_entropy.get_p95() > config.slo.residual_entropy:
-            violations["residual_entropy_p95"] = True
+            # Check residual entropy SLO
+            if self.residual_entropy.get_p95(window) > config.slo.residual_entropy_p95:
+                violations["residual_entropy_p95"] = True
         
-        # Check ECE SLO
-        if self.ece.get_p95() > config.slo.ece:
-            violations["ece_p95"] = True
+            # Check ECE SLO
+            if self.ece.get_p95(window) > config.slo.ece_p95:
+                violations["ece_p95"] = True
         
-        # Check cycles SLO
-        if self.cycles.get_average() > config.slo.max_cycles:
-            violations["avg_cycles"] = True
+            # Check cycles SLO
+            if self.cycles.get_average(window) > config.slo.max_cycles:
+                violations["avg_cycles"] = True
         
-        # Check cohere ratio SLO
-        total = self.counters["total_inferences"]
-        if total > 10:  # Minimum sample size
-            cohere_ratio = self.state_counts["COHERE"] / total
-            if cohere_ratio < config.slo.cohere_ratio_min:
-                violations["cohere_ratio"] = True
+            # Check cohere ratio SLO
+            total = self.counters["total_inferences"]
+            if total > 10:  # Minimum sample size
+                cohere_ratio = self.state_counts["COHERE"] / total
+                if cohere_ratio < config.slo.cohere_ratio_target:
+                    violations["cohere_ratio"] = True
             
-            abstain_ratio = self.state_counts["ABSTAIN"] / total
-            if abstain_ratio > config.slo.abstain_ratio_max:
-                violations["abstain_ratio"] = True
+                abstain_ratio = self.state_counts["ABSTAIN"] / total
+                if abstain_ratio > config.slo.abstain_ratio_max:
+                    violations["abstain_ratio"] = True
         
-        # Record violations
-        if violations:
-            self.slo_violations.append({
-                "timestamp": time.time(),
-                "violations": violations.copy()
-            })
+            # Record violations
+            if violations:
+                self.slo_violations.append({
+                    "timestamp": time.time(),
+                    "violations": violations.copy()
+                })
         
-        return violations
+            return violations
     
     def get_dashboard_data(self) -> Dict[str, Any]:
         """Get data for monitoring dashboard"""
-        total = self.counters["total_inferences"]
+        with self._lock:
+            total = self.counters["total_inferences"]
         
-        return {
-            "summary": {
-                "total_inferences": total,
-                "cohere_count": self.state_counts["COHERE"],
-                "abstain_count": self.state_counts["ABSTAIN"],
-                "cohere_ratio": self.state_counts["COHERE"] / max(total, 1),
-                "abstain_ratio": self.state_counts["ABSTAIN"] / max(total, 1)
-            },
-            "performance": {
-                "avg_residual_entropy": self.residual_entropy.get_average(),
-                "p95_residual_entropy": self.residual_entropy.get_p95(),
-                "avg_ece": self.ece.get_average(),
-                "p95_ece": self.ece.get_p95(),
-                "avg_cycles": self.cycles.get_average(),
-                "avg_destroy_used": self.destroy_used.get_average(),
-                "avg_execution_time_ms": self.execution_time.get_average()
-            },
-            "slo_violations": self.slo_violations[-10:],  # Last 10 violations
-            "recent_states": dict(self.state_counts)
-        }
+            return {
+                "summary": {
+                    "total_inferences": total,
+                    "cohere_count": self.state_counts["COHERE"],
+                    "abstain_count": self.state_counts["ABSTAIN"],
+                    "cohere_ratio": self.state_counts["COHERE"] / max(total, 1),
+                    "abstain_ratio": self.state_counts["ABSTAIN"] / max(total, 1)
+                },
+                "performance": {
+                    "avg_residual_entropy": self.residual_entropy.get_average(),
+                    "p95_residual_entropy": self.residual_entropy.get_p95(),
+                    "avg_ece": self.ece.get_average(),
+                    "p95_ece": self.ece.get_p95(),
+                    "avg_cycles": self.cycles.get_average(),
+                    "avg_destroy_used": self.destroy_used.get_average(),
+                    "avg_execution_time_ms": self.execution_time.get_average()
+                },
+                "windows": {
+                    window: {
+                        "count": self.residual_entropy.get_count(window),
+                        "p95_residual_entropy": self.residual_entropy.get_p95(window),
+                        "p95_ece": self.ece.get_p95(window),
+                        "p95_execution_time_ms": self.execution_time.get_p95(window),
+                        "avg_cycles": self.cycles.get_average(window)
+                    }
+                    for window in WINDOWS
+                },
+                "slo_violations": self.slo_violations[-10:],  # Last 10 violations
+                "recent_states": dict(self.state_counts)
+            }
     
     def reset_counters(self) -> None:
         """Reset all counters (for testing)"""
-        self.counters.clear()
-        self.state_counts.clear()
-        self.slo_violations.clear()
-        
-        # Clear metric windows
-        self.residual_entropy = MetricWindow()
-        self.ece = MetricWindow()
-        self.cycles = MetricWindow()
-        self.destroy_used = MetricWindow()
-        self.execution_time = MetricWindow()
+        with self._lock:
+            self.counters.clear()
+            self.state_counts.clear()
+            self.slo_violations.clear()
+            
+            # Clear metric windows
+            self.residual_entropy = MetricWindow()
+            self.ece = MetricWindow()
+            self.cycles = MetricWindow()
+            self.destroy_used = MetricWindow()
+            self.execution_time = MetricWindow()
+        self.registry.reset()
 
-# Global metrics instance
-metrics = JSKMetrics()
+# Global metrics instance (exported on telemetry.metrics_port)
+metrics = JSKMetrics(REGISTRY)
 
 class Telemetry:
     """Static class for easy metric emission"""
@@ -211,10 +382,20 @@ class Telemetry:
         if violations:
             print(f"⚠️  SLO Violations detected: {violations}")
     
+    @staticmethod
+    def emit_cache(event: str, n: int = 1) -> None:
+        """Emit result cache counter"""
+        metrics.record_cache(event, n)
+    
     @staticmethod
     def get_prometheus() -> str:
         """Get Prometheus metrics"""
-        return metrics.get_prometheus_metrics()
+        return metrics.get_prometheus_metrics(max_age=1.0)
+    
+    @staticmethod
+    def serve(port: int = None):
+        """Start the /metrics exporter (telemetry.metrics_port, default 9090)"""
+        return start_metrics_server(port, registry=metrics.registry)
     
     @staticmethod
     def get_dashboard() -> Dict[str, Any]:
@@ -0,0 +1,79 @@
+"""
+J.S.K. Batch Inference Tests
+============================
+run_batch / infer_batch must match the scalar path item for item
+"""
+
+import pytest
+import sys
+import os
+import random
+
+# Add core to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+from core.jsk import JSKController, JSKConfig
+from core.jsk.governance import JSK
+
+VOLATILE = ("trace_id", "execution_time_ms", "cache_hit")
+
+def _stable(result):
+    return {k: v for k, v in result.items() if k not in VOLATILE}
+
+def _inputs(count=120):
+    rng = random.Random(7)
+    return [
+        {"text": "".join(rng.choice("abc xyz.") for _ in range(rng.randint(1, 400))), "n": i}
+        for i in range(count)
+    ]
+
+CONFIGS = [
+    dict(),                                                                  # mostly DESTROY -> ABSTAIN
+    dict(diff_threshold=0.05, seek_threshold=0.08, abstain_p_value=1e-30),  # mixed COHERE/DESTROY
+    dict(diff_threshold=0.2, seek_threshold=0.3, max_destroy_cycles=3),
+]
+
+class TestBatchInference:
+    """Batch path vs scalar path"""
+
+    @pytest.mark.parametrize("params", CONFIGS)
+    def test_run_batch_matches_scalar(self, params):
+        items = _inputs()
+        scalar = [_stable(JSK(JSKConfig(**params)).run(x)) for x in items]
+        batch = [_stable(r) for r in JSK(JSKConfig(**params)).run_batch(items)]
+        assert batch == scalar
+
+    def test_invalid_item_abstains_alone(self):
+        items = [{"text": "ok"}, {"bad": object()}, {"text": "also ok"}]
+        results = JSK(JSKConfig()).run_batch(items)
+        assert results[1]["state"] == "ABSTAIN" and "error" in results[1]
+        assert "error" not in results[0] and "error" not in results[2]
+
+    def test_scalar_only_engines_use_fallback_loop(self):
+        class ScalarGen:
+            def propose(self, M):
+                return 0.5, 0.9
+
+        class ScalarVer:
+            def verify(self, M, proposal):
+                return proposal, 0.9
+
+        class ScalarDef:
+            def detect(self, M, g, v):
+                return 0.0, 1.0
+
+        jsk = JSK(JSKConfig(), gen=ScalarGen(), ver=ScalarVer(), dfs=ScalarDef())
+        results = jsk.run_batch(_inputs(5))
+        assert [r["state"] for r in results] == ["COHERE"] * 5
+        assert all(r["score"] == 0.5 for r in results)
+
+    def test_controller_infer_batch_uses_cache(self):
+        controller = JSKController()
+        controller.config = JSKConfig(**CONFIGS[2])
+        items = _inputs(10)
+        first = controller.infer_batch(items)
+        second = controller.infer_batch(items)
+
+        assert [_stable(r) for r in first] == [_stable(r) for r in second]
+        assert all(r.get("cache_hit") for r in second)
+        assert controller.get_stats()["total_inferences"] == 20
@@ -0,0 +1,83 @@
+"""
+Macierz Tożsamości (M) Canonicalization Tests
+=============================================
+Single-pass encoder vs the json.dumps reference, streaming of large values, schema versions
+"""
+
+import pytest
+import sys
+import os
+import hashlib
+import json
+import random
+import tracemalloc
+
+# Add core to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+from core.feature_store.canonicalize import MCanonicalizer, _iterencode
+
+INPUTS = {"text": "zażółć gęślą", "values": [1, 2.5, None], "meta": {"b": True, "a": {"x": []}}, "n": 3}
+
+class TestCanonicalizer:
+    """MCanonicalizer.canonicalize_M"""
+
+    def test_digest_matches_json_reference(self):
+        blob = json.dumps(INPUTS, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+        m = MCanonicalizer().canonicalize_M(INPUTS)
+
+        assert m.digest == hashlib.sha256(blob.encode('utf-8')).hexdigest()
+        assert m.dim == len(INPUTS["text"]) + 3 + 2 + 1
+        fingerprint_blob = json.dumps({"digest": m.digest, "schema_version": "1.0.0", "dim": m.dim}, sort_keys=True)
+        assert m.fingerprint == hashlib.sha256(fingerprint_blob.encode()).hexdigest()[:16]
+
+    def test_source_map_independent_of_key_order(self):
+        reordered = {"n": 3, "meta": {"a": {"x": []}, "b": True}, "values": [1, 2.5, None], "text": "zażółć gęślą"}
+        canonicalizer = MCanonicalizer()
+        assert canonicalizer.canonicalize_M(INPUTS).source_map == canonicalizer.canonicalize_M(reordered).source_map
+
+    def test_blake2b_schema(self):
+        sha = MCanonicalizer().canonicalize_M(INPUTS)
+        blake = MCanonicalizer("1.1.0").canonicalize_M(INPUTS)
+        assert blake.schema_version == "1.1.0" and blake.digest != sha.digest
+        with pytest.raises(ValueError):
+            MCanonicalizer("0.9")
+
+def random_value(rng, depth=0):
+    kind = rng.randrange(7 if depth < 3 else 4)
+    if kind == 0:
+        return rng.choice([None, True, False, 0, -7, 1e300, 0.1, "ą\"\n"])
+    if kind == 1:
+        return rng.random() * 1e6
+    if kind == 2:
+        return "".join(rng.choice("abcżź \\\"\t") for _ in range(rng.randrange(20)))
+    if kind == 3:
+        return rng.randrange(-10**20, 10**20)
+    n = rng.choice([0, 3, 40, 2100] if depth == 0 else [0, 3, 40])
+    if kind == 4:
+        return [random_value(rng, depth + 1) for _ in range(n)]
+    if kind == 5:
+        return tuple(random_value(rng, depth + 1) for _ in range(n))
+    return {f"k{rng.randrange(10**6)}": random_value(rng, depth + 1) for _ in range(n)}
+
+class TestStreamingEncoder:
+    """Streamed canonical JSON of large nested values"""
+
+    @pytest.mark.parametrize("seed", range(8))
+    def test_iterencode_matches_json(self, seed):
+        value = random_value(random.Random(seed))
+        reference = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+        assert "".join(_iterencode(value)) == reference
+
+    def test_large_value_is_not_materialized(self):
+        inputs = {"payload": {"rows": [{"id": i, "vec": [i * 0.5] * 8} for i in range(50_000)]}}
+        blob = json.dumps(inputs, sort_keys=True, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+        tracemalloc.start()
+        m = MCanonicalizer().canonicalize_M(inputs)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert m.digest == hashlib.sha256(blob).hexdigest()
+        assert m.source_map["payload"]["size"] == len(blob) - len('{"payload":}')
+        assert peak < len(blob) // 3  # batches + blocks, not the whole JSON
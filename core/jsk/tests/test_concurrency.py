@@ -0,0 +1,80 @@
+"""
+J.S.K. Concurrency Tests
+========================
+Per-run thresholds, per-engine RNG streams and concurrent controller calls
+"""
+
+import pytest
+import sys
+import os
+import asyncio
+import random
+
+# Add core to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+from core.jsk import JSKController, JSKConfig
+from core.jsk.governance import JSK
+from core.jsk.engines import SupraGenStub
+
+VOLATILE = ("trace_id", "execution_time_ms", "cache_hit")
+
+def _stable(result):
+    return {k: v for k, v in result.items() if k not in VOLATILE}
+
+def _inputs(count=200):
+    rng = random.Random(3)
+    return [{"text": "".join(rng.choice("abc xyz.") for _ in range(rng.randint(1, 400)))}
+            for _ in range(count)]
+
+MIXED = dict(diff_threshold=0.05, seek_threshold=0.08, abstain_p_value=1e-30)
+
+class TestConcurrency:
+    """Isolation per run + concurrent controller"""
+
+    def test_destroy_does_not_mutate_config(self):
+        config = JSKConfig()
+        before = config.get_commit_hash()
+        jsk = JSK(config)
+        result = jsk.run({"text": "x" * 300})
+        assert result["destroy_used"] > 0
+        assert config.get_commit_hash() == before
+        assert jsk.thresholds.diff_threshold == config.diff_threshold * 0.5 ** result["destroy_used"]
+
+    def test_engines_ignore_global_random(self):
+        M = {"fingerprint": "abc", "dim": 50}
+        first = SupraGenStub(seed=42).propose(M)
+        random.seed(12345)
+        random.random()
+        assert SupraGenStub(seed=42).propose(M) == first
+
+    def test_infer_concurrent_matches_sequential(self):
+        items = _inputs()
+        sequential = JSKController(cache_size=0)
+        sequential.config = JSKConfig(**MIXED)
+        expected = [_stable(sequential.infer(x)) for x in items]
+
+        concurrent = JSKController(cache_size=0, max_workers=8)
+        concurrent.config = JSKConfig(**MIXED)
+        try:
+            got = [_stable(r) for r in concurrent.infer_concurrent(items)]
+        finally:
+            concurrent.shutdown()
+
+        assert got == expected
+        assert concurrent.get_stats()["total_inferences"] == len(items)
+
+    def test_infer_async(self):
+        controller = JSKController(max_workers=4)
+        controller.config = JSKConfig(**MIXED)
+        items = _inputs(20)
+
+        async def run_all():
+            return await asyncio.gather(*(controller.infer_async(x) for x in items))
+
+        try:
+            results = asyncio.run(run_all())
+        finally:
+            controller.shutdown()
+        expected = [_stable(JSK(JSKConfig(**MIXED)).run(x)) for x in items]
+        assert [_stable(r) for r in results] == expected
@@ -0,0 +1,36 @@
+"""
+MŚWR Lexicon Tests
+==================
+Compiled keyword scanner vs plain substring checks
+"""
+
+import pytest
+import sys
+import os
+import random
+
+# Add core to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+from core.lexicon import Lexicon
+
+class TestLexicon:
+    """Lexicon.scan"""
+
+    def test_overlapping_hits_and_categories(self):
+        lexicon = Lexicon({"uncertainty": ["nie jestem pewien", "może"], "confidence": ["jestem pewien"],
+                           "short": ["nie"]})
+        scan = lexicon.scan("Nie jestem pewien, może")
+
+        assert sorted(scan.hits) == [(0, "nie"), (0, "nie jestem pewien"), (4, "jestem pewien"), (19, "może")]
+        assert scan.count("uncertainty") == 2
+        assert scan.first_category(["confidence", "uncertainty"]) == "confidence"
+        assert lexicon.scan("brak").hits == []
+
+    def test_matches_substring_semantics(self):
+        rng = random.Random(0)
+        for _ in range(300):
+            words = ["".join(rng.choice("abć ") for _ in range(rng.randint(1, 4))) for _ in range(6)]
+            text = "".join(rng.choice("abćĆ ") for _ in range(25))
+            scan = Lexicon({"all": words}).scan(text)
+            assert set(scan.keywords("all")) == {w.lower() for w in words if w.lower() in text.lower()}
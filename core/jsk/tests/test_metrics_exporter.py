@@ -0,0 +1,86 @@
+"""
+Metrics Exporter Tests
+======================
+Labelled registry, cached exposition, /metrics endpoint, J.S.K./S.J.K. feeds
+"""
+
+import pytest
+import sys
+import os
+import asyncio
+import urllib.request
+
+import numpy as np
+
+# Add core to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+from core.metrics_registry import MetricsRegistry, MetricsServer
+from core.jsk import JSKController, JSKConfig
+from core.jsk.telemetry import JSKMetrics
+from core.sjk import CalibrationConfig, UnifiedCalibrationEngine
+
+class TestMetricsExporter:
+    """MetricsRegistry + MetricsServer"""
+
+    def test_labelled_series_and_cache(self):
+        registry = MetricsRegistry()
+        calls = registry.counter("calls_total", "Calls", ["state"])
+        calls.labels("COHERE").inc()
+        calls.labels(state="ABSTAIN").inc(2)
+        text = registry.exposition(max_age=60)
+
+        assert '# TYPE calls_total counter' in text
+        assert 'calls_total{state="COHERE"} 1' in text
+        assert 'calls_total{state="ABSTAIN"} 2' in text
+
+        calls.labels("COHERE").inc()
+        assert registry.exposition(max_age=60) == text  # cached
+        assert 'calls_total{state="COHERE"} 2' in registry.exposition(max_age=0)
+
+        with pytest.raises(ValueError):
+            calls.labels("a", "b")
+        with pytest.raises(ValueError):
+            registry.gauge("calls_total")
+
+    def test_server_serves_jsk_metrics(self):
+        m = JSKMetrics()
+        for state in ("COHERE", "COHERE", "ABSTAIN"):
+            m.record_inference({"state": state, "cycles": 1, "execution_time_ms": 3.0})
+        server = MetricsServer(m.registry, host="127.0.0.1", port=0, max_age=0).start()
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics", timeout=5) as resp:
+                body = resp.read().decode()
+                assert resp.headers["Content-Type"].startswith("text/plain")
+        finally:
+            server.stop()
+
+        assert 'jsk_inferences_total{state="COHERE"} 2' in body
+        assert "jsk_abstain_total 1" in body
+        assert "jsk_cohere_ratio 0.6666666666666666" in body
+        assert 'jsk_execution_time_ms_bucket{le="5"} 3' in body
+
+    def test_controller_feeds_global_metrics(self):
+        from core.jsk.telemetry import metrics
+        before = metrics.counters["total_inferences"]
+        controller = JSKController()
+        controller.config = JSKConfig(diff_threshold=0.2, seek_threshold=0.3)
+        controller.infer({"text": "metrics"})
+        assert metrics.counters["total_inferences"] == before + 1
+        assert "jsk_inferences_total" in metrics.get_prometheus_metrics()
+
+    def test_sjk_collect_metrics_exports_labels(self):
+        registry = MetricsRegistry()
+        engine = UnifiedCalibrationEngine(CalibrationConfig(), registry=registry)
+
+        async def run():
+            await engine.calibrate(np.random.randn(32))
+            await engine.shutdown()
+
+        asyncio.run(run())
+        text = registry.render()
+        sid = engine.session_id
+
+        assert f'sjk_p_score{{session_id="{sid}",calibration_mode="ADAPTIVE"}}' in text
+        assert f'sjk_calibration_cycles{{session_id="{sid}",mode="ADAPTIVE"}} 1' in text
+        assert f'sjk_stability_index{{session_id="{sid}"}}' in text
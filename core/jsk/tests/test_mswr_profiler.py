@@ -0,0 +1,54 @@
+"""
+MŚWR Phase Profiler Tests
+=========================
+Per-phase spans of zero_time_inference, percentiles, folded-stack dump
+"""
+
+import pytest
+import sys
+import os
+
+# Add core to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+from core.mswr_profiler import PhaseProfiler, PhaseTrace, ZERO_TIME_PHASES
+from core.conscious_residual_inference import create_mswr_system
+
+class TestPhaseProfiler:
+    """PhaseProfiler aggregation"""
+
+    def test_percentiles_and_folded(self):
+        profiler = PhaseProfiler(phases=("a", "b"), window=4)
+        for duration in (1, 2, 3, 4, 100):
+            trace = PhaseTrace()
+            trace.spans = [("a", duration * 1_000_000), ("b", 1_000_000)]
+            profiler.record(trace)
+
+        stats = profiler.stats(max_age=0)
+        assert stats["calls"] == 5
+        assert stats["phases"]["a"]["count"] == 5 and stats["phases"]["a"]["total_ms"] == 110
+        assert stats["phases"]["a"]["p50_ms"] == 3 and stats["phases"]["a"]["p99_ms"] == 100  # window: last 4
+        assert profiler.folded() == ["zero_time_inference;a 110000000", "zero_time_inference;b 5000000"]
+
+    def test_disabled_records_nothing(self):
+        profiler = PhaseProfiler(enabled=False)
+        trace = profiler.start()
+        trace.mark("anti_fatal")
+        profiler.record(trace)
+        assert profiler.stats(max_age=0)["calls"] == 0
+
+class TestZeroTimePhases:
+    """zero_time_inference phase spans"""
+
+    def test_all_phases_recorded(self, tmp_path):
+        mswr = create_mswr_system()
+        for _ in range(3):
+            mswr.zero_time_inference("Ile to 2+2?", {"mathematical": True})
+
+        phases = mswr.phase_profiler.stats(max_age=0)["phases"]
+        assert list(phases) == list(ZERO_TIME_PHASES)
+        assert all(phase["count"] == 3 for phase in phases.values())
+        assert "phase_latency" in mswr.get_system_metrics()
+
+        folded = open(mswr.export_phase_flamegraph(str(tmp_path / "mswr.folded"))).read().splitlines()
+        assert folded and all(line.startswith("zero_time_inference;") for line in folded)
@@ -0,0 +1,138 @@
+"""
+MŚWR Registry Tests
+===================
+Bounded path/residual registries, unique path IDs, path store spill, residual detectors
+"""
+
+import pytest
+import sys
+import os
+import time
+
+# Add core to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+from core.mswr_registry import BoundedRegistry
+from core.conscious_residual_inference import ResidualMappingEngine, ResidualType, create_mswr_system
+
+def no_residuals(path, state):
+    """Module-level (picklable) detector for the process pool"""
+    return []
+
+class TestBoundedRegistry:
+    """BoundedRegistry LRU + TTL"""
+
+    def test_lru_eviction_and_ttl(self):
+        now = [0.0]
+        evicted = []
+        registry = BoundedRegistry(max_entries=2, ttl_seconds=10, on_evict=lambda k, v: evicted.append(k))
+        registry.clock = lambda: now[0]
+
+        registry["a"], registry["b"] = 1, 2
+        assert registry.get("a") == 1      # "a" becomes most recent
+        registry["c"] = 3
+        assert evicted == ["b"] and "a" in registry
+
+        now[0] = 20
+        assert "a" not in registry
+        assert registry.expire() == 2 and len(registry) == 0
+
+class TestMSWRRegistries:
+    """ConsciousResidualInferenceModule path and residual bookkeeping"""
+
+    def test_bounded_with_path_store(self, tmp_path):
+        mswr = create_mswr_system(max_active_paths=5, path_store_file=str(tmp_path / "paths.db"))
+        ids = [mswr.zero_time_inference(f"Ile to {i}+2?", {"mathematical": True})["cognitive_path_id"]
+               for i in range(12)]
+
+        assert len(set(ids)) == 12
+        assert len(mswr.cognitive_traceback.active_paths) == 5
+        assert len(mswr.residual_mapping.residual_map) == 5
+        spilled = mswr.cognitive_traceback.get_path(ids[0])
+        assert spilled["path_id"] == ids[0] and spilled["residual_points"]
+        assert mswr.cognitive_traceback.get_path(ids[-1])["path_id"] == ids[-1]
+
+class TestResidualDetectors:
+    """ResidualMappingEngine detector registry, pools and budgets"""
+
+    def test_thread_pool_matches_inline(self):
+        inline, pooled = create_mswr_system(), create_mswr_system(detector_executor="thread", detector_timeout_ms=5000)
+        try:
+            for mswr in (inline, pooled):
+                mswr.zero_time_inference("Ile to 2+2?", {"mathematical": True})
+            found = [[r.residual_type for r in mswr.residual_mapping.residual_map.values()[0]]
+                     for mswr in (inline, pooled)]
+            assert found[0] and found[0] == found[1]
+
+            stats = pooled.get_system_metrics()["residual_detectors"]
+            assert stats["spiral_drift"]["skipped"] == 1 and stats["spiral_drift"]["runs"] == 0
+            assert stats["logical_inconsistency"]["runs"] == 1
+        finally:
+            pooled.close()
+
+    def test_slow_detector_times_out(self):
+        mswr = create_mswr_system()
+        engine = mswr.residual_mapping
+        engine.register_detector(ResidualType.CONTEXTUAL_GAP, lambda path, state: time.sleep(0.2) or [],
+                                 executor="thread", timeout_ms=5)
+        try:
+            start = time.perf_counter()
+            mswr.zero_time_inference("Ile to 2+2?", {"mathematical": True})
+            assert time.perf_counter() - start < 0.15
+            assert engine.get_detector_stats(max_age=0)["contextual_gap"]["timeout"] == 1
+        finally:
+            engine.close()
+
+    def test_process_pool_needs_picklable_detector(self):
+        with pytest.raises(ValueError, match="process pool"):
+            create_mswr_system(detector_executor="process")
+
+        mswr = create_mswr_system()
+        engine = mswr.residual_mapping
+        with pytest.raises(ValueError, match="not picklable"):
+            engine.register_detector(ResidualType.CONTEXTUAL_GAP, lambda path, state: [], executor="process")
+        engine.register_detector(ResidualType.CONTEXTUAL_GAP, no_residuals, executor="process", timeout_ms=5000)
+        try:
+            mswr.zero_time_inference("Ile to 2+2?", {"mathematical": True})
+            stats = engine.get_detector_stats(max_age=0)["contextual_gap"]
+            assert stats["runs"] == 1 and stats["error"] == 0
+        finally:
+            mswr.close()
+
+    def test_existential_detector_is_never_skipped(self):
+        engine = ResidualMappingEngine(budget_ms=0.0, default_executor="thread", timeout_ms=0.0)
+        try:
+            detector = engine.detection_patterns[ResidualType.EXISTENTIAL_ERROR]
+            assert detector.critical and detector.executor == "inline"
+            assert engine._budget(detector) is None and engine._timeout(detector) is None
+            with pytest.raises(ValueError, match="Critical"):
+                engine.register_detector(ResidualType.EXISTENTIAL_ERROR, no_residuals, executor="thread", critical=True)
+            engine.register_detector(ResidualType.CONTEXTUAL_GAP, lambda path, state: time.sleep(0.05) or [])
+
+            mswr = create_mswr_system()
+            path = mswr.cognitive_traceback.trace_reasoning_path("Ile to 2+2?", ["krok 1", "krok 2"])
+            engine.map_residuals(path, {})
+            stats = engine.get_detector_stats(max_age=0)
+            assert stats["existential_error"]["runs"] == 1
+            assert stats["existential_error"]["timeout"] == stats["existential_error"]["over_budget"] == 0
+            assert stats["contextual_gap"]["timeout"] == 1  # thread pool, zero timeout
+        finally:
+            engine.close()
+
+    def test_detector_stats_are_cached(self):
+        mswr = create_mswr_system()
+        first = mswr.residual_mapping.get_detector_stats()
+        mswr.zero_time_inference("Ile to 2+2?", {"mathematical": True})
+        assert mswr.residual_mapping.get_detector_stats() is first
+        assert mswr.residual_mapping.get_detector_stats(max_age=0)["logical_inconsistency"]["runs"] == 1
+
+    def test_budget_only_counts_by_default(self):
+        mswr = create_mswr_system(detector_executor="thread")
+        engine = mswr.residual_mapping
+        engine.register_detector(ResidualType.CONTEXTUAL_GAP, lambda path, state: time.sleep(0.02) or [])
+        try:
+            mswr.zero_time_inference("Ile to 2+2?", {"mathematical": True})
+            stats = engine.get_detector_stats(max_age=0)["contextual_gap"]
+            assert stats["runs"] == 1 and stats["over_budget"] == 1 and stats["timeout"] == 0
+        finally:
+            mswr.close()
@@ -0,0 +1,73 @@
+"""
+J.S.K. Result Cache Tests
+=========================
+Cache keyed on fingerprint_M + config_commit: hits, LRU/TTL, invalidation
+"""
+
+import pytest
+import sys
+import os
+import time
+
+# Add core to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+from core.jsk import JSKController, JSKConfig, JSKResultCache
+from core.jsk.telemetry import Telemetry, metrics
+
+# Hard-to-reach thresholds would trigger DESTROY (which retunes the config);
+# loose ones keep the config stable across calls
+STABLE_CONFIG = dict(seed=42, max_destroy_cycles=0, diff_threshold=0.5,
+                     seek_threshold=0.5, abstain_p_value=1e-9)
+
+class TestResultCache:
+    """Tests for JSKResultCache and JSKController caching"""
+
+    def setup_method(self):
+        Telemetry.reset()
+        self.controller = JSKController()
+        self.controller.config = JSKConfig(**STABLE_CONFIG)
+
+    def test_repeated_input_served_from_cache(self):
+        inputs = {"text": "cache me", "value": 3}
+        first = self.controller.infer(inputs)
+        second = self.controller.infer(inputs)
+
+        assert "cache_hit" not in first
+        assert second["cache_hit"] is True
+        for key in ("state", "score", "g_score", "v_score", "fingerprint_M", "config_commit"):
+            assert first[key] == second[key]
+        assert self.controller.cache.stats["hits"] == 1
+        assert metrics.counters["cache_hits_total"] == 1
+
+    def test_config_change_invalidates(self):
+        inputs = {"text": "invalidate"}
+        self.controller.infer(inputs)
+        self.controller.config.diff_threshold = 0.25  # mutated in place
+        result = self.controller.infer(inputs)
+
+        assert "cache_hit" not in result
+        assert self.controller.cache.stats["invalidations"] >= 1
+
+        self.controller.config = JSKConfig(**STABLE_CONFIG)  # replaced
+        assert len(self.controller.cache) == 0
+
+    def test_lru_eviction_and_ttl(self):
+        cache = JSKResultCache(max_size=2, ttl_seconds=0.05)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1      # a becomes most recent
+        cache.put("c", 3)               # evicts b
+        assert cache.get("b") is None
+        assert cache.stats["evictions"] == 1
+
+        time.sleep(0.06)
+        assert cache.get("a") is None
+        assert cache.stats["expirations"] == 1
+
+    def test_cached_result_not_shared(self):
+        inputs = {"text": "copy"}
+        self.controller.infer(inputs)
+        hit = self.controller.infer(inputs)
+        hit["state"] = "TAMPERED"
+        assert self.controller.infer(inputs)["state"] != "TAMPERED"
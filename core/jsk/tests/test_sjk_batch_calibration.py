@@ -0,0 +1,150 @@
+"""
+S.J.K. Batch Calibration Tests
+==============================
+calibrate_batch vs the scalar calibrate() path, executor offload
+"""
+
+import pytest
+import sys
+import os
+import asyncio
+
+import numpy as np
+
+# Add core to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+from core.metrics_registry import MetricsRegistry
+from core.sjk import (CalibrationConfig, CalibrationMode, CalibrationState, UnifiedCalibrationEngine,
+                      STRICT_TRANSFORM_CACHE)
+
+def _pair(**params):
+    """Two initialized engines sharing weights and strict transforms"""
+    config = CalibrationConfig(abstain_threshold=0.0, learning_rate=1e-4, **params)
+    a = UnifiedCalibrationEngine(config, registry=MetricsRegistry())
+    b = UnifiedCalibrationEngine(config, registry=MetricsRegistry())
+
+    async def init():
+        await a.initialize()
+        await b.initialize()
+
+    asyncio.run(init())
+    b.calibration_weights = a.calibration_weights.copy()
+    b._strict_transforms, b._strict_seed = a._strict_transforms, a._strict_seed
+    return a, b
+
+def _run(engines, coro):
+    async def go():
+        try:
+            return await coro
+        finally:
+            for engine in engines:
+                await engine.shutdown()
+    return asyncio.run(go())
+
+class TestBatchCalibration:
+    """calibrate_batch"""
+
+    @pytest.mark.parametrize("mode", [CalibrationMode.ADAPTIVE, CalibrationMode.STRICT])
+    def test_matches_scalar_loop(self, mode):
+        a, b = _pair(calibration_mode=mode, batch_size=1, parallel_workers=1)
+        data = np.random.default_rng(1).standard_normal((6, 64)) * 0.1
+
+        async def both():
+            scalar = [await a.calibrate(row) for row in data]
+            batch = await b.calibrate_batch(data)
+            return scalar, batch
+
+        scalar, (calibrated, p_scores) = _run((a, b), both())
+        assert np.allclose(np.stack([c for c, _ in scalar]), calibrated)
+        assert np.allclose([p for _, p in scalar], p_scores)
+        assert b.calibration_cycles == len(data)
+
+    def test_parallel_chunks_cover_batch(self):
+        _, engine = _pair(calibration_mode=CalibrationMode.CONSERVATIVE, batch_size=8, parallel_workers=4)
+        data = np.random.default_rng(2).standard_normal((50, 16))
+        calibrated, p_scores = _run((engine,), engine.calibrate_batch(data))
+
+        assert calibrated.shape == data.shape and p_scores.shape == (50,)
+        assert np.abs(calibrated - data).max() < 0.01
+
+    def test_empty_batch(self):
+        _, engine = _pair(calibration_mode=CalibrationMode.STRICT)
+        calibrated, p_scores = _run((engine,), engine.calibrate_batch(np.empty((0, 64))))
+
+        assert calibrated.shape == (0, 64) and p_scores.shape == (0,)
+        assert engine.error_count == 0 and engine.state != CalibrationState.ABSTAIN
+
+    def test_strict_transforms_are_bounded_and_reproducible(self):
+        engine = UnifiedCalibrationEngine(CalibrationConfig(calibration_mode=CalibrationMode.STRICT),
+                                          registry=MetricsRegistry())
+        first = engine._strict_transform(16)
+        for n in range(17, 17 + STRICT_TRANSFORM_CACHE):
+            engine._strict_transform(n)
+        assert len(engine._strict_transforms) == STRICT_TRANSFORM_CACHE and 16 not in engine._strict_transforms
+        assert np.array_equal(engine._strict_transform(16), first)
+
+class TestCalibrationOffload:
+    """Executor offload, concurrency limit and bounded queue"""
+
+    def test_concurrency_limit_and_queue(self):
+        config = CalibrationConfig(calibration_mode=CalibrationMode.STRICT, abstain_threshold=0.0,
+                                   max_concurrent_calibrations=2, max_queued_calibrations=3)
+        engine = UnifiedCalibrationEngine(config, registry=MetricsRegistry())
+        peak = []
+        kernel = engine._calibrate_kernel
+
+        def tracked(data, rng=None):
+            peak.append(engine.inflight_calibrations)
+            return kernel(data, rng)
+
+        engine._calibrate_kernel = tracked
+        data = np.random.default_rng(3).standard_normal((10, 200))
+
+        async def burst():
+            await engine.initialize()
+            return await asyncio.gather(*(engine.calibrate(row) for row in data))
+
+        results = _run((engine,), burst())
+        assert engine.rejected_calibrations == 5
+        assert sum(p > 0 for _, p in results) == 5
+        assert max(peak) <= 2
+        assert 'sjk_calibration_latency_seconds_count' in engine.registry.render()
+
+class TestCalibrationCache:
+    """performance_cache LRU"""
+
+    def test_strict_hits_and_lru_bound(self):
+        config = CalibrationConfig(calibration_mode=CalibrationMode.STRICT, abstain_threshold=0.0, cache_size=2)
+        engine = UnifiedCalibrationEngine(config, registry=MetricsRegistry())
+        rows = np.random.default_rng(4).standard_normal((3, 32))
+
+        async def run():
+            first = await engine.calibrate(rows[0])
+            again = await engine.calibrate(rows[0].copy())
+            await engine.calibrate(rows[1])
+            await engine.calibrate(rows[2])   # evicts rows[0]
+            await engine.calibrate(rows[0])
+            return first, again
+
+        (c1, p1), (c2, p2) = _run((engine,), run())
+        assert np.array_equal(c1, c2) and p1 == p2
+        assert (engine.cache_hits, engine.cache_misses) == (1, 4)
+        assert len(engine.performance_cache) == 2
+        assert 'sjk_cache_hit_ratio' in engine.registry.render()
+
+    def test_seeded_conservative_is_cached_adaptive_is_not(self):
+        seeded = UnifiedCalibrationEngine(CalibrationConfig(calibration_mode=CalibrationMode.CONSERVATIVE, seed=7),
+                                          registry=MetricsRegistry())
+        adaptive = UnifiedCalibrationEngine(CalibrationConfig(), registry=MetricsRegistry())
+        row = np.random.default_rng(5).standard_normal(16)
+        assert seeded._cache_key(row) is not None
+        assert adaptive._cache_key(row) is None
+
+        async def run():
+            a = await seeded.calibrate(row)
+            b = await seeded.calibrate(row)
+            return a, b
+
+        (c1, _), (c2, _) = _run((seeded, adaptive), run())
+        assert np.array_equal(c1, c2) and seeded.cache_hits == 1
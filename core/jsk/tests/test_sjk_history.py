@@ -0,0 +1,64 @@
+"""
+S.J.K. History Buffer Tests
+===========================
+RingBuffer semantics and the engine's bounded metrics history
+"""
+
+import pytest
+import sys
+import os
+import asyncio
+import random
+
+import numpy as np
+
+# Add core to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+from core.metrics_registry import MetricsRegistry
+from core.sjk import CalibrationConfig, CalibrationMetrics, UnifiedCalibrationEngine
+from core.sjk.history import RingBuffer
+
+class TestRingBuffer:
+    """RingBuffer vs a reference list"""
+
+    @pytest.mark.parametrize("capacity", [1, 3, 16])
+    def test_matches_sliced_list(self, capacity):
+        rng = random.Random(capacity)
+        ring, reference = RingBuffer(capacity), []
+        for _ in range(200):
+            if rng.random() < 0.5:
+                value = rng.random()
+                ring.append(value)
+                reference.append(value)
+            else:
+                values = [rng.random() for _ in range(rng.randint(0, 2 * capacity))]
+                ring.extend(values)
+                reference.extend(values)
+            reference = reference[-capacity:]
+
+            assert list(ring.last()) == reference
+            assert list(ring.last(2)) == reference[-2:]
+            assert np.shares_memory(ring.last(), ring._data)
+        assert ring[-1] == reference[-1]
+
+class TestMetricsHistory:
+    """metrics_history honours metrics_retention"""
+
+    def test_retention_and_summary(self):
+        engine = UnifiedCalibrationEngine(CalibrationConfig(metrics_retention=5), registry=MetricsRegistry())
+
+        async def run():
+            for _ in range(12):
+                await engine.calibrate(np.random.randn(32))
+                await engine._collect_metrics()
+            summary = await engine.get_metrics_summary()
+            latest = CalibrationMetrics.from_record(engine.metrics_history[-1])
+            await engine.shutdown()
+            return summary, latest
+
+        summary, latest = asyncio.run(run())
+        assert len(engine.metrics_history) == 5
+        assert summary['historical_stats']['metrics_count'] == 5
+        assert summary['current_metrics'] == latest.to_dict()
+        assert len(engine.convergence_history) <= 100
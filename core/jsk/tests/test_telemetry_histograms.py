@@ -0,0 +1,52 @@
+"""
+J.S.K. Telemetry Histogram Tests
+================================
+Streaming quantiles, rolling windows and Prometheus histogram export
+"""
+
+import pytest
+import sys
+import os
+import random
+import time
+
+# Add core to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+from core.jsk.telemetry import JSKMetrics, MetricWindow, StreamingHistogram
+
+class TestTelemetryHistograms:
+    """StreamingHistogram / MetricWindow / jsk_cycles_histogram"""
+
+    def test_quantiles_within_relative_error(self):
+        rng = random.Random(0)
+        values = sorted(rng.lognormvariate(-7, 2) for _ in range(20000))
+        hist = StreamingHistogram(relative_error=0.01)
+        for v in values:
+            hist.add(v)
+
+        for q in (0.5, 0.95, 0.99):
+            exact = values[int(q * (len(values) - 1))]
+            assert abs(hist.quantile(q) - exact) <= 0.011 * exact
+
+    def test_rolling_windows(self):
+        window = MetricWindow()
+        now = time.time()
+        for minute in range(120):
+            window.add(float(minute), now - minute * 60)
+
+        assert window.get_count("1m") == 1
+        assert 14 <= window.get_count("15m") <= 16
+        assert window.get_count("24h") == 120
+        assert window.get_p95("15m") <= 15.0
+
+    def test_cycles_histogram_exposition(self):
+        m = JSKMetrics()
+        for cycles in (1, 1, 2, 3):
+            m.record_inference({"cycles": cycles, "state": "COHERE"})
+        text = m.get_prometheus_metrics()
+
+        assert "# TYPE jsk_cycles_histogram histogram" in text
+        assert 'jsk_cycles_histogram_bucket{le="1"} 2' in text
+        assert 'jsk_cycles_histogram_bucket{le="+Inf"} 4' in text
+        assert "jsk_cycles_histogram_count 4" in text
@@ -0,0 +1,117 @@
+"""
+Compiled keyword lexicons for the MŚWR text layers
+Jeden skan tekstu zamiast pętli `for keyword in list: if keyword in text.lower()`
+
+A Lexicon compiles all keywords of all its categories into a single regex
+built from a character trie, so a scan touches each character of the
+lowered text once and the cost per step does not grow with the number of
+keywords. Matching keeps plain substring semantics: every keyword that
+occurs anywhere in the text is reported, overlapping ones included.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def _trie_regex(keywords: Iterable[str]) -> str:
+    """Regex for a set of literals, factored by common prefix; longest keyword wins"""
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        terminal = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if terminal:
+            # greedy: try the longer keyword first, fall back to this one
+            return "(?:" + body + ")?" if len(branches) == 1 else body + "?"
+        return body
+
+    return build(trie)
+
+
+class LexiconScan:
+    """Keyword hits of one text: (position in the lowered text, keyword), in order"""
+
+    __slots__ = ("hits", "_by_category")
+
+    def __init__(self, hits: List[Tuple[int, str]], keyword_categories: Dict[str, Tuple[str, ...]]):
+        self.hits = hits
+        by_category: Dict[str, List[str]] = {}
+        for _, keyword in hits:
+            for category in keyword_categories[keyword]:
+                found = by_category.setdefault(category, [])
+                if keyword not in found:
+                    found.append(keyword)
+        self._by_category = by_category
+
+    def __contains__(self, keyword: str) -> bool:
+        return any(hit == keyword for _, hit in self.hits)
+
+    def keywords(self, category: str) -> List[str]:
+        """Distinct keywords of a category found in the text (first occurrence order)"""
+        return self._by_category.get(category, [])
+
+    def count(self, category: str) -> int:
+        """Number of distinct keywords of a category found in the text"""
+        return len(self._by_category.get(category, ()))
+
+    def first_category(self, categories: Iterable[str]) -> Optional[str]:
+        """First of the given categories (in the given order) with any hit"""
+        for category in categories:
+            if category in self._by_category:
+                return category
+        return None
+
+    def hit_categories(self) -> List[str]:
+        return list(self._by_category)
+
+
+class Lexicon:
+    """
+    Named keyword categories compiled into one scanner
+
+    Keywords are matched case-insensitively as substrings (text.lower()).
+    scan() results are memoized per text, so layers that look at the same
+    reasoning step share one scan.
+    """
+
+    def __init__(self, categories: Dict[str, Iterable[str]], cache_size: int = 4096):
+        self.categories: Dict[str, Tuple[str, ...]] = {}
+        keyword_categories: Dict[str, List[str]] = {}
+        for category, keywords in categories.items():
+            lowered = tuple(dict.fromkeys(k.lower() for k in keywords if k))
+            self.categories[category] = lowered
+            for keyword in lowered:
+                keyword_categories.setdefault(keyword, []).append(category)
+        self._keyword_categories = {k: tuple(v) for k, v in keyword_categories.items()}
+
+        keywords = list(self._keyword_categories)
+        self._pattern = re.compile(_trie_regex(keywords)) if keywords else None
+        # All keywords matching at one position are the longest match and its prefixes
+        self._prefixes = {k: tuple(p for p in keywords if p != k and k.startswith(p)) for k in keywords}
+        self.scan = lru_cache(maxsize=cache_size)(self._scan)
+
+    def __len__(self) -> int:
+        return len(self._keyword_categories)
+
+    def _scan(self, text: str) -> LexiconScan:
+        """Scan text once and collect every keyword occurrence"""
+        hits: List[Tuple[int, str]] = []
+        if self._pattern is not None:
+            lowered = text.lower()
+            search = self._pattern.search
+            match = search(lowered)
+            while match:
+                start, keyword = match.start(), match.group()
+                hits.append((start, keyword))
+                hits.extend((start, prefix) for prefix in self._prefixes[keyword])
+                match = search(lowered, start + 1)
+        return LexiconScan(hits, self._keyword_categories)
@@ -0,0 +1,381 @@
+"""
+MIGI Core Metrics Registry - Prometheus exposition dla J.S.K. i S.J.K.
+======================================================================
+Counters, gauges and histograms with labels, rendered to the Prometheus
+text format. Updates touch one per-series lock; scrapes get cached
+exposition text, re-rendered at most every `max_age` seconds.
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger('migi.metrics')
+
+DEFAULT_METRICS_PORT = 9090
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def _fmt(value: float) -> str:
+    """Prometheus sample value"""
+    value = float(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _label_str(names: Sequence[str], values: Sequence[Any], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+# ============================================================================
+# METRIC SERIES (one per label combination)
+# ============================================================================
+
+class CounterSeries:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        with self._lock:
+            self.value += amount
+
+class GaugeSeries:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        self.value = float(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+class HistogramSeries:
+    __slots__ = ("bounds", "counts", "sum", "count", "_lock")
+
+    def __init__(self, bounds: List[float]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last = +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        i = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self) -> Tuple[List[int], float, int]:
+        with self._lock:
+            return list(self.counts), self.sum, self.count
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (+Inf past the last bound, 0 when empty)"""
+        counts, _, count = self.snapshot()
+        if not count:
+            return 0.0
+        rank, cumulative = q * count, 0
+        for bound, n in zip(self.bounds + [math.inf], counts):
+            cumulative += n
+            if cumulative >= rank:
+                return bound
+        return math.inf
+
+# ============================================================================
+# METRIC FAMILIES
+# ============================================================================
+
+class MetricFamily(ABC):
+    """Named metric with a fixed label set; series are created on first use"""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, description: str = "", labelnames: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self._series: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def _new_series(self):
+        """Empty series for a new label combination"""
+
+    def labels(self, *values: Any, **kwargs: Any):
+        """Series for one label combination (positional or by name)"""
+        if kwargs:
+            values = tuple(kwargs[n] for n in self.labelnames)
+        key = tuple(str(v) for v in values)
+        series = self._series.get(key)
+        if series is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            with self._lock:
+                series = self._series.setdefault(key, self._new_series())
+        return series
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def _items(self) -> List[Tuple[Tuple[str, ...], Any]]:
+        with self._lock:
+            return list(self._series.items())
+
+    def render(self) -> List[str]:
+        lines = []
+        if self.description:
+            lines.append(f"# HELP {self.name} {_escape(self.description)}")
+        lines.append(f"# TYPE {self.name} {self.type_name}")
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        return [f"{self.name}{_label_str(self.labelnames, key)} {_fmt(s.value)}" for key, s in self._items()]
+
+class Counter(MetricFamily):
+    type_name = "counter"
+
+    def _new_series(self):
+        return CounterSeries()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+class Gauge(MetricFamily):
+    """
+    Gauge; with `function` the value is computed at render time
+
+    `function` returns a number (unlabeled gauge) or {label_values_tuple: number}.
+    """
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, description: str = "", labelnames: Sequence[str] = (),
+                 function: Optional[Callable[[], Any]] = None):
+        super().__init__(name, description, labelnames)
+        self.function = function
+
+    def _new_series(self):
+        return GaugeSeries()
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def _samples(self) -> List[str]:
+        if self.function is None:
+            return super()._samples()
+        try:
+            values = self.function()
+        except Exception as e:  # a broken callback must not break the scrape
+            logger.warning(f"Gauge {self.name} callback failed: {e}")
+            return []
+        if not isinstance(values, dict):
+            values = {(): values}
+        return [f"{self.name}{_label_str(self.labelnames, key)} {_fmt(v)}" for key, v in values.items()]
+
+class Histogram(MetricFamily):
+    type_name = "histogram"
+
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, name: str, description: str = "", labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, description, labelnames)
+        self.bounds = sorted(float(b) for b in buckets if not math.isinf(b))
+
+    def _new_series(self):
+        return HistogramSeries(self.bounds)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, series in self._items():
+            counts, total, count = series.snapshot()
+            cumulative = 0
+            for bound, n in zip(self.bounds + [math.inf], counts):
+                cumulative += n
+                le = f'le="{_fmt(bound)}"'
+                lines.append(f"{self.name}_bucket{_label_str(self.labelnames, key, le)} {cumulative}")
+            labels = _label_str(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_fmt(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+# ============================================================================
+# REGISTRY
+# ============================================================================
+
+class MetricsRegistry:
+    """Get-or-create metric families and render cached exposition text"""
+
+    def __init__(self):
+        self._families: Dict[str, MetricFamily] = {}
+        self._lock = threading.Lock()
+        self._render_lock = threading.Lock()
+        self._cached_text = ""
+        self._cached_at = 0.0
+
+    def _register(self, cls, name: str, *args, **kwargs) -> MetricFamily:
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = self._families[name] = cls(name, *args, **kwargs)
+            elif not isinstance(family, cls):
+                raise ValueError(f"Metric {name} already registered as {family.type_name}")
+            return family
+
+    def counter(self, name: str, description: str = "", labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, description, labelnames)
+
+    def gauge(self, name: str, description: str = "", labelnames: Sequence[str] = (),
+              function: Optional[Callable[[], Any]] = None) -> Gauge:
+        gauge = self._register(Gauge, name, description, labelnames)
+        if function is not None:
+            gauge.function = function
+        return gauge
+
+    def histogram(self, name: str, description: str = "", labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = Histogram.DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, description, labelnames, buckets)
+
+    def get(self, name: str) -> Optional[MetricFamily]:
+        return self._families.get(name)
+
+    def reset(self) -> None:
+        """Drop all series (families stay registered)"""
+        with self._lock:
+            families = list(self._families.values())
+        for family in families:
+            family.clear()
+        self._cached_at = 0.0
+
+    def render(self) -> str:
+        """Render every family now"""
+        with self._lock:
+            families = list(self._families.values())
+        lines = []
+        for family in families:
+            lines.extend(family.render())
+        return "\n".join(lines) + "\n"
+
+    def exposition(self, max_age: float = 1.0) -> str:
+        """
+        Cached exposition text, re-rendered when older than max_age
+
+        Only one thread renders at a time; concurrent scrapes get the
+        previous text instead of waiting.
+        """
+        if time.monotonic() - self._cached_at >= max_age or not self._cached_text:
+            if self._render_lock.acquire(blocking=not self._cached_text):
+                try:
+                    self._cached_text = self.render()
+                    self._cached_at = time.monotonic()
+                finally:
+                    self._render_lock.release()
+        return self._cached_text
+
+# Process-wide registry served on metrics_port
+REGISTRY = MetricsRegistry()
+
+# ============================================================================
+# HTTP EXPORTER
+# ============================================================================
+
+class MetricsServer:
+    """Minimal threaded HTTP server answering GET /metrics from a registry"""
+
+    def __init__(self, registry: MetricsRegistry = REGISTRY, host: str = "0.0.0.0",
+                 port: int = DEFAULT_METRICS_PORT, max_age: float = 1.0):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.max_age = max_age
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = server.registry.exposition(server.max_age).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):  # keep scrapes out of the logs
+                pass
+
+        return Handler
+
+    def start(self) -> "MetricsServer":
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]  # resolves port=0
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-exporter", daemon=True)
+        self._thread.start()
+        logger.info(f"📈 Metrics exporter listening on :{self.port}/metrics")
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+_SERVERS: Dict[int, MetricsServer] = {}
+_SERVERS_LOCK = threading.Lock()
+
+def start_metrics_server(port: Optional[int] = None, host: str = "0.0.0.0",
+                         registry: MetricsRegistry = REGISTRY) -> Optional[MetricsServer]:
+    """
+    Start (once per port) the /metrics exporter; METRICS_PORT overrides the port
+
+    Returns None if the port is already taken by another process.
+    """
+    port = int(os.getenv("METRICS_PORT", port if port is not None else DEFAULT_METRICS_PORT))
+    with _SERVERS_LOCK:
+        server = _SERVERS.get(port)
+        if server is None:
+            try:
+                server = MetricsServer(registry, host, port).start()
+            except OSError as e:
+                logger.warning(f"Metrics exporter not started on :{port}: {e}")
+                return None
+            _SERVERS[port] = server
+        return server
@@ -0,0 +1,150 @@
+"""
+Phase span recorder for the MŚWR zero-time pipeline
+Pomiar czasu każdej fazy zero_time_inference (perf_counter_ns), percentyle i flamegraph
+
+A PhaseTrace is started per call and marks the end of each phase with one
+perf_counter_ns() read and one list append. PhaseProfiler.record() folds a
+finished trace into per-phase totals and a rolling window of recent
+durations; percentiles are computed from the window only when asked for,
+and the result is cached for `max_age` seconds like the metrics exposition.
+
+dump_flamegraph() writes the folded-stack format ("root;phase <ns>") read
+by flamegraph.pl, inferno and speedscope.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Fazy zero_time_inference w kolejności wykonania, "report" = protokół sesji + złożenie odpowiedzi
+ZERO_TIME_PHASES = (
+    "anti_fatal", "traceback", "mapping", "affective", "counterfactual",
+    "reframing", "healing", "heuristic_evolution", "p_score", "verification", "report",
+)
+PERCENTILES = (50, 95, 99)
+
+_now_ns = time.perf_counter_ns
+
+
+class PhaseTrace:
+    """Phase spans of one call: (phase, duration_ns) in execution order"""
+
+    __slots__ = ("spans", "_last")
+
+    def __init__(self):
+        self.spans: List[Tuple[str, int]] = []
+        self._last = _now_ns()
+
+    def mark(self, phase: str) -> None:
+        """End the current phase (it started at the previous mark)"""
+        now = _now_ns()
+        self.spans.append((phase, now - self._last))
+        self._last = now
+
+
+class _NullTrace:
+    __slots__ = ()
+    spans: Tuple = ()
+
+    def mark(self, phase: str) -> None:
+        pass
+
+
+_NULL_TRACE = _NullTrace()
+
+
+def _percentile(ordered: List[int], pct: float) -> int:
+    """Nearest-rank percentile of a sorted list"""
+    return ordered[min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))]
+
+
+class PhaseProfiler:
+    """Per-phase totals and rolling-window percentiles of recorded traces"""
+
+    def __init__(self, phases: Iterable[str] = ZERO_TIME_PHASES, window: int = 1024,
+                 enabled: bool = True, root: str = "zero_time_inference"):
+        self.phases = tuple(phases)
+        self.window = window
+        self.enabled = enabled
+        self.root = root
+        self.calls = 0
+        # phase -> [count, total_ns, recent durations]
+        self._phases: Dict[str, list] = {phase: self._new_phase() for phase in self.phases}
+        self._recent_calls: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._cached: Optional[Dict[str, Any]] = None
+        self._cached_at = 0.0
+
+    def _new_phase(self) -> list:
+        return [0, 0, deque(maxlen=self.window)]
+
+    def start(self):
+        """New trace for one call (a no-op trace when profiling is disabled)"""
+        return PhaseTrace() if self.enabled else _NULL_TRACE
+
+    def record(self, trace: PhaseTrace) -> None:
+        """Add a finished trace; unknown phases are tracked from their first use"""
+        if not trace.spans:
+            return
+        phases = self._phases
+        total = 0
+        with self._lock:
+            self.calls += 1
+            for phase, duration in trace.spans:
+                entry = phases.get(phase)
+                if entry is None:
+                    entry = phases[phase] = self._new_phase()
+                entry[0] += 1
+                entry[1] += duration
+                entry[2].append(duration)
+                total += duration
+            self._recent_calls.append(total)
+
+    @staticmethod
+    def _summary(count: int, total_ns: int, recent: Iterable[int]) -> Dict[str, float]:
+        ordered = sorted(recent)
+        summary = {"count": count, "total_ms": total_ns / 1e6, "avg_ms": total_ns / count / 1e6 if count else 0.0}
+        for pct in PERCENTILES:
+            summary[f"p{pct}_ms"] = _percentile(ordered, pct) / 1e6 if ordered else 0.0
+        return summary
+
+    def stats(self, max_age: float = 1.0) -> Dict[str, Any]:
+        """Per-phase count, total/avg and p50/p95/p99 (ms) over the last `window` calls, cached for max_age s"""
+        if self._cached is not None and time.monotonic() - self._cached_at < max_age:
+            return self._cached
+        with self._lock:
+            phases = {phase: (count, total, list(recent)) for phase, (count, total, recent) in self._phases.items()}
+            calls, recent_calls = self.calls, list(self._recent_calls)
+        total_ns = sum(total for _, total, _ in phases.values())
+        stats = {
+            "enabled": self.enabled,
+            "calls": calls,
+            "window": self.window,
+            "total": self._summary(calls, total_ns, recent_calls),
+            "phases": {phase: {**self._summary(*values), "share": values[1] / total_ns if total_ns else 0.0}
+                       for phase, values in phases.items()},
+        }
+        self._cached, self._cached_at = stats, time.monotonic()
+        return stats
+
+    def folded(self) -> List[str]:
+        """Folded stacks ("root;phase total_ns"), one line per phase that ran"""
+        with self._lock:
+            totals = [(phase, entry[1]) for phase, entry in self._phases.items()]
+        return [f"{self.root};{phase} {total}" for phase, total in totals if total]
+
+    def dump_flamegraph(self, filepath: str) -> str:
+        """Write folded stacks for flamegraph.pl / inferno / speedscope; returns filepath"""
+        with open(filepath, "w", encoding="utf-8") as f:
+            f.writelines(line + "\n" for line in self.folded())
+        return filepath
+
+    def reset(self) -> None:
+        with self._lock:
+            self.calls = 0
+            for entry in self._phases.values():
+                entry[0] = entry[1] = 0
+                entry[2].clear()
+            self._recent_calls.clear()
+            self._cached = None
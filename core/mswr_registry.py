@@ -0,0 +1,178 @@
+"""
+Bounded registries for MŚWR cognitive paths and residuals
+Rejestry ścieżek z limitem rozmiaru i TTL, unikalne ID, zapis zakończonych ścieżek na dysk
+
+- next_id(): process-wide monotonic IDs (prefix_<ms>_<seq>), unique under concurrency
+- BoundedRegistry: dict-like LRU with optional TTL and an eviction callback
+- PathStore: append-only SQLite store for evicted paths, queryable by path ID
+"""
+
+import itertools
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+_ID_SEQ = itertools.count(1)  # next() on itertools.count is atomic under the GIL
+
+
+def next_id(prefix: str) -> str:
+    """Unique, increasing ID: the old prefix_<ms> format plus a process-wide sequence number"""
+    return f"{prefix}_{int(time.time() * 1000)}_{next(_ID_SEQ)}"
+
+
+class BoundedRegistry:
+    """
+    LRU mapping capped at max_entries, entries expire ttl_seconds after last access
+
+    Entries are kept in last-access order, so both LRU eviction and TTL
+    expiry pop from the front. on_evict(key, value) is called for every
+    entry that leaves through eviction or expiry (not for pop/del).
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: Optional[float] = None,
+                 on_evict: Callable[[Any, Any], None] = None):
+        if max_entries < 1:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.on_evict = on_evict
+        self.evictions = 0
+        self._entries: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    clock = staticmethod(time.monotonic)
+
+    def _drop_front(self) -> Tuple[Any, Any]:
+        key, (_, value) = self._entries.popitem(last=False)
+        self.evictions += 1
+        return key, value
+
+    def _expire_locked(self, now: float) -> list:
+        dropped = []
+        if self.ttl_seconds is not None:
+            cutoff = now - self.ttl_seconds
+            while self._entries and next(iter(self._entries.values()))[0] < cutoff:
+                dropped.append(self._drop_front())
+        return dropped
+
+    def _notify(self, dropped: list) -> None:
+        if self.on_evict is not None:
+            for key, value in dropped:
+                self.on_evict(key, value)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        now = self.clock()
+        with self._lock:
+            dropped = self._expire_locked(now)
+            self._entries[key] = (now, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                dropped.append(self._drop_front())
+        self._notify(dropped)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """Value for key (refreshes its LRU position and TTL)"""
+        now = self.clock()
+        with self._lock:
+            dropped = self._expire_locked(now)
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries[key] = (now, entry[1])
+                self._entries.move_to_end(key)
+        self._notify(dropped)
+        return default if entry is None else entry[1]
+
+    def __getitem__(self, key: Any) -> Any:
+        marker = object()
+        value = self.get(key, marker)
+        if value is marker:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: Any) -> bool:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False
+        return self.ttl_seconds is None or entry[0] >= self.clock() - self.ttl_seconds
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(list(self._entries))
+
+    def pop(self, key: Any, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def __delitem__(self, key: Any) -> None:
+        with self._lock:
+            del self._entries[key]
+
+    def values(self) -> list:
+        return [value for _, value in list(self._entries.values())]
+
+    def items(self) -> list:
+        return [(key, entry[1]) for key, entry in list(self._entries.items())]
+
+    def expire(self) -> int:
+        """Drop expired entries now; returns the number removed"""
+        with self._lock:
+            dropped = self._expire_locked(self.clock())
+        self._notify(dropped)
+        return len(dropped)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class PathStore:
+    """Append-only on-disk store of completed cognitive paths (SQLite, WAL; shareable across processes)"""
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        self._local = threading.local()
+        self._conn().executescript(
+            "CREATE TABLE IF NOT EXISTS cognitive_paths ("
+            "  path_id TEXT PRIMARY KEY, stored_at REAL NOT NULL, record TEXT NOT NULL)"
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def append(self, path_id: str, record: Dict[str, Any]) -> None:
+        """Store a path record (first write wins - records are never rewritten)"""
+        self._conn().execute(
+            "INSERT OR IGNORE INTO cognitive_paths (path_id, stored_at, record) VALUES (?, ?, ?)",
+            (path_id, time.time(), json.dumps(record, ensure_ascii=False, default=_json_default)),
+        )
+
+    def get(self, path_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute(
+            "SELECT record FROM cognitive_paths WHERE path_id = ?", (path_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM cognitive_paths").fetchone()[0]
@@ -26,6 +26,18 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from mswr_v2_clean import ConsciousResidualInferenceModule, create_mswr_system
+from lexicon import Lexicon
+
+# Słowniki fabuły - jeden skan tekstu dla sentymentu i słów akcji
+EMOTIONAL_WORDS = {
+    "positive": ["miłość", "radość", "szczęście", "nadzieja", "sukces", "zwycięstwo"],
+    "negative": ["smutek", "ból", "strach", "lęk", "porażka", "śmierć"],
+    "intense": ["pasja", "gniew", "ekstaza", "desperacja", "obsesja", "szaleństwo"],
+    "neutral": ["praca", "dom", "droga", "książka", "komputer", "jedzenie"]
+}
+ACTION_WORDS = ["biega", "walczy", "tańczy", "śpiewa", "płacze", "śmieje", "krzyczy"]
+
+STORY_LEXICON = Lexicon({**EMOTIONAL_WORDS, "action": ACTION_WORDS}, cache_size=256)
 
 class PinkPlaySWR:
     """
@@ -57,19 +69,8 @@ class PinkPlaySWR:
     def analyze_story_sentiment(self, story: str) -> Dict[str, Any]:
         """Analizuje sentyment fabuły"""
         # Prosta analiza sentymentu (można rozbudować o zewnętrzne API)
-        emotional_words = {
-            "positive": ["miłość", "radość", "szczęście", "nadzieja", "sukces", "zwycięstwo"],
-            "negative": ["smutek", "ból", "strach", "lęk", "porażka", "śmierć"],
-            "intense": ["pasja", "gniew", "ekstaza", "desperacja", "obsesja", "szaleństwo"],
-            "neutral": ["praca", "dom", "droga", "książka", "komputer", "jedzenie"]
-        }
-        
-        story_lower = story.lower()
-        sentiment_scores = {}
-        
-        for category, words in emotional_words.items():
-            score = sum(1 for word in words if word in story_lower)
-            sentiment_scores[category] = score
+        scan = STORY_LEXICON.scan(story)
+        sentiment_scores = {category: scan.count(category) for category in EMOTIONAL_WORDS}
         
         # Oblicz dominujący sentyment
         dominant = max(sentiment_scores, key=sentiment_scores.get)
@@ -97,8 +98,7 @@ class PinkPlaySWR:
             })
         
         # Resztka 2: Brak akcji/czasowników
-        action_words = ["biega", "walczy", "tańczy", "śpiewa", "płacze", "śmieje", "krzyczy"]
-        action_count = sum(1 for word in action_words if word in story.lower())
+        action_count = STORY_LEXICON.scan(story).count("action")
         if action_count == 0:
             residuals.append({
                 "type": "lack_of_action",
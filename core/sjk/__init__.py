@@ -15,17 +15,24 @@ import asyncio
 import hashlib
 import json
 import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 import uuid
+from collections import OrderedDict
 
 import numpy as np
 import yaml
 
+from ..metrics_registry import MetricsRegistry, REGISTRY, start_metrics_server
+from .history import RingBuffer
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -81,6 +88,37 @@ class CalibrationMetrics:
             'error_count': self.error_count,
             'performance_score': self.performance_score
         }
+    
+    def to_record(self) -> Tuple:
+        """Row for a METRICS_DTYPE ring buffer"""
+        return (self.timestamp.timestamp(), self.p_score, self.stability_index, self.convergence_rate,
+                self.entropy_residual, self.calibration_cycles, self.validation_passes,
+                self.abstain_count, self.error_count, self.performance_score)
+    
+    @classmethod
+    def from_record(cls, record: np.void) -> 'CalibrationMetrics':
+        """Inverse of to_record"""
+        values = {name: record[name].item() for name in METRICS_DTYPE.names}
+        values['timestamp'] = datetime.fromtimestamp(values['timestamp'], timezone.utc)
+        return cls(**values)
+
+
+# Structured row layout of metrics_history (one field per CalibrationMetrics field)
+METRICS_DTYPE = np.dtype([
+    ('timestamp', 'f8'),
+    ('p_score', 'f8'),
+    ('stability_index', 'f8'),
+    ('convergence_rate', 'f8'),
+    ('entropy_residual', 'f8'),
+    ('calibration_cycles', 'i8'),
+    ('validation_passes', 'i8'),
+    ('abstain_count', 'i8'),
+    ('error_count', 'i8'),
+    ('performance_score', 'f8'),
+])
+
+CONVERGENCE_HISTORY_SIZE = 100
+STRICT_TRANSFORM_CACHE = 8  # n x n float64 each (4096-dim: 128 MiB), so only a few dimensions are kept
 
 
 @dataclass
@@ -108,6 +146,12 @@ class CalibrationConfig:
     parallel_workers: int = 4
     batch_size: int = 32
     cache_size: int = 1000
+    max_concurrent_calibrations: Optional[int] = None  # default: parallel_workers
+    max_queued_calibrations: int = 1000                # callers waiting for a slot
+    seed: Optional[int] = None                         # fixed noise seed: CONSERVATIVE/EXPERIMENTAL become cacheable
+    
+    # Telemetry (/metrics exporter port, None = not served)
+    metrics_port: Optional[int] = None
     
     @classmethod
     def from_yaml(cls, config_path: Path) -> 'CalibrationConfig':
@@ -117,6 +161,9 @@ class CalibrationConfig:
                 config_data = yaml.safe_load(f)
                 
             sjk_config = config_data.get('sjk', {})
+            telemetry = config_data.get('telemetry', {})
+            metrics_port = (telemetry.get('port') if telemetry.get('enabled') and sjk_config.get('metrics_export', True)
+                            else None)
             return cls(
                 target_p_score=sjk_config.get('target_p_score', 1.000),
                 stability_threshold=sjk_config.get('stability_threshold', 0.999),
@@ -132,13 +179,25 @@ class CalibrationConfig:
                 alert_threshold=sjk_config.get('alert_threshold', 0.990),
                 parallel_workers=sjk_config.get('parallel_workers', 4),
                 batch_size=sjk_config.get('batch_size', 32),
-                cache_size=sjk_config.get('cache_size', 1000)
+                cache_size=sjk_config.get('cache_size', 1000),
+                max_concurrent_calibrations=sjk_config.get('max_concurrent_calibrations'),
+                max_queued_calibrations=sjk_config.get('max_queued_calibrations', 1000),
+                seed=sjk_config.get('seed'),
+                metrics_port=metrics_port
             )
         except Exception as e:
             logger.warning(f"Failed to load config from {config_path}: {e}")
             return cls()
 
 
+# Latency histogram buckets (seconds)
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+class CalibrationOverloaded(RuntimeError):
+    """Raised when the calibration wait queue is full"""
+
+
 class UnifiedCalibrationEngine:
     """
     S.J.K. - Silnik Jednolitej Kalibracji
@@ -148,7 +207,7 @@ class UnifiedCalibrationEngine:
     error detection and abstention mechanisms.
     """
     
-    def __init__(self, config: CalibrationConfig):
+    def __init__(self, config: CalibrationConfig, registry: Optional[MetricsRegistry] = None):
         self.config = config
         self.state = CalibrationState.INITIALIZE
         self.session_id = str(uuid.uuid4())
@@ -163,18 +222,40 @@ class UnifiedCalibrationEngine:
         self.error_count = 0
         
         # Metrics storage
-        self.metrics_history: List[CalibrationMetrics] = []
-        self.performance_cache: Dict[str, float] = {}
+        self.metrics_history = RingBuffer(max(1, self.config.metrics_retention), METRICS_DTYPE)
+        # LRU of (calibrated, p_score) keyed by input digest + mode + weights version
+        self.performance_cache: OrderedDict = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache_weights_version = 0
         
         # Algorithm state
         self.calibration_weights = np.random.normal(0, 0.1, (64, 64))
         self.momentum_state = np.zeros_like(self.calibration_weights)
-        self.convergence_history: List[float] = []
+        self.convergence_history = RingBuffer(CONVERGENCE_HISTORY_SIZE)
+        # LRU of strict transforms per dimension; seeded per (engine, n), so a rebuilt one is identical
+        self._strict_transforms: OrderedDict = OrderedDict()
+        self._strict_seed = self.config.seed if self.config.seed is not None else int(np.random.randint(2 ** 31))
+        self._weights_lock = threading.Lock()      # calibration kernels run on executor threads
+        self.weights_version = 0                   # bumped by adaptive learning updates
+        self._transforms_lock = threading.Lock()
+        
+        # CPU offload: executor + per-loop concurrency limiter with a bounded wait queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._limiter: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = None
+        self.inflight_calibrations = 0
+        self.queued_calibrations = 0
+        self.rejected_calibrations = 0
         
         # Monitoring
         self.is_monitoring = False
         self.monitoring_task: Optional[asyncio.Task] = None
         
+        # Prometheus export (configs/sjk.yaml telemetry.metrics)
+        self.registry = registry if registry is not None else REGISTRY
+        self._register_metrics()
+        self._exported_totals = {'cycles': 0, 'abstain': 0, 'errors': 0}
+        
         logger.info(f"S.J.K. Engine initialized - Session: {self.session_id}")
         logger.info(f"Configuration: {self.config.calibration_mode.value} mode")
     
@@ -194,6 +275,8 @@ class UnifiedCalibrationEngine:
             
             # Setup monitoring
             await self._setup_monitoring()
+            if self.config.metrics_port:
+                start_metrics_server(self.config.metrics_port, registry=self.registry)
             
             # Transition to calibration state
             self.state = CalibrationState.CALIBRATE
@@ -210,10 +293,11 @@ class UnifiedCalibrationEngine:
         # Xavier initialization for better convergence
         fan_in, fan_out = self.calibration_weights.shape
         limit = np.sqrt(6.0 / (fan_in + fan_out))
-        self.calibration_weights = np.random.uniform(-limit, limit, (fan_in, fan_out))
-        
-        # Initialize momentum state
-        self.momentum_state = np.zeros_like(self.calibration_weights)
+        with self._weights_lock:
+            self.calibration_weights = np.random.uniform(-limit, limit, (fan_in, fan_out))
+            
+            # Initialize momentum state
+            self.momentum_state = np.zeros_like(self.calibration_weights)
         
         logger.debug("Calibration matrices initialized with Xavier initialization")
     
@@ -266,7 +350,7 @@ class UnifiedCalibrationEngine:
                 p_score=self.current_p_score,
                 stability_index=self.stability_index,
                 convergence_rate=self._calculate_convergence_rate(),
-                entropy_residual=self._calculate_entropy_residual(),
+                entropy_residual=await self._run_in_executor(self._calculate_entropy_residual),
                 calibration_cycles=self.calibration_cycles,
                 validation_passes=self.validation_passes,
                 abstain_count=self.abstain_count,
@@ -274,16 +358,55 @@ class UnifiedCalibrationEngine:
                 performance_score=self._calculate_performance_score()
             )
             
-            self.metrics_history.append(metrics)
-            
-            # Maintain metrics retention limit
-            if len(self.metrics_history) > self.config.metrics_retention:
-                self.metrics_history = self.metrics_history[-self.config.metrics_retention:]
+            # Ring buffer keeps the newest metrics_retention rows
+            self.metrics_history.append(metrics.to_record())
+            self._export_metrics(metrics)
             
         except Exception as e:
             logger.error(f"Metrics collection failed: {e}")
             self.error_count += 1
     
+    def _register_metrics(self):
+        """Declare S.J.K. metric families (names and labels as in configs/sjk.yaml)"""
+        r = self.registry
+        self._gauges = {
+            'p_score': r.gauge('sjk_p_score', 'Current S.J.K. P-score', ['session_id', 'calibration_mode']),
+            'stability_index': r.gauge('sjk_stability_index', 'System stability index', ['session_id']),
+            'convergence_rate': r.gauge('sjk_convergence_rate', 'Current convergence rate', ['session_id']),
+            'entropy_residual': r.gauge('sjk_entropy_residual', 'Residual entropy in system', ['session_id']),
+            'performance_score': r.gauge('sjk_performance_score', 'Overall performance score', ['session_id']),
+        }
+        self._cycles_total = r.counter('sjk_calibration_cycles', 'Total calibration cycles', ['session_id', 'mode'])
+        self._abstain_total = r.counter('sjk_abstain_total', 'Total abstention count', ['session_id', 'reason'])
+        self._errors_total = r.counter('sjk_error_count', 'Total error count', ['session_id', 'error_type'])
+        self._latency = r.histogram('sjk_calibration_latency_seconds', 'Calibration kernel latency',
+                                    ['session_id', 'mode'], buckets=LATENCY_BUCKETS)
+        self._queue_wait = r.histogram('sjk_calibration_queue_wait_seconds', 'Time waiting for a calibration slot',
+                                       ['session_id'], buckets=LATENCY_BUCKETS)
+        self._rejected_total = r.counter('sjk_calibration_rejected_total', 'Calibrations rejected (queue full)',
+                                         ['session_id'])
+        self._inflight_gauge = r.gauge('sjk_calibration_inflight', 'Calibrations running on the executor', ['session_id'])
+        self._queued_gauge = r.gauge('sjk_calibration_queued', 'Calibrations waiting for a slot', ['session_id'])
+        self._cache_events = r.counter('sjk_cache_events_total', 'Calibration cache lookups', ['session_id', 'result'])
+        self._cache_hit_ratio = r.gauge('sjk_cache_hit_ratio', 'Calibration cache hit ratio', ['session_id'])
+    
+    def _export_metrics(self, metrics: CalibrationMetrics):
+        """Push a metrics snapshot to the registry (counters advance by the delta since last export)"""
+        mode = self.config.calibration_mode.value
+        self._gauges['p_score'].labels(self.session_id, mode).set(metrics.p_score)
+        for name in ('stability_index', 'convergence_rate', 'entropy_residual', 'performance_score'):
+            self._gauges[name].labels(self.session_id).set(getattr(metrics, name))
+        
+        totals = {'cycles': metrics.calibration_cycles, 'abstain': metrics.abstain_count, 'errors': metrics.error_count}
+        delta = {k: v - self._exported_totals[k] for k, v in totals.items()}
+        self._exported_totals = totals
+        if delta['cycles'] > 0:
+            self._cycles_total.labels(self.session_id, mode).inc(delta['cycles'])
+        if delta['abstain'] > 0:
+            self._abstain_total.labels(self.session_id, 'p_score_below_threshold').inc(delta['abstain'])
+        if delta['errors'] > 0:
+            self._errors_total.labels(self.session_id, 'engine').inc(delta['errors'])
+    
     async def _check_alerts(self):
         """Check for alert conditions"""
         try:
@@ -295,7 +418,7 @@ class UnifiedCalibrationEngine:
             
             # Check for convergence issues
             if len(self.convergence_history) > 10:
-                recent_convergence = np.std(self.convergence_history[-10:])
+                recent_convergence = np.std(self.convergence_history.last(10))
                 if recent_convergence > 0.1:  # High variance indicates poor convergence
                     logger.warning(f"Poor convergence detected: σ={recent_convergence:.6f}")
             
@@ -308,13 +431,15 @@ class UnifiedCalibrationEngine:
         if len(self.convergence_history) < 2:
             return 0.0
         
-        recent_changes = np.diff(self.convergence_history[-10:])
+        recent_changes = np.diff(self.convergence_history.last(10))
         return float(np.mean(np.abs(recent_changes)))
     
     def _calculate_entropy_residual(self) -> float:
         """Calculate residual entropy in the system"""
         # Simplified entropy calculation based on weight matrix
-        eigenvals = np.linalg.eigvals(self.calibration_weights)
+        with self._weights_lock:
+            weights = self.calibration_weights.copy()
+        eigenvals = np.linalg.eigvals(weights)
         eigenvals = eigenvals[eigenvals > 1e-10]  # Remove near-zero eigenvalues
         
         if len(eigenvals) == 0:
@@ -365,18 +490,18 @@ class UnifiedCalibrationEngine:
             
             self.calibration_cycles += 1
             
-            # Apply calibration algorithm based on mode
-            if self.config.calibration_mode == CalibrationMode.ADAPTIVE:
-                calibrated_data = await self._adaptive_calibration(input_data)
-            elif self.config.calibration_mode == CalibrationMode.STRICT:
-                calibrated_data = await self._strict_calibration(input_data)
-            elif self.config.calibration_mode == CalibrationMode.EXPERIMENTAL:
-                calibrated_data = await self._experimental_calibration(input_data)
-            else:  # CONSERVATIVE
-                calibrated_data = await self._conservative_calibration(input_data)
-            
-            # Calculate P-score
-            p_score = self._calculate_p_score(input_data, calibrated_data)
+            key = self._cache_key(input_data)
+            cached = self._cache_get(key) if key is not None else None
+            if cached is not None:
+                calibrated_data, p_score = cached[0].copy(), cached[1]
+            else:
+                # Calibration kernel + P-score run on the executor, off the event loop
+                rng = np.random.default_rng([self.config.seed, int.from_bytes(key[0][:8], 'little')]) \
+                    if key is not None and self.config.seed is not None else None
+                async with self._calibration_slot():
+                    calibrated_data, p_score = await self._run_in_executor(self._calibrate_kernel, input_data, rng)
+                if key is not None:
+                    self._cache_put(key, (calibrated_data.copy(), p_score))
             self.current_p_score = p_score
             
             # Update stability index
@@ -391,8 +516,6 @@ class UnifiedCalibrationEngine:
             
             # Update convergence history
             self.convergence_history.append(p_score)
-            if len(self.convergence_history) > 100:
-                self.convergence_history = self.convergence_history[-100:]
             
             # Validate if we've reached target
             if p_score >= self.config.target_p_score:
@@ -402,14 +525,204 @@ class UnifiedCalibrationEngine:
             
             return calibrated_data, p_score
             
+        except CalibrationOverloaded as e:
+            logger.warning(f"Calibration rejected: {e}")
+            return input_data, 0.0
+            
         except Exception as e:
             logger.error(f"Calibration failed: {e}")
             self.error_count += 1
             self.state = CalibrationState.ABSTAIN
             return input_data, 0.0
     
-    async def _adaptive_calibration(self, input_data: np.ndarray) -> np.ndarray:
+    async def calibrate_batch(self, input_batch: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Perform unified calibration on a batch of inputs
+        
+        The batch is split into chunks of config.batch_size. ADAPTIVE chunks run in
+        order (one matmul and one momentum update per chunk); the stateless modes
+        fan chunks out across config.parallel_workers threads.
+        
+        Args:
+            input_batch: Array of shape [batch, dim]
+            
+        Returns:
+            Tuple of (calibrated_batch, p_scores); abstained rows keep their input
+            (truncated to the calibrated width) and get P=0
+        """
+        input_batch = np.atleast_2d(np.asarray(input_batch, dtype=float))
+        if input_batch.size == 0:
+            return input_batch, np.zeros(len(input_batch))
+        try:
+            if self.state != CalibrationState.CALIBRATE:
+                await self.initialize()
+            
+            mode = self.config.calibration_mode
+            size = max(1, self.config.batch_size)
+            chunks = [input_batch[i:i + size] for i in range(0, len(input_batch), size)]
+            self.calibration_cycles += len(input_batch)
+            
+            async with self._calibration_slot(mode):
+                if mode == CalibrationMode.ADAPTIVE:
+                    parts = await self._run_in_executor(
+                        lambda: [self._adaptive_calibration_batch(chunk) for chunk in chunks]
+                    )
+                elif len(chunks) == 1 or self.config.parallel_workers <= 1:
+                    rng = np.random.default_rng(np.random.randint(2 ** 31))
+                    parts = await self._run_in_executor(
+                        lambda: [self._stateless_calibration_batch(chunk, mode, rng) for chunk in chunks]
+                    )
+                else:
+                    seeds = np.random.randint(2 ** 31, size=len(chunks))
+                    parts = await asyncio.gather(*(
+                        self._run_in_executor(self._stateless_calibration_batch,
+                                              chunk, mode, np.random.default_rng(seed))
+                        for chunk, seed in zip(chunks, seeds)
+                    ))
+                calibrated = np.concatenate(parts) if parts else input_batch.copy()
+                p_scores = await self._run_in_executor(self._calculate_p_scores, input_batch, calibrated)
+            
+            self.current_p_score = float(p_scores[-1])
+            abstained = p_scores < self.config.abstain_threshold
+            if abstained.any():
+                calibrated[abstained] = input_batch[abstained, :calibrated.shape[1]]
+                p_scores[abstained] = 0.0
+                self.abstain_count += int(abstained.sum())
+                logger.warning(f"Calibration abstained for {int(abstained.sum())}/{len(input_batch)} inputs")
+            
+            accepted = p_scores[~abstained]
+            if len(accepted):
+                self.convergence_history.extend(accepted)
+            self.stability_index = self._calculate_stability_index()
+            
+            reached = int(np.sum(accepted >= self.config.target_p_score))
+            if abstained.all():
+                self.state = CalibrationState.ABSTAIN
+            elif reached:
+                self.state = CalibrationState.VALIDATE
+                self.validation_passes += reached
+                logger.info(f"Target P-score achieved for {reached}/{len(input_batch)} inputs")
+            
+            return calibrated, p_scores
+            
+        except CalibrationOverloaded as e:
+            logger.warning(f"Batch calibration rejected: {e}")
+            return input_batch, np.zeros(len(input_batch))
+            
+        except Exception as e:
+            logger.error(f"Batch calibration failed: {e}")
+            self.error_count += 1
+            self.state = CalibrationState.ABSTAIN
+            return input_batch, np.zeros(len(input_batch))
+    
+    def _cache_key(self, input_data: np.ndarray) -> Optional[Tuple]:
+        """
+        Cache key for deterministic calibrations, None when the result is not reusable
+        
+        STRICT is deterministic (cached transform); CONSERVATIVE and EXPERIMENTAL
+        only with config.seed (noise is then seeded from the input digest).
+        ADAPTIVE learns on every call and is never cached.
+        """
+        mode = self.config.calibration_mode
+        if self.config.cache_size <= 0 or mode == CalibrationMode.ADAPTIVE:
+            return None
+        if mode != CalibrationMode.STRICT and self.config.seed is None:
+            return None
+        data = np.ascontiguousarray(input_data)
+        digest = hashlib.blake2b(data.view(np.uint8), digest_size=16).digest()
+        return digest, data.shape, data.dtype.str, mode.value, self.weights_version
+    
+    def _cache_get(self, key: Tuple) -> Optional[Tuple[np.ndarray, float]]:
+        """LRU lookup (event loop only); drops entries when adaptive learning moved the weights"""
+        if self.weights_version != self._cache_weights_version:
+            self.performance_cache.clear()
+            self._cache_weights_version = self.weights_version
+        entry = self.performance_cache.get(key)
+        if entry is None:
+            self.cache_misses += 1
+            self._cache_events.labels(self.session_id, 'miss').inc()
+        else:
+            self.performance_cache.move_to_end(key)
+            self.cache_hits += 1
+            self._cache_events.labels(self.session_id, 'hit').inc()
+        self._cache_hit_ratio.labels(self.session_id).set(self.cache_hits / (self.cache_hits + self.cache_misses))
+        return entry
+    
+    def _cache_put(self, key: Tuple, entry: Tuple[np.ndarray, float]) -> None:
+        self.performance_cache[key] = entry
+        self.performance_cache.move_to_end(key)
+        while len(self.performance_cache) > self.config.cache_size:
+            self.performance_cache.popitem(last=False)
+    
+    async def _run_in_executor(self, fn, *args):
+        """Run a CPU-bound kernel on the engine's executor (NumPy releases the GIL)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), fn, *args)
+    
+    def _get_limiter(self) -> asyncio.Semaphore:
+        """Concurrency limiter bound to the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._limiter is None or self._limiter[0] is not loop:
+            limit = self.config.max_concurrent_calibrations or self.config.parallel_workers
+            self._limiter = (loop, asyncio.Semaphore(max(1, limit)))
+        return self._limiter[1]
+    
+    @asynccontextmanager
+    async def _calibration_slot(self, mode: Optional[CalibrationMode] = None):
+        """
+        Wait (bounded queue) for one of max_concurrent_calibrations slots
+        
+        Raises CalibrationOverloaded when max_queued_calibrations callers are
+        already waiting. Queue wait and time in the slot go to the latency histograms.
+        """
+        limiter = self._get_limiter()
+        if limiter.locked() and self.queued_calibrations >= self.config.max_queued_calibrations:
+            self.rejected_calibrations += 1
+            self._rejected_total.labels(self.session_id).inc()
+            raise CalibrationOverloaded(f"{self.queued_calibrations} calibrations already queued")
+        
+        enqueued = time.perf_counter()
+        self.queued_calibrations += 1
+        self._queued_gauge.labels(self.session_id).set(self.queued_calibrations)
+        try:
+            await limiter.acquire()
+        finally:
+            self.queued_calibrations -= 1
+            self._queued_gauge.labels(self.session_id).set(self.queued_calibrations)
+        
+        started = time.perf_counter()
+        self._queue_wait.labels(self.session_id).observe(started - enqueued)
+        self.inflight_calibrations += 1
+        self._inflight_gauge.labels(self.session_id).set(self.inflight_calibrations)
+        try:
+            yield
+        finally:
+            self.inflight_calibrations -= 1
+            self._inflight_gauge.labels(self.session_id).set(self.inflight_calibrations)
+            limiter.release()
+            mode = (mode or self.config.calibration_mode).value
+            self._latency.labels(self.session_id, mode).observe(time.perf_counter() - started)
+    
+    def _calibrate_kernel(self, input_data: np.ndarray,
+                          rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, float]:
+        """Calibration algorithm for the configured mode + P-score (executor thread)"""
+        mode = self.config.calibration_mode
+        if mode == CalibrationMode.ADAPTIVE:
+            calibrated_data = self._adaptive_calibration(input_data)
+        elif mode == CalibrationMode.STRICT:
+            calibrated_data = self._strict_calibration(input_data)
+        elif mode == CalibrationMode.EXPERIMENTAL:
+            calibrated_data = self._experimental_calibration(input_data, rng)
+        else:  # CONSERVATIVE
+            calibrated_data = self._conservative_calibration(input_data, rng)
+        return calibrated_data, self._calculate_p_score(input_data, calibrated_data)
+    
+    def _adaptive_calibration(self, input_data: np.ndarray) -> np.ndarray:
         """Adaptive calibration algorithm"""
+        with self._weights_lock:
+            return self._adaptive_calibration_locked(input_data)
+    
+    def _adaptive_calibration_locked(self, input_data: np.ndarray) -> np.ndarray:
         # Reshape input for matrix operations
         if input_data.ndim == 1:
             input_data = input_data.reshape(-1, 1)
@@ -440,32 +753,45 @@ class UnifiedCalibrationEngine:
         
         # Apply regularization
         self.calibration_weights *= (1 - self.config.regularization)
+        self.weights_version += 1
         
         return calibrated.flatten() if calibrated.size > 0 else input_data.flatten()
     
-    async def _strict_calibration(self, input_data: np.ndarray) -> np.ndarray:
+    def _strict_calibration(self, input_data: np.ndarray) -> np.ndarray:
         """Strict P=1.000 calibration algorithm"""
-        # High-precision calibration with multiple passes
-        calibrated = input_data.copy()
-        
-        for i in range(10):  # Multiple calibration passes
-            # Apply precision transformation
-            transformation_matrix = np.eye(len(calibrated)) + 0.001 * np.random.randn(len(calibrated), len(calibrated))
-            calibrated = np.dot(transformation_matrix, calibrated)
-            
-            # Normalize to prevent drift
-            calibrated = calibrated / (np.linalg.norm(calibrated) + 1e-10)
+        # High-precision calibration: the 10 precision passes are precomposed
+        calibrated = np.dot(self._strict_transform(len(input_data)), input_data)
         
-        return calibrated
+        # Normalize to prevent drift
+        return calibrated / (np.linalg.norm(calibrated) + 1e-10)
+    
+    def _strict_transform(self, n: int) -> np.ndarray:
+        """Product of the 10 strict-mode precision transforms for dimension n (LRU of STRICT_TRANSFORM_CACHE)"""
+        with self._transforms_lock:
+            transform = self._strict_transforms.get(n)
+            if transform is not None:
+                self._strict_transforms.move_to_end(n)
+                return transform
+            # Per-pass normalization only rescales, so composing the passes gives the same direction
+            rng = np.random.default_rng([self._strict_seed, n])
+            transform = np.eye(n)
+            for _ in range(10):
+                transform = (np.eye(n) + 0.001 * rng.standard_normal((n, n))) @ transform
+            self._strict_transforms[n] = transform
+            while len(self._strict_transforms) > STRICT_TRANSFORM_CACHE:
+                self._strict_transforms.popitem(last=False)
+        return transform
     
-    async def _experimental_calibration(self, input_data: np.ndarray) -> np.ndarray:
+    def _experimental_calibration(self, input_data: np.ndarray,
+                                  rng: Optional[np.random.Generator] = None) -> np.ndarray:
         """Experimental calibration algorithm"""
         # Advanced experimental algorithm with neural network-like transformations
         calibrated = input_data.copy()
+        noise = rng.standard_normal(calibrated.shape) if rng is not None else np.random.randn(*calibrated.shape)
         
         # Apply non-linear transformations
         calibrated = np.tanh(calibrated)  # Non-linearity
-        calibrated = calibrated + 0.1 * np.random.randn(*calibrated.shape)  # Noise injection
+        calibrated = calibrated + 0.1 * noise  # Noise injection
         
         # Spectral normalization
         if len(calibrated) > 1:
@@ -474,17 +800,87 @@ class UnifiedCalibrationEngine:
         
         return calibrated
     
-    async def _conservative_calibration(self, input_data: np.ndarray) -> np.ndarray:
+    def _conservative_calibration(self, input_data: np.ndarray,
+                                  rng: Optional[np.random.Generator] = None) -> np.ndarray:
         """Conservative calibration algorithm"""
         # Minimal modification for maximum stability
         calibrated = input_data.copy()
+        noise = rng.standard_normal(calibrated.shape) if rng is not None else np.random.randn(*calibrated.shape)
         
         # Apply very small corrections
-        correction = 0.001 * (np.random.randn(*calibrated.shape))
+        correction = 0.001 * noise
         calibrated += correction
         
         return calibrated
     
+    def _adaptive_calibration_batch(self, batch: np.ndarray) -> np.ndarray:
+        """Adaptive calibration of a [batch, dim] chunk: one matmul, one momentum step with the mean gradient"""
+        with self._weights_lock:
+            return self._adaptive_calibration_batch_locked(batch)
+    
+    def _adaptive_calibration_batch_locked(self, batch: np.ndarray) -> np.ndarray:
+        n = min(batch.shape[1], self.calibration_weights.shape[0])
+        batch = batch[:, :n]
+        weights = self.calibration_weights[:n, :n]
+        
+        calibrated = batch @ weights.T
+        gradient = batch.T @ calibrated / len(batch)
+        
+        self.momentum_state[:n, :n] = (
+            self.config.momentum * self.momentum_state[:n, :n] +
+            self.config.learning_rate * gradient
+        )
+        self.calibration_weights[:n, :n] += self.momentum_state[:n, :n]
+        self.calibration_weights *= (1 - self.config.regularization)
+        self.weights_version += 1
+        
+        return calibrated
+    
+    def _stateless_calibration_batch(self, batch: np.ndarray, mode: CalibrationMode,
+                                     rng: np.random.Generator) -> np.ndarray:
+        """STRICT / EXPERIMENTAL / CONSERVATIVE calibration of a [batch, dim] chunk"""
+        if mode == CalibrationMode.STRICT:
+            calibrated = batch @ self._strict_transform(batch.shape[1]).T
+            return calibrated / (np.linalg.norm(calibrated, axis=1, keepdims=True) + 1e-10)
+        
+        if mode == CalibrationMode.EXPERIMENTAL:
+            calibrated = np.tanh(batch) + 0.1 * rng.standard_normal(batch.shape)
+            if batch.shape[1] > 1:
+                # SVD of a single column is u·vᵀ = x/‖x‖, so spectral normalization is a row norm
+                calibrated = calibrated / np.linalg.norm(calibrated, axis=1, keepdims=True)
+            return calibrated
+        
+        # CONSERVATIVE
+        return batch + 0.001 * rng.standard_normal(batch.shape)
+    
+    def _calculate_p_scores(self, original: np.ndarray, calibrated: np.ndarray) -> np.ndarray:
+        """Row-wise _calculate_p_score for [batch, dim] arrays"""
+        n = min(original.shape[1], calibrated.shape[1])
+        orig = original[:, :n]
+        cal = calibrated[:, :n]
+        
+        mse = np.mean((orig - cal) ** 2, axis=1)
+        if n > 1:
+            orig_c = orig - orig.mean(axis=1, keepdims=True)
+            cal_c = cal - cal.mean(axis=1, keepdims=True)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                correlation = np.sum(orig_c * cal_c, axis=1) / np.sqrt(
+                    np.sum(orig_c ** 2, axis=1) * np.sum(cal_c ** 2, axis=1)
+                )
+            correlation = np.nan_to_num(correlation, nan=0.0, posinf=0.0, neginf=0.0)
+        else:
+            correlation = np.ones(len(orig))
+        stability = 1.0 / (1.0 + np.std(cal, axis=1))
+        
+        p_scores = 0.4 * (1.0 - mse) + 0.3 * np.abs(correlation) + 0.3 * stability
+        return np.clip(np.nan_to_num(p_scores, nan=0.0), 0.0, 1.0)
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=max(1, self.config.parallel_workers),
+                                                thread_name_prefix='sjk')
+        return self._executor
+    
     def _calculate_p_score(self, original: np.ndarray, calibrated: np.ndarray) -> float:
         """Calculate P-score for calibration quality"""
         try:
@@ -519,7 +915,7 @@ class UnifiedCalibrationEngine:
             return 0.5  # Neutral stability for insufficient data
         
         # Stability based on recent P-score variance
-        recent_scores = self.convergence_history[-10:]
+        recent_scores = self.convergence_history.last(10)
         variance = np.var(recent_scores)
         stability = 1.0 / (1.0 + 10 * variance)  # Higher variance = lower stability
         
@@ -531,7 +927,7 @@ class UnifiedCalibrationEngine:
             if not self.metrics_history:
                 await self._collect_metrics()
             
-            latest_metrics = self.metrics_history[-1] if self.metrics_history else None
+            latest_metrics = CalibrationMetrics.from_record(self.metrics_history[-1]) if self.metrics_history else None
             
             summary = {
                 'session_id': self.session_id,
@@ -543,6 +939,19 @@ class UnifiedCalibrationEngine:
                 'total_validation_passes': self.validation_passes,
                 'total_abstain_count': self.abstain_count,
                 'total_error_count': self.error_count,
+                'offload': {
+                    'inflight': self.inflight_calibrations,
+                    'queued': self.queued_calibrations,
+                    'rejected': self.rejected_calibrations,
+                    'workers': self.config.parallel_workers
+                },
+                'cache': {
+                    'size': len(self.performance_cache),
+                    'capacity': self.config.cache_size,
+                    'hits': self.cache_hits,
+                    'misses': self.cache_misses,
+                    'hit_ratio': self.cache_hits / max(1, self.cache_hits + self.cache_misses)
+                },
                 'config': {
                     'target_p_score': self.config.target_p_score,
                     'stability_threshold': self.config.stability_threshold,
@@ -553,12 +962,15 @@ class UnifiedCalibrationEngine:
             
             # Add historical statistics if available
             if len(self.metrics_history) > 1:
-                p_scores = [m.p_score for m in self.metrics_history[-100:]]
+                recent = self.metrics_history.last(100)  # zero-copy view
+                p_scores = recent['p_score']
                 summary['historical_stats'] = {
-                    'avg_p_score': float(np.mean(p_scores)),
-                    'max_p_score': float(np.max(p_scores)),
-                    'min_p_score': float(np.min(p_scores)),
-                    'p_score_std': float(np.std(p_scores)),
+                    'avg_p_score': float(p_scores.mean()),
+                    'max_p_score': float(p_scores.max()),
+                    'min_p_score': float(p_scores.min()),
+                    'p_score_std': float(p_scores.std()),
+                    'avg_stability_index': float(recent['stability_index'].mean()),
+                    'avg_performance_score': float(recent['performance_score'].mean()),
                     'metrics_count': len(self.metrics_history)
                 }
             
@@ -589,6 +1001,10 @@ class UnifiedCalibrationEngine:
             summary = await self.get_metrics_summary()
             logger.info(f"Session summary: {summary}")
             
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+            
             logger.info("S.J.K. shutdown complete")
             
         except Exception as e:
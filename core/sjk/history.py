@@ -0,0 +1,70 @@
+"""
+S.J.K. History Buffers
+======================
+Fixed-capacity NumPy ring buffers for metrics and convergence history.
+"""
+
+from typing import Any, Iterable
+
+import numpy as np
+
+
+class RingBuffer:
+    """
+    Preallocated ring buffer over a NumPy array (plain or structured dtype)
+
+    Every item is written twice (at i and i + capacity), so the newest n
+    items are always one contiguous slice: last(n) is a zero-copy view and
+    append is O(1). Memory stays at 2 x capacity items.
+    """
+
+    def __init__(self, capacity: int, dtype: Any = np.float64):
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._data = np.zeros(2 * capacity, dtype=dtype)
+        self._next = 0   # write position in [0, capacity)
+        self._size = 0
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._data.dtype
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, item: Any) -> None:
+        """Add one item, overwriting the oldest when full"""
+        self._data[self._next] = item
+        self._data[self._next + self.capacity] = item
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def extend(self, items: Iterable[Any]) -> None:
+        """Add many items (only the newest `capacity` are kept)"""
+        items = np.asarray(items, dtype=self.dtype)[-self.capacity:]
+        start = 0
+        while start < len(items):
+            take = min(len(items) - start, self.capacity - self._next)
+            end = self._next + take
+            self._data[self._next:end] = items[start:start + take]
+            self._data[self._next + self.capacity:end + self.capacity] = items[start:start + take]
+            self._next = end % self.capacity
+            self._size = min(self._size + take, self.capacity)
+            start += take
+
+    def last(self, n: int = None) -> np.ndarray:
+        """View of the newest n items (all retained items if n is None), oldest first"""
+        n = self._size if n is None else max(0, min(n, self._size))
+        end = self._next + self.capacity
+        return self._data[end - n:end]
+
+    def __getitem__(self, index: int) -> Any:
+        """Item by position (negative = from newest)"""
+        if not -self._size <= index < self._size:
+            raise IndexError("ring buffer index out of range")
+        return self.last()[index]
+
+    def clear(self) -> None:
+        self._next = 0
+        self._size = 0
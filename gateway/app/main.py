@@ -3,14 +3,16 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, Response
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel
+import asyncio
 import httpx
-import json
 import logging
 from datetime import datetime
 from pathlib import Path
 import os
 from typing import Optional, Dict, Any
 from .auth import verify as verify_token, sign as create_token
+from .upstream import ServicePool
+from .telemetry import EventWriter, EventReader, parse_time
 
 # Konfiguracja logowania
 logging.basicConfig(level=logging.INFO)
@@ -56,11 +58,26 @@ SERVICES = {
     "mta_quest": os.getenv("SVC_MTA_QUEST", "http://localhost:5000")
 }
 
+# Shared keep-alive connection pool (one client per service)
+upstream = ServicePool(SERVICES, default_timeout=10)
+
+@app.on_event("startup")
+async def startup_event():
+    await upstream.start()
+    event_writer.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await upstream.close()
+    await asyncio.to_thread(event_writer.close)  # joins the writer thread (up to 5 s)
+
 # Telemetry setup
 EVENTS_LOG = Path("events.jsonl")
+event_writer = EventWriter(EVENTS_LOG)
+event_reader = EventReader(EVENTS_LOG)
 
 def log_event(event_type: str, data: Dict[str, Any], source: str = None, user_id: str = None):
-    """Log event to JSONL file"""
+    """Queue event for the background JSONL writer"""
     event = {
         "timestamp": datetime.now().isoformat(),
         "event_type": event_type,
@@ -69,8 +86,7 @@ def log_event(event_type: str, data: Dict[str, Any], source: str = None, user_id
         "user_id": user_id
     }
     
-    with open(EVENTS_LOG, "a", encoding="utf-8") as f:
-        f.write(json.dumps(event) + "\n")
+    event_writer.emit(event)
 
 async def proxy_request(service: str, path: str, method: str = "GET", **kwargs):
     """Proxy request to service with telemetry"""
@@ -89,15 +105,11 @@ async def proxy_request(service: str, path: str, method: str = "GET", **kwargs):
     })
     
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            if method.upper() == "GET":
-                response = await client.get(url, **kwargs)
-            elif method.upper() == "POST":
-                response = await client.post(url, **kwargs)
-            else:
-                raise HTTPException(405, f"Method {method} not supported")
-            
-            return response.json()
+        if method.upper() not in ("GET", "POST"):
+            raise HTTPException(405, f"Method {method} not supported")
+        
+        response = await upstream.request(service, method, url, **kwargs)
+        return response.json()
     except httpx.ConnectError:
         raise HTTPException(503, f"Service {service} unavailable")
     except Exception as e:
@@ -123,13 +135,12 @@ async def list_services():
     
     for service, url in SERVICES.items():
         try:
-            async with httpx.AsyncClient(timeout=3) as client:
-                response = await client.get(f"{url}/health")
-                service_status[service] = {
-                    "status": "online",
-                    "url": url,
-                    "response_time": response.elapsed.total_seconds()
-                }
+            response = await upstream.request(service, "GET", f"{url}/health", timeout=3)
+            service_status[service] = {
+                "status": "online",
+                "url": url,
+                "response_time": response.elapsed.total_seconds()
+            }
         except Exception:
             service_status[service] = {
                 "status": "offline", 
@@ -143,6 +154,11 @@ async def list_services():
         "online": len([s for s in service_status.values() if s["status"] == "online"])
     }
 
+@app.get("/services/pool")
+async def upstream_pool_metrics():
+    """Upstream connection pool occupancy and counters"""
+    return upstream.get_metrics()
+
 # === PROXY ENDPOINTS ===
 
 @app.get("/migi/state")
@@ -242,6 +258,7 @@ async def admin_audit(user: dict = Depends(require_admin)):
         "system_status": "operational",
         "services_count": len(SERVICES),
         "event_file_exists": EVENTS_LOG.exists(),
+        "events_writer": event_writer.get_stats(),
         "uptime_check": "gateway_operational"
     }
 
@@ -275,17 +292,29 @@ async def log_telemetry_event(event: TelemetryEvent, request: Request):
         raise HTTPException(status_code=500, detail="Failed to log event")
 
 @app.get("/v1/events")
-async def get_recent_events(limit: int = 50):
-    """Get recent telemetry events"""
+async def get_recent_events(
+    limit: int = 50,
+    event_type: Optional[str] = None,
+    user_id: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None
+):
+    """Get recent telemetry events (optional type/user/time-range filters)"""
     try:
-        if not EVENTS_LOG.exists():
-            return {"events": []}
-        
-        events = []
-        with open(EVENTS_LOG, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-            for line in lines[-limit:]:
-                events.append(json.loads(line.strip()))
+        since_ts, until_ts = parse_time(since), parse_time(until)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="since/until must be unix seconds or ISO-8601")
+    
+    try:
+        # File I/O - keep it off the event loop
+        events = await asyncio.to_thread(
+            event_reader.recent,
+            limit,
+            event_type=event_type,
+            user_id=user_id,
+            since=since_ts,
+            until=until_ts
+        )
         
         return {"events": events}
     except Exception as e:
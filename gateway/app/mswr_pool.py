@@ -0,0 +1,226 @@
+"""
+Long-lived MŚWR engine pool for the Meta-Genius gateways
+Silniki MŚWR tworzone raz przy starcie, zapytania wykonywane poza pętlą zdarzeń
+
+Each of the N engines is a ConsciousResidualInferenceModule with all six
+layers built once at startup. A request borrows an idle engine, runs the
+synchronous pipeline on a worker thread and hands the engine back when the
+call has actually finished, so an engine is never used by two threads.
+Waiting requests beyond the queue limit are rejected instead of piling up.
+Each engine also has a lock held while it runs, so metrics snapshots never
+read an engine in the middle of an inference.
+
+Configuration (ENV):
+    GATEWAY_MSWR_WORKERS    - number of engines / worker threads (default 1)
+    GATEWAY_MSWR_MAX_QUEUE  - max requests waiting for an engine (default 256)
+    GATEWAY_MSWR_WARMUP     - "1" runs a warm-up inference at startup (default 1)
+    GATEWAY_MSWR_PATH_STORE - SQLite file for evicted cognitive paths (default: not stored)
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+WARMUP_INPUT = "System warm-up"
+
+# Summed across engines in system_metrics(); everything else comes from the first engine
+_ADDITIVE_METRICS = ("total_inferences", "successful_healings", "p_equals_one_count", "healing_history_count")
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        logger.warning(f"Invalid value for {name}, using {default}")
+        return default
+
+class MSWROverloaded(RuntimeError):
+    """Raised when the MŚWR request queue is full"""
+
+class MSWRPool:
+    """Startup-initialized MŚWR engines served through a bounded executor queue"""
+
+    def __init__(self, factory: Callable[[], Any] = None, workers: int = None, max_queue: int = None):
+        self.factory = factory
+        self.workers = max(1, workers or _env_int("GATEWAY_MSWR_WORKERS", 1))
+        self.max_queue = max_queue if max_queue is not None else _env_int("GATEWAY_MSWR_MAX_QUEUE", 256)
+        self.warmup = os.getenv("GATEWAY_MSWR_WARMUP", "1") == "1"
+
+        self.engines: List[Any] = []
+        self._engine_locks: Dict[int, threading.Lock] = {}
+        self.error: Optional[str] = None
+        self._idle: Optional[asyncio.Queue] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._started_at = 0.0
+        self._stats = {
+            "in_flight": 0,
+            "queued": 0,
+            "peak_queued": 0,
+            "requests_total": 0,
+            "errors_total": 0,
+            "rejected_total": 0,
+            "latency_ms_total": 0.0,
+            "latency_ms_max": 0.0,
+            "queue_wait_ms_total": 0.0,
+        }
+        self._warm_start = {"init_ms": 0.0, "cold_inference_ms": 0.0, "warm_inference_ms": 0.0}
+
+    @property
+    def available(self) -> bool:
+        return bool(self.engines)
+
+    def _default_factory(self):
+        from core.conscious_residual_inference import create_mswr_system
+        return create_mswr_system(path_store_file=os.getenv("GATEWAY_MSWR_PATH_STORE") or None)
+
+    def _build(self) -> None:
+        """Create the engines (and warm the process up) - runs on a worker thread"""
+        factory = self.factory or self._default_factory
+        if self.warmup:
+            # First call pays one-off costs (imports, caches); measure it on a throwaway engine
+            start = time.perf_counter()
+            scratch = factory()
+            scratch.zero_time_inference(WARMUP_INPUT, {"warmup": True})
+            self._warm_start["cold_inference_ms"] = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            scratch.zero_time_inference(WARMUP_INPUT, {"warmup": True})
+            self._warm_start["warm_inference_ms"] = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        engines = [factory() for _ in range(self.workers)]
+        self._warm_start["init_ms"] = (time.perf_counter() - start) * 1000
+        self.engines = [engine for engine in engines if engine]
+        self._engine_locks = {id(engine): threading.Lock() for engine in self.engines}
+
+    async def start(self) -> None:
+        """Build the engines and the worker threads (call on app startup)"""
+        if self._executor is not None:
+            return
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="mswr")
+        self._idle = asyncio.Queue()
+        try:
+            await asyncio.get_running_loop().run_in_executor(self._executor, self._build)
+        except Exception as e:
+            self.error = str(e)
+            logger.error(f"❌ MŚWR pool unavailable: {e}")
+        for engine in self.engines:
+            self._idle.put_nowait(engine)
+        self._started_at = time.monotonic()
+        if self.engines:
+            logger.info(
+                f"🧠 MŚWR pool ready: {len(self.engines)} engines, max_queue={self.max_queue}, "
+                f"cold={self._warm_start['cold_inference_ms']:.1f}ms warm={self._warm_start['warm_inference_ms']:.1f}ms"
+            )
+
+    async def close(self) -> None:
+        """Wait for running inferences and stop the worker threads (call on app shutdown)"""
+        executor, engines = self._executor, self.engines
+        self._executor = None
+        self.engines = []
+        self._idle = None
+        if executor is not None:
+            # shutdown(wait=True) blocks until running inferences finish - keep it off the event loop
+            await asyncio.to_thread(executor.shutdown, True)
+        for engine in engines:
+            close = getattr(engine, "close", None)
+            if close is not None:
+                close()
+
+    async def run(self, fn: Callable[[Any], Any]) -> Any:
+        """Run fn(engine) on a worker thread with an idle engine"""
+        if self._executor is None:
+            await self.start()
+        if not self.engines:
+            raise RuntimeError(f"MŚWR system unavailable: {self.error or 'no engines'}")
+
+        stats = self._stats
+        if self._idle.empty() and stats["queued"] >= self.max_queue:
+            stats["rejected_total"] += 1
+            raise MSWROverloaded(f"MŚWR queue full ({self.max_queue} waiting)")
+
+        stats["queued"] += 1
+        stats["peak_queued"] = max(stats["peak_queued"], stats["queued"])
+        queued_at = time.perf_counter()
+        try:
+            engine = await self._idle.get()
+        finally:
+            stats["queued"] -= 1
+        start = time.perf_counter()
+        stats["queue_wait_ms_total"] += (start - queued_at) * 1000
+
+        stats["in_flight"] += 1
+        loop, idle = asyncio.get_running_loop(), self._idle
+        future = self._executor.submit(self._call, fn, engine)
+        # Hand the engine back only once the thread is done with it, even if the request is cancelled
+        future.add_done_callback(lambda _: self._release(loop, idle, engine))
+        try:
+            return await asyncio.wrap_future(future)
+        except Exception:
+            stats["errors_total"] += 1
+            raise
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            stats["in_flight"] -= 1
+            stats["requests_total"] += 1
+            stats["latency_ms_total"] += elapsed
+            stats["latency_ms_max"] = max(stats["latency_ms_max"], elapsed)
+
+    def _call(self, fn: Callable[[Any], Any], engine: Any) -> Any:
+        with self._engine_locks[id(engine)]:
+            return fn(engine)
+
+    def _engine_metrics(self) -> List[Dict[str, Any]]:
+        per_engine = []
+        for engine in list(self.engines):
+            with self._engine_locks[id(engine)]:
+                per_engine.append(engine.get_system_metrics())
+        return per_engine
+
+    @staticmethod
+    def _release(loop: asyncio.AbstractEventLoop, idle: asyncio.Queue, engine: Any) -> None:
+        try:
+            loop.call_soon_threadsafe(idle.put_nowait, engine)
+        except RuntimeError:
+            pass  # loop already closed (shutdown)
+
+    async def infer(self, input_data: Any, context: Dict[str, Any] = None) -> Dict[str, Any]:
+        """zero_time_inference on a pooled engine"""
+        return await self.run(lambda engine: engine.zero_time_inference(input_data, context))
+
+    async def system_metrics(self) -> Dict[str, Any]:
+        """get_system_metrics() of the pool, summed over engines (each read between inferences)"""
+        if not self.engines:
+            return {}
+        per_engine = await asyncio.to_thread(self._engine_metrics)
+        if not per_engine:
+            return {}
+        metrics = dict(per_engine[0])
+        for key in _ADDITIVE_METRICS:
+            metrics[key] = sum(m.get(key, 0) for m in per_engine)
+        total = max(1, metrics["total_inferences"])
+        metrics["success_rate"] = metrics["successful_healings"] / total
+        metrics["p_equals_one_rate"] = metrics["p_equals_one_count"] / total
+        return metrics
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Pool occupancy, latency/throughput counters and warm-start timings"""
+        stats = self._stats
+        total = stats["requests_total"]
+        uptime = time.monotonic() - self._started_at if self._started_at else 0.0
+        return {
+            **stats,
+            "engines": len(self.engines),
+            "idle_engines": self._idle.qsize() if self._idle is not None else 0,
+            "max_queue": self.max_queue,
+            "avg_latency_ms": stats["latency_ms_total"] / total if total else 0.0,
+            "avg_queue_wait_ms": stats["queue_wait_ms_total"] / total if total else 0.0,
+            "throughput_rps": total / uptime if uptime > 0 else 0.0,
+            "uptime_seconds": uptime,
+            "warm_start": dict(self._warm_start),
+            "error": self.error,
+        }
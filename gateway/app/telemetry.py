@@ -0,0 +1,405 @@
+"""
+Batched telemetry writer and indexed reader for the gateway events log (events.jsonl)
+Zdarzenia trafiają do kolejki, a zapis na dysk robi osobny wątek
+
+Every written batch also appends one line to a sidecar index (events.jsonl.idx)
+with the batch byte offset/length, time bounds and the event types and user ids
+it contains, so EventReader can serve tail, time-range and filtered queries by
+seeking straight to the relevant batches instead of reading the whole log.
+
+Configuration (ENV):
+    GATEWAY_EVENTS_QUEUE_SIZE      - max queued events before the drop policy applies (default 10000)
+    GATEWAY_EVENTS_BATCH_SIZE      - max events written per batch (default 256)
+    GATEWAY_EVENTS_FLUSH_INTERVAL  - max seconds an event waits before flush (default 0.5)
+    GATEWAY_EVENTS_DROP_POLICY     - "drop_newest", "drop_oldest" or "block" (default drop_newest);
+                                     "block" waits in emit(), so only for writers not fed from async handlers
+    GATEWAY_EVENTS_MAX_BYTES       - rotate when the active file exceeds this size (default 50 MB, 0 = off)
+    GATEWAY_EVENTS_ROTATE_DAILY    - "1" also rotates when the day changes (default 1)
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DROP_POLICIES = ("drop_newest", "drop_oldest", "block")
+INDEX_SUFFIX = ".idx"
+READ_BLOCK_SIZE = 64 * 1024
+
+def segment_paths(path: Path) -> List[Path]:
+    """Rotated segments of an events log, oldest first (active file excluded)"""
+    return sorted(path.parent.glob(f"{path.stem}.*{path.suffix}"))
+
+def index_path(path: Path) -> Path:
+    """Sidecar offset index for an events log or segment"""
+    return path.with_name(path.name + INDEX_SUFFIX)
+
+def event_time(event: Dict[str, Any]) -> Optional[float]:
+    """Unix time of an event (unix_time field or ISO timestamp)"""
+    unix_time = event.get("unix_time")
+    if isinstance(unix_time, (int, float)):
+        return float(unix_time)
+    timestamp = event.get("timestamp")
+    if isinstance(timestamp, str):
+        try:
+            return datetime.fromisoformat(timestamp).timestamp()
+        except ValueError:
+            return None
+    return None
+
+def parse_time(value: Any) -> Optional[float]:
+    """Accept unix seconds or an ISO-8601 string (query parameters)"""
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return datetime.fromisoformat(str(value)).timestamp()
+
+class EventWriter:
+    """
+    Non-blocking JSONL event sink
+
+    emit() only enqueues the event; a daemon thread serializes queued events,
+    writes them in batches and rotates the file by size and/or day.
+
+    With drop_policy="block" a full queue makes emit() wait up to
+    flush_interval. That stalls an event loop, so gateways calling emit()
+    from async handlers must use one of the drop_* policies.
+    """
+
+    def __init__(self,
+                 path: Path,
+                 queue_size: int = None,
+                 batch_size: int = None,
+                 flush_interval: float = None,
+                 drop_policy: str = None,
+                 max_bytes: int = None,
+                 rotate_daily: bool = None):
+        self.path = Path(path)
+        self.batch_size = batch_size or int(os.getenv("GATEWAY_EVENTS_BATCH_SIZE", 256))
+        self.flush_interval = flush_interval or float(os.getenv("GATEWAY_EVENTS_FLUSH_INTERVAL", 0.5))
+        self.drop_policy = drop_policy or os.getenv("GATEWAY_EVENTS_DROP_POLICY", "drop_newest")
+        if self.drop_policy not in DROP_POLICIES:
+            raise ValueError(f"Unknown drop policy: {self.drop_policy}")
+        self.max_bytes = max_bytes if max_bytes is not None else int(os.getenv("GATEWAY_EVENTS_MAX_BYTES", 50 * 1024 * 1024))
+        if rotate_daily is None:
+            rotate_daily = os.getenv("GATEWAY_EVENTS_ROTATE_DAILY", "1") == "1"
+        self.rotate_daily = rotate_daily
+
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size or int(os.getenv("GATEWAY_EVENTS_QUEUE_SIZE", 10000)))
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._current_day = None
+        self.stats = {
+            "enqueued": 0,
+            "written": 0,
+            "dropped": 0,
+            "batches": 0,
+            "rotations": 0,
+            "write_errors": 0
+        }
+        # Flush whatever is still queued if the app exits without a shutdown hook
+        atexit.register(self.close)
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        """Bump a stats counter (called from producers and the writer thread)"""
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    # --- producer side ---
+
+    def emit(self, event: Dict[str, Any]) -> bool:
+        """Queue an event for writing; returns False if it was dropped"""
+        self.start()
+        try:
+            if self.drop_policy == "block":
+                self._queue.put(event, timeout=self.flush_interval)
+            else:
+                self._queue.put_nowait(event)
+        except queue.Full:
+            if self.drop_policy != "drop_oldest":
+                self._count("dropped")
+                return False
+            try:
+                self._queue.get_nowait()
+                self._count("dropped")
+            except queue.Empty:
+                pass
+            try:
+                self._queue.put_nowait(event)
+            except queue.Full:
+                self._count("dropped")
+                return False
+        self._count("enqueued")
+        return True
+
+    # --- lifecycle ---
+
+    def start(self) -> None:
+        """Start the writer thread (idempotent)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="events-writer", daemon=True)
+            self._thread.start()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush queued events and stop the writer thread"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            # Keep the handle so start() cannot launch a second writer on the same file
+            logger.warning(f"Events writer still flushing after {timeout}s")
+            return
+        self._thread = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Writer counters and current queue depth"""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        return {
+            **stats,
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "drop_policy": self.drop_policy
+        }
+
+    # --- writer thread ---
+
+    def _run(self) -> None:
+        while not (self._stop.is_set() and self._queue.empty()):
+            batch = self._next_batch()
+            if batch:
+                self._write_batch(batch)
+
+    def _next_batch(self) -> List[Dict[str, Any]]:
+        """Wait up to flush_interval for the first event, then drain up to batch_size"""
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        lines = []
+        times = []
+        types = set()
+        users = set()
+        for event in batch:
+            try:
+                lines.append(json.dumps(event, default=str))
+            except Exception as e:
+                self._count("write_errors")
+                logger.error(f"Unserializable event dropped: {e}")
+                continue
+            ts = event_time(event)
+            if ts is not None:
+                times.append(ts)
+            types.add(str(event.get("event_type")))
+            users.add(str(event.get("user_id")))
+        if not lines:
+            return
+
+        data = ("\n".join(lines) + "\n").encode("utf-8")
+        try:
+            self._maybe_rotate()
+            with open(self.path, "ab") as f:
+                offset = f.seek(0, os.SEEK_END)
+                f.write(data)
+            self._count("written", len(lines))
+            self._count("batches")
+        except OSError as e:
+            self._count("write_errors")
+            logger.error(f"Failed to write {len(lines)} events to {self.path}: {e}")
+            return
+
+        # Index entry is appended after the data, so it never points past EOF
+        entry = {
+            "offset": offset,
+            "length": len(data),
+            "count": len(lines),
+            "t0": min(times) if times else None,
+            "t1": max(times) if times else None,
+            "types": sorted(types),
+            "users": sorted(users)
+        }
+        try:
+            with open(index_path(self.path), "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            self._count("write_errors")
+            logger.error(f"Failed to update events index: {e}")
+
+    def _maybe_rotate(self) -> None:
+        today = datetime.now().date()
+        if not self.path.exists():
+            self._current_day = today
+            return
+        if self._current_day is None:
+            self._current_day = datetime.fromtimestamp(self.path.stat().st_mtime).date()
+
+        size_exceeded = self.max_bytes > 0 and self.path.stat().st_size >= self.max_bytes
+        day_changed = self.rotate_daily and today != self._current_day
+        if size_exceeded or day_changed:
+            stamp = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+            target = self.path.with_name(f"{self.path.stem}.{stamp}{self.path.suffix}")
+            self.path.rename(target)
+            if index_path(self.path).exists():
+                index_path(self.path).rename(index_path(target))
+            self._count("rotations")
+            self._current_day = today
+            logger.info(f"🔄 Rotated events log to {target.name}")
+
+class EventReader:
+    """
+    Tail / time-range / filtered queries over events.jsonl and its rotated segments
+
+    Files are walked newest first. Indexed regions are read batch by batch using
+    the sidecar index (skipping batches whose summary cannot match); anything not
+    covered by the index (legacy logs, lost index) is read backwards block by block.
+    Cost is proportional to the batches touched, not to the log size.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def recent(self,
+               limit: int = 50,
+               event_type: str = None,
+               user_id: str = None,
+               since: float = None,
+               until: float = None) -> List[Dict[str, Any]]:
+        """Newest `limit` matching events, returned oldest first"""
+        if limit <= 0:
+            return []
+
+        def matches(event: Dict[str, Any]) -> bool:
+            if event_type is not None and event.get("event_type") != event_type:
+                return False
+            if user_id is not None and event.get("user_id") != user_id:
+                return False
+            if since is not None or until is not None:
+                ts = event_time(event)
+                if ts is None:
+                    return False
+                if since is not None and ts < since:
+                    return False
+                if until is not None and ts > until:
+                    return False
+            return True
+
+        found: List[Dict[str, Any]] = []
+        files = [self.path] if self.path.exists() else []
+        files += list(reversed(segment_paths(self.path)))
+
+        for path in files:
+            try:
+                entries = self._load_index(path)
+                fully_indexed = bool(entries) and entries[-1]["offset"] + entries[-1]["length"] == path.stat().st_size
+                if fully_indexed and since is not None and all(e["t1"] is not None for e in entries):
+                    if max(e["t1"] for e in entries) < since:
+                        break  # this and all older segments end before the range
+                for event in self._iter_reverse(path, entries, event_type, user_id, since, until):
+                    if matches(event):
+                        found.append(event)
+                        if len(found) >= limit:
+                            return list(reversed(found))
+            except FileNotFoundError:
+                continue  # rotated away (or pruned) while reading
+
+        return list(reversed(found))
+
+    def _load_index(self, path: Path) -> List[Dict[str, Any]]:
+        """Index entries consistent with the data file (empty if missing)"""
+        idx = index_path(path)
+        if not idx.exists():
+            return []
+        size = path.stat().st_size
+        entries = []
+        with open(idx, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # torn trailing line
+                if entry["offset"] + entry["length"] > size:
+                    break
+                entries.append(entry)
+        return entries
+
+    def _iter_reverse(self, path, entries, event_type, user_id, since, until):
+        """Yield events of one file, newest first"""
+        indexed_end = entries[-1]["offset"] + entries[-1]["length"] if entries else 0
+
+        with open(path, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+
+            # Unindexed tail (or whole legacy file) - reverse block scan
+            for raw in self._reverse_lines(f, indexed_end, size):
+                try:
+                    yield json.loads(raw)
+                except ValueError:
+                    continue
+
+            for entry in reversed(entries):
+                if event_type is not None and event_type not in entry["types"]:
+                    continue
+                if user_id is not None and str(user_id) not in entry["users"]:
+                    continue
+                if until is not None and entry["t0"] is not None and entry["t0"] > until:
+                    continue
+                if since is not None and entry["t1"] is not None and entry["t1"] < since:
+                    return  # batches are appended in time order
+                f.seek(entry["offset"])
+                chunk = f.read(entry["length"])
+                for raw in reversed(chunk.splitlines()):
+                    try:
+                        yield json.loads(raw)
+                    except ValueError:
+                        continue
+
+            # Legacy lines written before the index existed
+            head_end = entries[0]["offset"] if entries else 0
+            for raw in self._reverse_lines(f, 0, head_end):
+                try:
+                    yield json.loads(raw)
+                except ValueError:
+                    continue
+
+    @staticmethod
+    def _reverse_lines(f, start: int, end: int):
+        """Yield complete lines in [start, end) from last to first"""
+        pos = end
+        remainder = b""
+        while pos > start:
+            read_size = min(READ_BLOCK_SIZE, pos - start)
+            pos -= read_size
+            f.seek(pos)
+            block = f.read(read_size) + remainder
+            lines = block.split(b"\n")
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                if line.strip():
+                    yield line
+        if remainder.strip():
+            yield remainder
@@ -0,0 +1,129 @@
+"""
+Upstream connection pool for the Meta-Genius gateways
+Jeden długo żyjący httpx.AsyncClient na serwis (keep-alive, opcjonalnie HTTP/2)
+
+Configuration (ENV):
+    GATEWAY_POOL_MAX_CONNECTIONS   - max open connections per service (default 100)
+    GATEWAY_POOL_MAX_KEEPALIVE     - max idle keep-alive connections per service (default 20)
+    GATEWAY_POOL_KEEPALIVE_EXPIRY  - idle connection expiry in seconds (default 30)
+    GATEWAY_HTTP2                  - "1" enables HTTP/2 when the h2 package is installed
+    GATEWAY_UPSTREAM_TIMEOUT       - default request timeout in seconds
+    SVC_<NAME>_TIMEOUT             - per-service timeout override, e.g. SVC_GOK_CORE_TIMEOUT
+"""
+
+import importlib.util
+import logging
+import os
+import time
+from typing import Dict, Any, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        logger.warning(f"Invalid value for {name}, using {default}")
+        return default
+
+class ServicePool:
+    """Lifespan-managed httpx clients, one connection pool per upstream service"""
+
+    def __init__(self, services: Dict[str, str], default_timeout: float = 10.0):
+        self.services = services
+        self.default_timeout = _env_float("GATEWAY_UPSTREAM_TIMEOUT", default_timeout)
+        self.limits = httpx.Limits(
+            max_connections=int(_env_float("GATEWAY_POOL_MAX_CONNECTIONS", 100)),
+            max_keepalive_connections=int(_env_float("GATEWAY_POOL_MAX_KEEPALIVE", 20)),
+            keepalive_expiry=_env_float("GATEWAY_POOL_KEEPALIVE_EXPIRY", 30.0),
+        )
+        self.http2 = os.getenv("GATEWAY_HTTP2", "0") == "1"
+        if self.http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("GATEWAY_HTTP2=1 but the 'h2' package is not installed - falling back to HTTP/1.1")
+            self.http2 = False
+
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    def timeout_for(self, service: str) -> float:
+        """Per-service timeout (SVC_<NAME>_TIMEOUT) or the pool default"""
+        return _env_float(f"SVC_{service.upper()}_TIMEOUT", self.default_timeout)
+
+    def _new_stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": 0,
+            "peak_in_flight": 0,
+            "requests_total": 0,
+            "errors_total": 0,
+            "latency_ms_total": 0.0,
+        }
+
+    def client(self, service: str) -> httpx.AsyncClient:
+        """Return the shared client for a service, creating it on first use"""
+        client = self._clients.get(service)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                timeout=self.timeout_for(service),
+                limits=self.limits,
+                http2=self.http2,
+            )
+            self._clients[service] = client
+            self._stats.setdefault(service, self._new_stats())
+        return client
+
+    async def start(self) -> None:
+        """Open clients for all configured services (call on app startup)"""
+        for service in self.services:
+            self.client(service)
+        logger.info(
+            f"🔌 Upstream pool ready: {len(self._clients)} services, "
+            f"max_connections={self.limits.max_connections}, http2={self.http2}"
+        )
+
+    async def close(self) -> None:
+        """Close all pooled connections (call on app shutdown)"""
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+
+    async def request(self, service: str, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request through the service's pooled client"""
+        client = self.client(service)
+        stats = self._stats[service]
+        stats["in_flight"] += 1
+        stats["peak_in_flight"] = max(stats["peak_in_flight"], stats["in_flight"])
+        start = time.perf_counter()
+        try:
+            return await client.request(method.upper(), url, **kwargs)
+        except Exception:
+            stats["errors_total"] += 1
+            raise
+        finally:
+            stats["in_flight"] -= 1
+            stats["requests_total"] += 1
+            stats["latency_ms_total"] += (time.perf_counter() - start) * 1000
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Pool occupancy and request counters per service"""
+        max_conn = self.limits.max_connections or 0
+        services = {}
+        for service, stats in self._stats.items():
+            total = stats["requests_total"]
+            services[service] = {
+                **stats,
+                "occupancy": stats["in_flight"] / max_conn if max_conn else 0.0,
+                "avg_latency_ms": stats["latency_ms_total"] / total if total else 0.0,
+                "timeout": self.timeout_for(service),
+                "open": service in self._clients and not self._clients[service].is_closed,
+            }
+        return {
+            "limits": {
+                "max_connections": self.limits.max_connections,
+                "max_keepalive_connections": self.limits.max_keepalive_connections,
+                "keepalive_expiry": self.limits.keepalive_expiry,
+            },
+            "http2": self.http2,
+            "services": services,
+        }
@@ -6,37 +6,113 @@ Extracts text from PDFs and documents, chunks them, and creates searchable index
 
 import pathlib
 import json
+import fnmatch
 import hashlib
+import multiprocessing
+import os
+import queue
 import re
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator, NamedTuple, Optional, Tuple
 
-def chunk_text(text: str, chunk_size: int = 1200, overlap: int = 200) -> List[str]:
-    """Split text into overlapping chunks"""
-    if len(text) <= chunk_size:
-        return [text]
+from rag_index import BM25Index, DenseIndex, SEARCH_MODES, TOKEN_RE, compact_index, search_records
+
+SENTENCE_END_RE = re.compile(r"[.!?]")
+CHUNK_UNITS = ("chars", "tokens")
+
+def sentence_breaks(text: str) -> List[int]:
+    """Offsets just past every sentence-ending character (.!?), ascending"""
+    return [m.end() for m in SENTENCE_END_RE.finditer(text)]
+
+def _last_break(breaks: List[int], lo: int, hi: int) -> Optional[int]:
+    """Last break b with lo < b <= hi (binary search)"""
+    i = bisect_right(breaks, hi)
+    if i and breaks[i - 1] > lo:
+        return breaks[i - 1]
+    return None
+
+def _strip_span(text: str, start: int, end: int) -> Tuple[int, int]:
+    """Span equivalent of text[start:end].strip()"""
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+def iter_chunk_spans(text: str, chunk_size: int = 1200, overlap: Optional[int] = None,
+                     unit: str = "chars", lookback: Optional[int] = None) -> Iterator[Tuple[int, int]]:
+    """
+    Yield (start, end) offsets of overlapping chunks without copying the text
     
-    chunks = []
-    start = 0
+    Sentence breaks are found once up front and looked up by bisection, so the
+    cost is O(len(text) + chunks * log(breaks)). Sizes are in `unit`s: "chars",
+    or "tokens" (the \\w+ tokens the BM25 index uses). A chunk ends at the last
+    sentence break within `lookback` units of its size limit, if there is one.
+    """
+    if unit not in CHUNK_UNITS:
+        raise ValueError(f"unit must be one of {CHUNK_UNITS}, got {unit!r}")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    if unit == "chars":
+        overlap = 200 if overlap is None else overlap
+        lookback = 200 if lookback is None else lookback
+    else:
+        overlap = chunk_size // 6 if overlap is None else overlap
+        lookback = chunk_size // 6 if lookback is None else lookback
     
-    while start < len(text):
-        end = min(start + chunk_size, len(text))
-        
-        # Try to break at sentence boundary
-        if end < len(text):
-            # Look for sentence endings
-            for i in range(end, max(start + chunk_size - 200, start), -1):
-                if text[i] in '.!?':
-                    end = i + 1
-                    break
-        
-        chunk = text[start:end].strip()
-        if chunk:
-            chunks.append(chunk)
-        
-        start = end - overlap if end < len(text) else end
+    n = len(text)
+    breaks = sentence_breaks(text)
+    
+    if unit == "chars":
+        start = 0
+        while start < n:
+            end = min(start + chunk_size, n)
+            if end < n:
+                # Character at text[end] counts too, as in the original scan
+                lo = max(start + chunk_size - lookback, start) + 1
+                end = _last_break(breaks, lo, end + 1) or end
+            span = _strip_span(text, start, end)
+            if span[0] < span[1]:
+                yield span
+            if end >= n:
+                break
+            start = max(end - overlap, start + 1)
+        return
     
-    return chunks
+    starts, ends = [], []
+    for m in TOKEN_RE.finditer(text):
+        starts.append(m.start())
+        ends.append(m.end())
+    n_tokens = len(starts)
+    
+    t = 0
+    start = 0
+    while True:
+        limit = t + chunk_size
+        if limit >= n_tokens:
+            span = _strip_span(text, start, n)
+            if span[0] < span[1]:
+                yield span
+            break
+        # Break anywhere between the lookback window and the next token
+        lo = starts[max(limit - lookback, t)]
+        end = _last_break(breaks, lo, starts[limit]) or ends[limit - 1]
+        span = _strip_span(text, start, end)
+        if span[0] < span[1]:
+            yield span
+        t = max(bisect_left(starts, end) - overlap, t + 1)
+        start = starts[t]
+
+def chunk_text(text: str, chunk_size: int = 1200, overlap: Optional[int] = None,
+               unit: str = "chars") -> List[str]:
+    """Split text into overlapping chunks"""
+    if unit == "chars" and len(text) <= chunk_size:
+        return [text]
+    return [text[s:e] for s, e in iter_chunk_spans(text, chunk_size, overlap, unit)]
 
 def extract_pdf_text(pdf_path: pathlib.Path) -> str:
     """Extract text from PDF using pypdf"""
@@ -50,7 +126,7 @@ def extract_pdf_text(pdf_path: pathlib.Path) -> str:
             if page_text:
                 text_parts.append(page_text)
         
-        return "\\n".join(text_parts)
+        return "\n".join(text_parts)
     except ImportError:
         print("⚠️ pypdf not installed. Install with: pip install pypdf")
         return ""
@@ -64,7 +140,7 @@ def extract_text_from_file(file_path: pathlib.Path) -> str:
     
     if suffix == '.pdf':
         return extract_pdf_text(file_path)
-    elif suffix in ['.txt', '.md', '.py', '.js', '.ts', '.json', '.yaml', '.yml']:
+    elif suffix in ['.txt', '.md', '.rtf', '.py', '.js', '.ts', '.json', '.yaml', '.yml']:
         try:
             return file_path.read_text(encoding='utf-8', errors='ignore')
         except Exception as e:
@@ -77,20 +153,232 @@ def extract_text_from_file(file_path: pathlib.Path) -> str:
 def clean_text(text: str) -> str:
     """Clean and normalize text"""
     # Remove excessive whitespace
-    text = re.sub(r'\\s+', ' ', text)
+    text = re.sub(r'\s+', ' ', text)
     # Remove special characters but keep basic punctuation
-    text = re.sub(r'[^\\w\\s.,!?;:\\-\\(\\)\\[\\]{}"\']', ' ', text)
+    text = re.sub(r'[^\w\s.,!?;:\-\(\)\[\]{}"\']', ' ', text)
     # Remove excessive spaces
     text = re.sub(r' +', ' ', text)
     return text.strip()
 
+# ============================================================================
+# STREAMING INGESTION PIPELINE
+# discovery -> extract (process pool) -> clean -> chunk -> write (caller)
+# ============================================================================
+
+PIPELINE_STAGES = ["discover", "extract", "clean", "chunk", "write"]
+_END = object()
+_POLL_SECONDS = 0.1  # how often blocked stages re-check the cancel event
+
+class _Cancelled(Exception):
+    """Raised inside a stage thread once the pipeline is cancelled"""
+
+class IngestResult(NamedTuple):
+    """One file after the chunk stage"""
+    seq: int
+    file_path: pathlib.Path
+    raw_chars: int
+    text: str
+    spans: List[Tuple[int, int]]
+    
+    @property
+    def clean_chars(self) -> int:
+        return len(self.text)
+    
+    def chunks(self) -> Iterator[str]:
+        """Chunk strings, sliced on demand"""
+        return (self.text[s:e] for s, e in self.spans)
+
+def _timed_extract(file_path: pathlib.Path):
+    """Process-pool worker: extract text and report the wall time spent"""
+    start = time.perf_counter()
+    text = extract_text_from_file(file_path)
+    return text, time.perf_counter() - start
+
+class IngestPipeline:
+    """
+    Bounded-queue ingestion pipeline
+    
+    Each stage runs in its own thread; extraction fans out to a
+    ProcessPoolExecutor (pypdf is CPU-bound). Results come back in input
+    order (ordered=True) or as soon as they are ready.
+    
+    A failing stage, or a caller that stops iterating run() early, sets a
+    shared cancel event; every blocking put/get polls it, so all stage
+    threads and the process pool shut down instead of hanging on a full queue.
+    """
+    
+    def __init__(self, chunk_size: int = 1200, workers: Optional[int] = None,
+                 ordered: bool = True, queue_size: int = 32, min_text_length: int = 50,
+                 chunk_unit: str = "chars"):
+        self.chunk_size = chunk_size
+        self.chunk_unit = chunk_unit
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.ordered = ordered
+        self.queue_size = queue_size
+        self.min_text_length = min_text_length
+        self.stats = {stage: {"items": 0, "seconds": 0.0, "chars": 0} for stage in PIPELINE_STAGES}
+        self._error: Optional[BaseException] = None
+        self._cancel = threading.Event()
+    
+    def _record(self, stage: str, seconds: float, chars: int = 0) -> None:
+        self.stats[stage]["items"] += 1
+        self.stats[stage]["seconds"] += seconds
+        self.stats[stage]["chars"] += chars
+    
+    def record_write(self, seconds: float, chars: int) -> None:
+        """Counters for the write stage (runs in the caller)"""
+        self._record("write", seconds, chars)
+    
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-stage items, busy seconds and throughput"""
+        return {
+            stage: {
+                **counters,
+                "items_per_sec": counters["items"] / counters["seconds"] if counters["seconds"] else 0.0
+            }
+            for stage, counters in self.stats.items()
+        }
+    
+    def _stage(self, target, *args) -> threading.Thread:
+        def guarded():
+            try:
+                target(*args)
+            except _Cancelled:
+                pass
+            except BaseException as e:  # surface in run(), stop every other stage
+                self._error = e
+                self._cancel.set()
+        thread = threading.Thread(target=guarded, daemon=True)
+        thread.start()
+        return thread
+    
+    def _put(self, q: queue.Queue, item) -> None:
+        while True:
+            if self._cancel.is_set():
+                raise _Cancelled()
+            try:
+                return q.put(item, timeout=_POLL_SECONDS)
+            except queue.Full:
+                pass
+    
+    def _get(self, q: queue.Queue):
+        while True:
+            if self._cancel.is_set():
+                raise _Cancelled()
+            try:
+                return q.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                pass
+    
+    def _items(self, q: queue.Queue) -> Iterator:
+        """Items of q up to _END"""
+        return iter(lambda: self._get(q), _END)
+    
+    def _discover(self, files: Iterable[pathlib.Path], out_q: queue.Queue) -> None:
+        start = time.perf_counter()
+        for seq, file_path in enumerate(files):
+            self._put(out_q, (seq, file_path))
+            self._record("discover", time.perf_counter() - start)
+            start = time.perf_counter()
+        self._put(out_q, _END)
+    
+    def _extract(self, in_q: queue.Queue, out_q: queue.Queue) -> None:
+        if self.workers <= 1:
+            for seq, file_path in self._items(in_q):
+                text, elapsed = _timed_extract(file_path)
+                self._record("extract", elapsed, len(text))
+                self._put(out_q, (seq, file_path, text))
+            self._put(out_q, _END)
+            return
+        
+        max_in_flight = self.workers * 2
+        # spawn: this thread forks while the other stages run, a forked child could inherit a held lock
+        pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+        try:
+            pending = {}
+            
+            def forward():
+                done, _ = wait(pending, timeout=_POLL_SECONDS, return_when=FIRST_COMPLETED)
+                if self._cancel.is_set():
+                    raise _Cancelled()
+                for future in done:
+                    seq, file_path = pending.pop(future)
+                    text, elapsed = future.result()
+                    self._record("extract", elapsed, len(text))
+                    self._put(out_q, (seq, file_path, text))
+            
+            for seq, file_path in self._items(in_q):
+                while len(pending) >= max_in_flight:
+                    forward()
+                pending[pool.submit(_timed_extract, file_path)] = (seq, file_path)
+            while pending:
+                forward()
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+        self._put(out_q, _END)
+    
+    def _clean(self, in_q: queue.Queue, out_q: queue.Queue) -> None:
+        for seq, file_path, text in self._items(in_q):
+            start = time.perf_counter()
+            cleaned = clean_text(text) if text else ""
+            self._record("clean", time.perf_counter() - start, len(cleaned))
+            self._put(out_q, (seq, file_path, len(text), cleaned))
+        self._put(out_q, _END)
+    
+    def _chunk(self, in_q: queue.Queue, out_q: queue.Queue) -> None:
+        for seq, file_path, raw_chars, cleaned in self._items(in_q):
+            start = time.perf_counter()
+            spans = []
+            if len(cleaned) >= self.min_text_length:
+                spans = list(iter_chunk_spans(cleaned, self.chunk_size, unit=self.chunk_unit))
+            self._record("chunk", time.perf_counter() - start, sum(e - s for s, e in spans))
+            self._put(out_q, IngestResult(seq, file_path, raw_chars, cleaned, spans))
+        self._put(out_q, _END)
+    
+    def run(self, files: Iterable[pathlib.Path]) -> Iterator[IngestResult]:
+        """Stream files through the pipeline, yielding one IngestResult per file"""
+        self._error = None
+        self._cancel = threading.Event()
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(4)]
+        threads = [
+            self._stage(self._discover, files, queues[0]),
+            self._stage(self._extract, queues[0], queues[1]),
+            self._stage(self._clean, queues[1], queues[2]),
+            self._stage(self._chunk, queues[2], queues[3]),
+        ]
+        
+        try:
+            buffered: Dict[int, IngestResult] = {}
+            next_seq = 0
+            try:
+                for result in self._items(queues[3]):
+                    if not self.ordered:
+                        yield result
+                        continue
+                    buffered[result.seq] = result
+                    while next_seq in buffered:
+                        yield buffered.pop(next_seq)
+                        next_seq += 1
+            except _Cancelled:
+                pass
+            if self._error is not None:
+                raise self._error
+            for seq in sorted(buffered):
+                yield buffered[seq]
+        finally:
+            # Early exit or failure: stop the stages (and the process pool) instead of leaving them blocked
+            self._cancel.set()
+            for thread in threads:
+                thread.join()
+
 def create_document_record(file_path: pathlib.Path, chunk_text: str, chunk_index: int) -> Dict[str, Any]:
     """Create a document record for the index"""
-    # Create unique ID
-    content_hash = hashlib.sha256(f"{file_path.name}:{chunk_index}:{chunk_text[:100]}".encode()).hexdigest()[:16]
+    # Unique per (full source path, chunk index): the incremental index keeps the
+    # latest record per id and tombstones by id, so same-named files must not collide
+    chunk_id = hashlib.sha256(f"{file_path}:{chunk_index}".encode()).hexdigest()[:16]
     
     return {
-        "id": content_hash,
+        "id": chunk_id,
         "source_file": file_path.name,
         "source_path": str(file_path),
         "chunk_index": chunk_index,
@@ -101,10 +389,47 @@ def create_document_record(file_path: pathlib.Path, chunk_text: str, chunk_index
         "file_modified": datetime.fromtimestamp(file_path.stat().st_mtime).isoformat() if file_path.exists() else None
     }
 
+def file_sha256(file_path: pathlib.Path) -> str:
+    """SHA-256 of file contents (streamed)"""
+    digest = hashlib.sha256()
+    with file_path.open('rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def manifest_path(output_file: pathlib.Path) -> pathlib.Path:
+    """Ingestion manifest stored next to the index"""
+    return output_file.with_suffix('.manifest.json')
+
+def load_manifest(output_file: pathlib.Path) -> Dict[str, Any]:
+    """Load manifest: path -> (mtime, size, sha256, chunk_ids) plus record counters"""
+    path = manifest_path(output_file)
+    if path.exists():
+        with path.open('r', encoding='utf-8') as f:
+            return json.load(f)
+    return {"files": {}, "records_written": 0}
+
 def process_directory(input_dir: pathlib.Path, output_file: pathlib.Path, 
                      file_patterns: List[str] = ["*.pdf", "*.txt", "*.md", "*.py"],
-                     chunk_size: int = 1200) -> Dict[str, Any]:
-    """Process all files in directory and create RAG index"""
+                     chunk_size: int = 1200,
+                     incremental: bool = False,
+                     compact_ratio: float = 0.3,
+                     workers: Optional[int] = None,
+                     ordered: bool = True,
+                     chunk_unit: str = "chars",
+                     dense: bool = True) -> Dict[str, Any]:
+    """
+    Process all files in directory and create RAG index
+    
+    With incremental=True only new or changed files (by mtime/size, then sha256)
+    are re-extracted; their old chunks and chunks of deleted files are tombstoned
+    and new records appended. The index is compacted once more than
+    `compact_ratio` of its records are dead.
+    
+    Extraction runs through IngestPipeline with `workers` processes
+    (default: CPU count); ordered=False writes files as soon as they finish.
+    dense=True also embeds every chunk for dense/hybrid search.
+    """
     
     print(f"🔍 Processing directory: {input_dir}")
     print(f"📁 Output file: {output_file}")
@@ -112,52 +437,130 @@ def process_directory(input_dir: pathlib.Path, output_file: pathlib.Path,
     # Ensure output directory exists
     output_file.parent.mkdir(parents=True, exist_ok=True)
     
-    # Find all matching files
-    all_files = []
-    for pattern in file_patterns:
-        all_files.extend(input_dir.glob(f"**/{pattern}"))
+    # Find all matching files (suffixes case-insensitive: REPORT.PDF counts; overlapping patterns once)
+    patterns = [pattern.lower() for pattern in file_patterns]
+    all_files = sorted(p for p in input_dir.rglob("*")
+                       if p.is_file() and any(fnmatch.fnmatchcase(p.name.lower(), pattern) for pattern in patterns))
     
     print(f"📄 Found {len(all_files)} files to process")
     
+    # Without a manifest (e.g. an index from the old ingest script) nothing can be tombstoned - rebuild
+    if incremental and output_file.exists() and not manifest_path(output_file).exists():
+        print("⚠️ No manifest next to the index - rebuilding it from scratch")
+    incremental = incremental and output_file.exists() and manifest_path(output_file).exists()
+    manifest = load_manifest(output_file) if incremental else {"files": {}, "records_written": 0}
+    files_manifest = manifest["files"]
+    
     # Process files
     processed_count = 0
+    unchanged_count = 0
     total_chunks = 0
+    tombstoned = 0
+    seen = set()
     
-    with output_file.open('w', encoding='utf-8') as f:
+    with output_file.open('a' if incremental else 'w', encoding='utf-8') as f:
+        
+        def tombstone(chunk_ids: List[str]) -> int:
+            deleted_at = datetime.now().isoformat()
+            for chunk_id in chunk_ids:
+                f.write(json.dumps({"id": chunk_id, "deleted": True, "deleted_at": deleted_at}) + "\n")
+            manifest["records_written"] += len(chunk_ids)
+            return len(chunk_ids)
+        
+        # Change detection up front, on this thread (the manifest is only touched here):
+        # skip unchanged files by mtime/size first, then by content hash
+        pending = {}
+        changed_files = []
         for file_path in all_files:
+            key = str(file_path)
+            seen.add(key)
+            stat = file_path.stat()
+            entry = files_manifest.get(key)
+            if entry and entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+                unchanged_count += 1
+                continue
+            digest = file_sha256(file_path)
+            if entry and entry["sha256"] == digest:
+                entry.update(mtime=stat.st_mtime, size=stat.st_size)
+                unchanged_count += 1
+                continue
+            pending[key] = (stat, digest)
+            changed_files.append(file_path)
+        
+        pipeline = IngestPipeline(chunk_size=chunk_size, workers=workers, ordered=ordered,
+                                  chunk_unit=chunk_unit)
+        for result in pipeline.run(changed_files):
+            write_start = time.perf_counter()
+            file_path = result.file_path
+            key = str(file_path)
+            stat, digest = pending.pop(key)
+            
             print(f"📖 Processing: {file_path.name}")
+            if key in files_manifest:
+                tombstoned += tombstone(files_manifest[key]["chunk_ids"])
+            files_manifest[key] = {
+                "mtime": stat.st_mtime,
+                "size": stat.st_size,
+                "sha256": digest,
+                "chunk_ids": []
+            }
             
-            # Extract text
-            raw_text = extract_text_from_file(file_path)
-            if not raw_text:
+            if not result.raw_chars:
                 print(f"⚠️ No text extracted from {file_path.name}")
                 continue
-            
-            # Clean text
-            clean_text_content = clean_text(raw_text)
-            if len(clean_text_content) < 50:  # Skip very short texts
+            if not result.spans:  # Skip very short texts
                 print(f"⚠️ Text too short in {file_path.name}")
                 continue
-            
-            # Create chunks
-            chunks = chunk_text(clean_text_content, chunk_size)
-            print(f"  📝 Created {len(chunks)} chunks")
+            print(f"  📝 Created {len(result.spans)} chunks")
             
             # Create records
-            for i, chunk in enumerate(chunks):
+            for i, chunk in enumerate(result.chunks()):
                 record = create_document_record(file_path, chunk, i)
-                f.write(json.dumps(record, ensure_ascii=False) + "\\n")
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                files_manifest[key]["chunk_ids"].append(record["id"])
                 total_chunks += 1
+            manifest["records_written"] += len(result.spans)
+            pipeline.record_write(time.perf_counter() - write_start, result.clean_chars)
             
             processed_count += 1
+        
+        # Files that disappeared since the last run
+        for key in [k for k in files_manifest if k not in seen]:
+            print(f"🗑️ Removed: {key}")
+            tombstoned += tombstone(files_manifest.pop(key)["chunk_ids"])
+    
+    # Compact when dead records dominate
+    live_chunks = sum(len(e["chunk_ids"]) for e in files_manifest.values())
+    written = manifest["records_written"]
+    compacted = False
+    if incremental and written and (written - live_chunks) / written > compact_ratio:
+        manifest["records_written"] = compact_index(output_file)
+        compacted = True
+        print(f"🧹 Index compacted: {written} -> {manifest['records_written']} records")
+    
+    # Build the BM25 inverted index used by search
+    bm25 = BM25Index.build(output_file)
+    dense_index = DenseIndex.build(output_file) if dense else None
+    
+    with manifest_path(output_file).open('w', encoding='utf-8') as mf:
+        json.dump(manifest, mf, ensure_ascii=False)
     
     # Create summary
     summary = {
         "processed_files": processed_count,
+        "unchanged_files": unchanged_count,
         "total_chunks": total_chunks,
+        "live_chunks": live_chunks,
+        "tombstoned_chunks": tombstoned,
+        "compacted": compacted,
+        "incremental": incremental,
+        "vocabulary_size": len(bm25.vocab),
+        "dense_dim": dense_index.meta["dim"] if dense_index else None,
+        "pipeline_stats": pipeline.get_stats(),
         "input_directory": str(input_dir),
         "output_file": str(output_file),
         "chunk_size": chunk_size,
+        "chunk_unit": chunk_unit,
         "created_at": datetime.now().isoformat(),
         "file_patterns": file_patterns
     }
@@ -169,37 +572,22 @@ def process_directory(input_dir: pathlib.Path, output_file: pathlib.Path,
     
     print(f"✅ Processing complete!")
     print(f"📊 Files processed: {processed_count}")
+    if incremental:
+        print(f"📊 Files unchanged: {unchanged_count}")
+        print(f"📊 Chunks tombstoned: {tombstoned}")
     print(f"📊 Total chunks: {total_chunks}")
     print(f"📊 Summary saved to: {summary_file}")
     
     return summary
 
-def search_index(index_file: pathlib.Path, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
-    """Simple text search in the index (for testing)"""
+def search_index(index_file: pathlib.Path, query: str, top_k: int = 5,
+                 mode: str = "lexical") -> List[Dict[str, Any]]:
+    """BM25, dense or hybrid search in the index (built on first use if missing)"""
     if not index_file.exists():
         print(f"❌ Index file not found: {index_file}")
         return []
     
-    query_lower = query.lower()
-    results = []
-    
-    with index_file.open('r', encoding='utf-8') as f:
-        for line in f:
-            try:
-                record = json.loads(line.strip())
-                text_lower = record["text"].lower()
-                
-                # Simple scoring based on term frequency
-                score = text_lower.count(query_lower)
-                if score > 0:
-                    record["relevance_score"] = score
-                    results.append(record)
-            except Exception:
-                continue
-    
-    # Sort by relevance and return top k
-    results.sort(key=lambda x: x["relevance_score"], reverse=True)
-    return results[:top_k]
+    return search_records(index_file, query, top_k, mode)
 
 def main():
     """Main CLI interface"""
@@ -208,9 +596,15 @@ def main():
     parser = argparse.ArgumentParser(description="Process documents for RAG")
     parser.add_argument("input_dir", help="Input directory containing documents")
     parser.add_argument("--output", "-o", default="data/rag_index.jsonl", help="Output index file")
-    parser.add_argument("--chunk-size", type=int, default=1200, help="Chunk size in characters")
+    parser.add_argument("--chunk-size", type=int, default=1200, help="Chunk size (in --chunk-unit)")
+    parser.add_argument("--chunk-unit", choices=CHUNK_UNITS, default="chars", help="Measure chunks in chars or tokens")
     parser.add_argument("--search", "-s", help="Search query to test the index")
     parser.add_argument("--top-k", type=int, default=5, help="Number of results to return")
+    parser.add_argument("--mode", choices=SEARCH_MODES, default="lexical", help="Search mode")
+    parser.add_argument("--no-dense", action="store_true", help="Skip building dense vectors")
+    parser.add_argument("--incremental", "-i", action="store_true", help="Only re-process new/changed files")
+    parser.add_argument("--workers", "-w", type=int, default=None, help="Extraction processes (default: CPU count)")
+    parser.add_argument("--unordered", action="store_true", help="Write files in completion order")
     
     args = parser.parse_args()
     
@@ -223,19 +617,22 @@ def main():
     
     if args.search:
         # Search mode
-        results = search_index(output_file, args.search, args.top_k)
+        results = search_index(output_file, args.search, args.top_k, args.mode)
         print(f"🔍 Search results for: '{args.search}'")
-        print(f"📊 Found {len(results)} results\\n")
+        print(f"📊 Found {len(results)} results\n")
         
         for i, result in enumerate(results, 1):
             print(f"{i}. {result['source_file']} (chunk {result['chunk_index']})")
-            print(f"   Score: {result['relevance_score']}")
+            print(f"   Score: {result['relevance_score']:.3f}")
             print(f"   Text: {result['text'][:200]}...")
             print()
     else:
         # Process mode
-        summary = process_directory(input_dir, output_file, chunk_size=args.chunk_size)
-        print(f"\\n🎉 Index created successfully!")
+        summary = process_directory(input_dir, output_file, chunk_size=args.chunk_size,
+                                    incremental=args.incremental, workers=args.workers,
+                                    ordered=not args.unordered, chunk_unit=args.chunk_unit,
+                                    dense=not args.no_dense)
+        print(f"\n🎉 Index created successfully!")
         print(f"Test search with: python {__file__} {input_dir} --search 'your query'")
 
 if __name__ == "__main__":
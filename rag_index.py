@@ -0,0 +1,547 @@
+#!/usr/bin/env python3
+"""
+RAG Search Index - persistent BM25 inverted index over rag_index.jsonl
+Tokenized postings + doc lengths stored as .npy arrays (memory-mapped on load)
+
+Layout (next to the JSONL index, e.g. data/rag_index.bm25/):
+    meta.json         - N, avgdl, k1/b, vocabulary {term: [postings_start, df]}, source stamp
+    post_docs.npy     - int32 doc numbers, grouped by term
+    post_tf.npy       - int32 term frequencies (parallel to post_docs)
+    doc_len.npy       - int32 token count per document
+    doc_offset.npy    - int64 byte offset of each record in the JSONL file
+
+Dense vectors (optional semantic mode, e.g. data/rag_index.dense/):
+    meta.json         - embedder config, N, source stamp
+    vectors.npy       - float32 [N, dim] L2-normalized embeddings (memory-mapped)
+    idf.npy           - float32 idf per hashed feature
+    doc_offset.npy    - int64 byte offset of each record in the JSONL file
+"""
+
+import json
+import math
+import os
+import pathlib
+import re
+import tempfile
+import threading
+import zlib
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import List, Dict, Any, Tuple, Optional, Iterator
+
+import numpy as np
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+INDEX_VERSION = 1
+DENSE_VERSION = 1
+SEARCH_MODES = ("lexical", "dense", "hybrid")
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case word tokens (unicode aware, so Polish diacritics survive)"""
+    return TOKEN_RE.findall(text.lower())
+
+def index_dir(index_file: pathlib.Path) -> pathlib.Path:
+    """Directory holding the BM25 arrays for a JSONL index"""
+    return index_file.with_suffix(".bm25")
+
+def dense_dir(index_file: pathlib.Path) -> pathlib.Path:
+    """Directory holding the dense vectors for a JSONL index"""
+    return index_file.with_suffix(".dense")
+
+def _source_stamp(index_file: pathlib.Path) -> Dict[str, int]:
+    stat = index_file.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+def iter_live_records(index_file: pathlib.Path) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Yield (byte_offset, record) for live records, in file order
+
+    The JSONL index is log-structured: a later record with the same id replaces
+    an earlier one, and {"id": ..., "deleted": true} tombstones remove it.
+    """
+    latest: Dict[str, int] = {}
+    with index_file.open("rb") as f:
+        offset = 0
+        for raw in f:
+            try:
+                record = json.loads(raw)
+                latest[record["id"]] = -1 if record.get("deleted") else offset
+            except (ValueError, KeyError):
+                pass
+            offset += len(raw)
+
+    live_offsets = {o for o in latest.values() if o >= 0}
+    with index_file.open("rb") as f:
+        offset = 0
+        for raw in f:
+            if offset in live_offsets:
+                yield offset, json.loads(raw)
+            offset += len(raw)
+
+def _temp_path(directory: pathlib.Path, prefix: str, suffix: str) -> pathlib.Path:
+    """Fresh temp file in directory (unique per build, so concurrent builds never share one)"""
+    fd, name = tempfile.mkstemp(prefix=prefix, suffix=suffix, dir=directory)
+    os.close(fd)
+    os.chmod(name, 0o644)  # mkstemp creates 0600; the index files are shared like before
+    return pathlib.Path(name)
+
+def compact_index(index_file: pathlib.Path) -> int:
+    """Rewrite the JSONL index with live records only; returns records kept"""
+    tmp = _temp_path(index_file.parent, f".{index_file.stem}.", ".compact.tmp")
+    kept = 0
+    with tmp.open("w", encoding="utf-8") as out:
+        for _, record in iter_live_records(index_file):
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            kept += 1
+    os.replace(tmp, index_file)
+    return kept
+
+def _save_array(directory: pathlib.Path, name: str, array: np.ndarray) -> None:
+    tmp = _temp_path(directory, f".{name}.", ".tmp.npy")
+    np.save(tmp, array)
+    os.replace(tmp, directory / f"{name}.npy")
+
+def _save_meta(directory: pathlib.Path, meta: Dict[str, Any]) -> None:
+    tmp_meta = _temp_path(directory, ".meta.", ".tmp.json")
+    with tmp_meta.open("w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(tmp_meta, directory / "meta.json")  # written last: marks the index complete
+
+def _load_meta(directory: pathlib.Path, index_file: pathlib.Path, version: int) -> Optional[Dict[str, Any]]:
+    """meta.json if present and built from the current JSONL file"""
+    meta_file = directory / "meta.json"
+    if not meta_file.exists() or not index_file.exists():
+        return None
+    with meta_file.open("r", encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("version") != version or meta.get("source") != _source_stamp(index_file):
+        return None
+    return meta
+
+def _top_k(scores: np.ndarray, top_k: int) -> np.ndarray:
+    """Indices of the top_k scores, best first, without sorting every candidate"""
+    if len(scores) > top_k:
+        top = np.argpartition(-scores, top_k - 1)[:top_k]
+    else:
+        top = np.arange(len(scores))
+    return top[np.argsort(-scores[top], kind="stable")]
+
+def _merge_top_k(docs: np.ndarray, scores: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Row-wise top_k of [Q, n] candidates (unordered)"""
+    if scores.shape[1] <= top_k:
+        return docs, scores
+    keep = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+    return np.take_along_axis(docs, keep, axis=1), np.take_along_axis(scores, keep, axis=1)
+
+class _RecordIndex(ABC):
+    """Shared record lookup for indexes whose doc numbers follow iter_live_records()"""
+
+    def __init__(self, index_file: pathlib.Path, meta: Dict[str, Any], doc_offset: np.ndarray):
+        self.index_file = index_file
+        self.meta = meta
+        self.n_docs: int = meta["n_docs"]
+        self.doc_offset = doc_offset
+
+    def is_stale(self) -> bool:
+        """True if the JSONL file changed since this index was built"""
+        return not self.index_file.exists() or self.meta["source"] != _source_stamp(self.index_file)
+
+    @abstractmethod
+    def search(self, query: str, top_k: int = 5) -> List[Tuple[int, float]]:
+        """[(doc_num, score)] best first"""
+
+    def get_record(self, doc_num: int) -> Dict[str, Any]:
+        """Read a single record from the JSONL file by its stored offset"""
+        with self.index_file.open("rb") as f:
+            f.seek(int(self.doc_offset[doc_num]))
+            return json.loads(f.readline())
+
+    def search_records(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
+        """search() + record lookup; each record gets a `relevance_score`"""
+        results = []
+        for doc_num, score in self.search(query, top_k):
+            record = self.get_record(doc_num)
+            record["relevance_score"] = score
+            results.append(record)
+        return results
+
+class BM25Index(_RecordIndex):
+    """Okapi BM25 ranking over a memory-mapped inverted index"""
+
+    def __init__(self, index_file: pathlib.Path, meta: Dict[str, Any], arrays: Dict[str, np.ndarray]):
+        super().__init__(index_file, meta, arrays["doc_offset"])
+        self.vocab: Dict[str, List[int]] = meta["vocab"]
+        self.avgdl: float = meta["avgdl"] or 1.0
+        self.k1: float = meta["k1"]
+        self.b: float = meta["b"]
+        self.post_docs = arrays["post_docs"]
+        self.post_tf = arrays["post_tf"]
+        self.doc_len = arrays["doc_len"]
+
+    # --- build / load ---
+
+    @classmethod
+    def build(cls, index_file: pathlib.Path, k1: float = 1.5, b: float = 0.75) -> "BM25Index":
+        """Tokenize every live record of the JSONL index and persist the postings"""
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        doc_len: List[int] = []
+        doc_offset: List[int] = []
+
+        for line_offset, record in iter_live_records(index_file):
+            doc_num = len(doc_len)
+            counts = Counter(tokenize(record.get("text", "")))
+            for term, tf in counts.items():
+                postings.setdefault(term, []).append((doc_num, tf))
+            doc_len.append(sum(counts.values()))
+            doc_offset.append(line_offset)
+
+        vocab = {}
+        docs_parts, tf_parts = [], []
+        start = 0
+        for term in sorted(postings):
+            plist = postings[term]
+            vocab[term] = [start, len(plist)]
+            docs_parts.extend(d for d, _ in plist)
+            tf_parts.extend(t for _, t in plist)
+            start += len(plist)
+
+        arrays = {
+            "post_docs": np.asarray(docs_parts, dtype=np.int32),
+            "post_tf": np.asarray(tf_parts, dtype=np.int32),
+            "doc_len": np.asarray(doc_len, dtype=np.int32),
+            "doc_offset": np.asarray(doc_offset, dtype=np.int64),
+        }
+        meta = {
+            "version": INDEX_VERSION,
+            "n_docs": len(doc_len),
+            "avgdl": (sum(doc_len) / len(doc_len)) if doc_len else 0.0,
+            "k1": k1,
+            "b": b,
+            "source": _source_stamp(index_file),
+            "vocab": vocab,
+        }
+
+        directory = index_dir(index_file)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name, array in arrays.items():
+            _save_array(directory, name, array)
+        _save_meta(directory, meta)
+
+        return cls(index_file, meta, arrays)
+
+    @classmethod
+    def open(cls, index_file: pathlib.Path) -> Optional["BM25Index"]:
+        """Load a persisted index (arrays memory-mapped); None if missing or stale"""
+        directory = index_dir(index_file)
+        meta = _load_meta(directory, index_file, INDEX_VERSION)
+        if meta is None:
+            return None
+        arrays = {
+            name: np.load(directory / f"{name}.npy", mmap_mode="r")
+            for name in ("post_docs", "post_tf", "doc_len", "doc_offset")
+        }
+        return cls(index_file, meta, arrays)
+
+    # --- query ---
+
+    def idf(self, df: int) -> float:
+        return math.log(1.0 + (self.n_docs - df + 0.5) / (df + 0.5))
+
+    def search(self, query: str, top_k: int = 5) -> List[Tuple[int, float]]:
+        """Return [(doc_num, score)] best first; cost ~ postings of the query terms"""
+        if top_k <= 0:
+            return []
+        doc_parts, score_parts = [], []
+        for term in set(tokenize(query)):
+            entry = self.vocab.get(term)
+            if entry is None:
+                continue
+            start, df = entry
+            docs = self.post_docs[start:start + df]
+            tf = self.post_tf[start:start + df].astype(np.float32)
+            norm = self.k1 * (1.0 - self.b + self.b * self.doc_len[docs] / self.avgdl)
+            doc_parts.append(docs)
+            score_parts.append(self.idf(df) * tf * (self.k1 + 1.0) / (tf + norm))
+
+        if not doc_parts:
+            return []
+
+        docs = np.concatenate(doc_parts)
+        scores = np.concatenate(score_parts)
+        if len(doc_parts) > 1:
+            docs, inverse = np.unique(docs, return_inverse=True)
+            scores = np.bincount(inverse, weights=scores)
+
+        top = _top_k(scores, top_k)
+        return [(int(docs[i]), float(scores[i])) for i in top]
+
+class HashingEmbedder:
+    """
+    CPU-only text embedder: hashed TF-IDF features -> sparse random projection
+
+    Each token is hashed (crc32) into `n_features` buckets, weighted by
+    log(1 + tf) * idf, and every feature is added with a random sign into
+    `nnz` of the `dim` output dimensions. Any object with `dim`, `config()`,
+    `fit(token_lists)` and `embed(texts)` can be used instead.
+    """
+
+    def __init__(self, dim: int = 256, n_features: int = 1 << 18, nnz: int = 4,
+                 seed: int = 614, idf: Optional[np.ndarray] = None):
+        self.dim = dim
+        self.n_features = n_features
+        self.nnz = nnz
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        self._buckets = rng.integers(0, dim, size=(n_features, nnz), dtype=np.int32)
+        self._signs = rng.choice(np.array([-1.0, 1.0], dtype=np.float32), size=(n_features, nnz))
+        self.idf = idf if idf is not None else np.ones(n_features, dtype=np.float32)
+        self._feature_cache: Dict[str, int] = {}
+
+    def config(self) -> Dict[str, Any]:
+        return {"type": "hashing", "dim": self.dim, "n_features": self.n_features,
+                "nnz": self.nnz, "seed": self.seed}
+
+    def feature(self, token: str) -> int:
+        fid = self._feature_cache.get(token)
+        if fid is None:
+            fid = zlib.crc32(token.encode("utf-8")) % self.n_features
+            if len(self._feature_cache) < 1_000_000:
+                self._feature_cache[token] = fid
+        return fid
+
+    def fit(self, token_lists: Iterator[List[str]]) -> None:
+        """Learn smoothed idf weights from the corpus"""
+        df = np.zeros(self.n_features, dtype=np.int64)
+        n = 0
+        for tokens in token_lists:
+            df[np.unique(np.fromiter((self.feature(t) for t in tokens), dtype=np.int64))] += 1
+            n += 1
+        self.idf = (np.log((1.0 + n) / (1.0 + df)) + 1.0).astype(np.float32)
+
+    def embed_tokens(self, token_lists: List[List[str]]) -> np.ndarray:
+        """[len(token_lists), dim] float32, L2-normalized (all-zero rows stay zero)"""
+        rows, feats, weights = [], [], []
+        for row, tokens in enumerate(token_lists):
+            counts = Counter(self.feature(t) for t in tokens)
+            rows.extend([row] * len(counts))
+            feats.extend(counts.keys())
+            weights.extend(counts.values())
+        n = len(token_lists)
+        if not feats:
+            return np.zeros((n, self.dim), dtype=np.float32)
+
+        rows = np.asarray(rows, dtype=np.int64)
+        feats = np.asarray(feats, dtype=np.int64)
+        w = np.log1p(np.asarray(weights, dtype=np.float32)) * self.idf[feats]
+
+        # Scatter every (row, feature) into nnz signed output dimensions at once
+        cells = (rows[:, None] * self.dim + self._buckets[feats]).ravel()
+        values = (self._signs[feats] * w[:, None]).ravel()
+        out = np.bincount(cells, weights=values, minlength=n * self.dim)
+        out = out.reshape(n, self.dim).astype(np.float32)
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        return out / np.where(norms > 0, norms, 1.0)
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return self.embed_tokens([tokenize(t) for t in texts])
+
+class DenseIndex(_RecordIndex):
+    """Cosine similarity over a memory-mapped float32 embedding matrix"""
+
+    def __init__(self, index_file: pathlib.Path, meta: Dict[str, Any], vectors: np.ndarray,
+                 doc_offset: np.ndarray, embedder):
+        super().__init__(index_file, meta, doc_offset)
+        self.vectors = vectors
+        self.embedder = embedder
+
+    @classmethod
+    def build(cls, index_file: pathlib.Path, embedder=None, batch_size: int = 512) -> "DenseIndex":
+        """Embed every live record of the JSONL index and persist the matrix"""
+        embedder = embedder or HashingEmbedder()
+        doc_offset = []
+        token_lists = []
+        for line_offset, record in iter_live_records(index_file):
+            doc_offset.append(line_offset)
+            token_lists.append(tokenize(record.get("text", "")))
+        if hasattr(embedder, "fit"):
+            embedder.fit(iter(token_lists))
+
+        directory = dense_dir(index_file)
+        directory.mkdir(parents=True, exist_ok=True)
+        tmp = _temp_path(directory, ".vectors.", ".tmp.npy")
+        vectors = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.float32,
+                                            shape=(len(token_lists), embedder.dim))
+        for start in range(0, len(token_lists), batch_size):
+            vectors[start:start + batch_size] = embedder.embed_tokens(token_lists[start:start + batch_size])
+        vectors.flush()
+        del vectors
+        os.replace(tmp, directory / "vectors.npy")
+        _save_array(directory, "doc_offset", np.asarray(doc_offset, dtype=np.int64))
+        if getattr(embedder, "idf", None) is not None:
+            _save_array(directory, "idf", np.asarray(embedder.idf, dtype=np.float32))
+
+        meta = {
+            "version": DENSE_VERSION,
+            "n_docs": len(doc_offset),
+            "dim": embedder.dim,
+            "embedder": embedder.config(),
+            "source": _source_stamp(index_file),
+        }
+        _save_meta(directory, meta)
+        return cls.open(index_file, embedder)
+
+    @classmethod
+    def open(cls, index_file: pathlib.Path, embedder=None) -> Optional["DenseIndex"]:
+        """Load persisted vectors (memory-mapped); None if missing, stale or built by another embedder"""
+        directory = dense_dir(index_file)
+        meta = _load_meta(directory, index_file, DENSE_VERSION)
+        if meta is None:
+            return None
+        if embedder is None:
+            config = dict(meta["embedder"])
+            if config.pop("type") != "hashing":
+                return None
+            idf_file = directory / "idf.npy"
+            embedder = HashingEmbedder(**config, idf=np.load(idf_file) if idf_file.exists() else None)
+        elif embedder.config() != meta["embedder"]:
+            return None
+        vectors = np.load(directory / "vectors.npy", mmap_mode="r")
+        doc_offset = np.load(directory / "doc_offset.npy", mmap_mode="r")
+        return cls(index_file, meta, vectors, doc_offset, embedder)
+
+    def search_batch(self, queries: List[str], top_k: int = 5,
+                     block_rows: int = 65536) -> List[List[Tuple[int, float]]]:
+        """
+        Top-k (doc_num, cosine) per query; the matrix is scanned once in row blocks
+
+        Each block's scores are cut to their top-k and merged into a running
+        top-k, so memory stays O(queries * (block_rows + top_k)). Equal
+        scores are listed by doc number.
+        """
+        if top_k <= 0 or self.n_docs == 0 or not queries:
+            return [[] for _ in queries]
+        q = self.embedder.embed(queries)  # [Q, dim]
+        best_docs = np.empty((len(queries), 0), dtype=np.int64)
+        best_scores = np.empty((len(queries), 0), dtype=np.float32)
+        for start in range(0, self.n_docs, block_rows):
+            block_scores = q @ self.vectors[start:start + block_rows].T  # [Q, block]
+            block_docs = np.broadcast_to(np.arange(start, start + block_scores.shape[1]), block_scores.shape)
+            best_docs, best_scores = _merge_top_k(np.concatenate([best_docs, block_docs], axis=1),
+                                                  np.concatenate([best_scores, block_scores], axis=1), top_k)
+        order = np.lexsort((best_docs, -best_scores), axis=1)
+        best_docs = np.take_along_axis(best_docs, order, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        return [[(int(d), float(s)) for d, s in zip(docs, scores)] if query_vec.any() else []  # no known tokens
+                for docs, scores, query_vec in zip(best_docs, best_scores, q)]
+
+    def search(self, query: str, top_k: int = 5) -> List[Tuple[int, float]]:
+        return self.search_batch([query], top_k)[0]
+
+def hybrid_search(lexical: BM25Index, dense: DenseIndex, query: str, top_k: int = 5,
+                  alpha: float = 0.5, candidates: Optional[int] = None) -> List[Tuple[int, float]]:
+    """
+    Fuse BM25 and dense scores: alpha * dense + (1 - alpha) * bm25
+
+    Both candidate lists are normalized by their best score; a document missing
+    from one list contributes 0 from it. Both indexes must be built from the
+    same JSONL file state so that doc numbers line up.
+    """
+    if top_k <= 0:
+        return []
+    candidates = candidates or max(top_k * 4, 20)
+    fused: Dict[int, float] = {}
+    for weight, hits in ((1.0 - alpha, lexical.search(query, candidates)),
+                         (alpha, dense.search(query, candidates))):
+        best = max((score for _, score in hits), default=0.0)
+        if best <= 0:
+            continue
+        for doc_num, score in hits:
+            fused[doc_num] = fused.get(doc_num, 0.0) + weight * max(score, 0.0) / best
+    if not fused:
+        return []
+    docs = np.fromiter(fused.keys(), dtype=np.int64, count=len(fused))
+    scores = np.fromiter(fused.values(), dtype=np.float64, count=len(fused))
+    return [(int(docs[i]), float(scores[i])) for i in _top_k(scores, top_k)]
+
+# Process-wide cache: one loaded index per JSONL path, reloaded when the file changes
+_LOADED: Dict[str, BM25Index] = {}
+_LOADED_DENSE: Dict[str, DenseIndex] = {}
+# One open/build at a time per (kind, path); concurrent stale requests wait for it
+_BUILD_LOCKS: Dict[Tuple[str, str], threading.Lock] = {}
+_BUILD_LOCKS_GUARD = threading.Lock()
+
+def _build_lock(kind: str, key: str) -> threading.Lock:
+    with _BUILD_LOCKS_GUARD:
+        return _BUILD_LOCKS.setdefault((kind, key), threading.Lock())
+
+def _get_cached(cache: Dict[str, _RecordIndex], kind: str, cls, index_file: pathlib.Path) -> Optional[_RecordIndex]:
+    index_file = pathlib.Path(index_file)
+    if not index_file.exists():
+        return None
+    key = str(index_file.resolve())
+    index = cache.get(key)
+    if index is not None and not index.is_stale():
+        return index
+    with _build_lock(kind, key):
+        index = cache.get(key)  # another request may have rebuilt it meanwhile
+        if index is None or index.is_stale():
+            index = cls.open(index_file) or cls.build(index_file)
+            cache[key] = index
+    return index
+
+def get_index(index_file: pathlib.Path) -> Optional[BM25Index]:
+    """Loaded (or freshly built) BM25 index for a JSONL file; None if the file is missing"""
+    return _get_cached(_LOADED, "bm25", BM25Index, index_file)
+
+def get_dense_index(index_file: pathlib.Path) -> Optional[DenseIndex]:
+    """Loaded (or freshly built) dense index for a JSONL file; None if the file is missing"""
+    return _get_cached(_LOADED_DENSE, "dense", DenseIndex, index_file)
+
+def search_records(index_file: pathlib.Path, query: str, top_k: int = 5,
+                   mode: str = "lexical", alpha: float = 0.5) -> List[Dict[str, Any]]:
+    """Records for a lexical, dense or hybrid query; [] if the index is missing"""
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"mode must be one of {SEARCH_MODES}, got {mode!r}")
+    lexical = get_index(index_file) if mode != "dense" else None
+    dense = get_dense_index(index_file) if mode != "lexical" else None
+    if mode == "lexical":
+        return lexical.search_records(query, top_k) if lexical else []
+    if mode == "dense":
+        return dense.search_records(query, top_k) if dense else []
+    if lexical is None or dense is None:
+        return []
+    results = []
+    for doc_num, score in hybrid_search(lexical, dense, query, top_k, alpha):
+        record = lexical.get_record(doc_num)
+        record["relevance_score"] = score
+        results.append(record)
+    return results
+
+def main():
+    """Main CLI interface"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build or query the BM25 RAG index")
+    parser.add_argument("index_file", nargs="?", default="data/rag_index.jsonl", help="JSONL index file")
+    parser.add_argument("--search", "-s", help="Query to run against the index")
+    parser.add_argument("--top-k", type=int, default=5, help="Number of results to return")
+    parser.add_argument("--mode", choices=SEARCH_MODES, default="lexical", help="Retrieval mode")
+    args = parser.parse_args()
+
+    index_file = pathlib.Path(args.index_file)
+    if not index_file.exists():
+        print(f"❌ Index file not found: {index_file}")
+        return 1
+
+    if args.search:
+        for i, record in enumerate(search_records(index_file, args.search, args.top_k, args.mode), 1):
+            print(f"{i}. {record.get('source_file') or record.get('source')} "
+                  f"(score {record['relevance_score']:.3f})")
+    else:
+        index = BM25Index.build(index_file)
+        print(f"✅ BM25 index built: {index.n_docs} docs, {len(index.vocab)} terms -> {index_dir(index_file)}")
+        dense = DenseIndex.build(index_file)
+        print(f"✅ Dense index built: {dense.n_docs} x {dense.meta['dim']} -> {dense_dir(index_file)}")
+
+if __name__ == "__main__":
+    main()
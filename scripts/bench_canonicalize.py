@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Benchmark: single-pass MCanonicalizer vs the original multi-pass canonicalization
+
+Reports canonicalize_M throughput for growing nested inputs, for the original
+implementation, schema 1.0.0 (SHA256) and schema 1.1.0 (BLAKE2b).
+
+Usage: python scripts/bench_canonicalize.py [--sizes 10,1000,100000] [--repeat 5]
+"""
+import argparse, hashlib, json, pathlib, sys, timeit
+
+root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(root))
+from core.feature_store.canonicalize import MCanonicalizer
+
+def legacy_canonicalize(inputs):
+    """Original implementation (dumps + hash, then two more walks and a second dumps)"""
+    blob = json.dumps(inputs, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    digest = hashlib.sha256(blob.encode('utf-8')).hexdigest()
+    dim = sum(1 if isinstance(v, (int, float)) or not hasattr(v, '__len__') else len(v) for v in inputs.values())
+    source_map = {k: {"type": type(v).__name__, "size": len(str(v)),
+                      "hash": hashlib.md5(str(v).encode()).hexdigest()[:8]} for k, v in inputs.items()}
+    fingerprint_blob = json.dumps({"digest": digest, "schema_version": "1.0.0", "dim": dim}, sort_keys=True)
+    return digest, hashlib.sha256(fingerprint_blob.encode()).hexdigest()[:16], source_map
+
+def make_inputs(size: int):
+    return {
+        "text": "Macierz Tożsamości " * (size // 20 + 1),
+        "values": [i * 0.5 for i in range(size // 10)],
+        "meta": {f"k{i}": {"id": i, "tags": ["a", "b"]} for i in range(size // 100)},
+        "flag": True,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="MCanonicalizer throughput benchmark")
+    parser.add_argument("--sizes", default="10,1000,100000")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    variants = {
+        "legacy": legacy_canonicalize,
+        "1.0.0 sha256": MCanonicalizer("1.0.0").canonicalize_M,
+        "1.1.0 blake2b": MCanonicalizer("1.1.0").canonicalize_M,
+    }
+    for size in map(int, args.sizes.split(",")):
+        inputs = make_inputs(size)
+        nbytes = len(json.dumps(inputs, ensure_ascii=False).encode())
+        number = max(1, 20_000_000 // (nbytes * 100 + 1))
+        print(f"🧪 size={size} ({nbytes / 1024:.1f} KiB canonical JSON)")
+        for name, fn in variants.items():
+            best = min(timeit.repeat(lambda: fn(inputs), number=number, repeat=args.repeat)) / number
+            print(f"  {name:<14} {best * 1e6:10.1f} us   {nbytes / best / 2**20:8.1f} MiB/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark: span-based chunk_text vs the original backwards-scanning chunker
+
+Usage: python scripts/bench_chunking.py [--mb 4] [--chunk-size 1200] [--repeat 3]
+"""
+import argparse, pathlib, random, sys, time
+
+root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(root))
+from pdf_rag_ingest import chunk_text, iter_chunk_spans
+
+def legacy_chunk_text(text: str, chunk_size: int = 1200, overlap: int = 200):
+    """Original implementation (char scan back from each chunk end)"""
+    if len(text) <= chunk_size:
+        return [text]
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + chunk_size, len(text))
+        if end < len(text):
+            for i in range(end, max(start + chunk_size - 200, start), -1):
+                if text[i] in '.!?':
+                    end = i + 1
+                    break
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        start = end - overlap if end < len(text) else end
+    return chunks
+
+def make_text(n_chars: int, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    words = ["meta", "geniusz", "residual", "świadomość", "inference", "wektor",
+             "kalibracja", "system", "a", "the", "of", "dane", "ontologia"]
+    parts, size = [], 0
+    while size < n_chars:
+        sentence = " ".join(rng.choice(words) for _ in range(rng.randint(4, 40)))
+        sentence += rng.choice(".!?,;") + " "
+        parts.append(sentence)
+        size += len(sentence)
+    return "".join(parts)[:n_chars]
+
+def bench(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Chunking benchmark")
+    parser.add_argument("--mb", type=float, default=4.0, help="Synthetic document size (MB of chars)")
+    parser.add_argument("--chunk-size", type=int, default=1200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    text = make_text(int(args.mb * 1_000_000))
+    legacy = legacy_chunk_text(text, args.chunk_size)
+    current = chunk_text(text, args.chunk_size)
+    assert legacy == current, "chunk_text output differs from the legacy chunker"
+    print(f"📄 {len(text):,} chars -> {len(current):,} chunks (outputs identical)")
+
+    rows = [
+        ("legacy chunk_text", lambda: legacy_chunk_text(text, args.chunk_size)),
+        ("chunk_text", lambda: chunk_text(text, args.chunk_size)),
+        ("iter_chunk_spans", lambda: sum(1 for _ in iter_chunk_spans(text, args.chunk_size))),
+        ("iter_chunk_spans tokens", lambda: sum(1 for _ in iter_chunk_spans(text, 256, unit="tokens"))),
+    ]
+    baseline = None
+    for name, fn in rows:
+        seconds = bench(fn, args.repeat)
+        baseline = baseline or seconds
+        print(f"  {name:<26} {seconds * 1000:9.1f} ms  {len(text) / seconds / 1e6:7.1f} MB/s  x{baseline / seconds:.2f}")
+
+if __name__ == "__main__":
+    main()
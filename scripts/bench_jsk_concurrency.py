@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Stress benchmark: concurrent JSKController.infer vs sequential runs
+
+Checks that results from the thread pool (and from raw threads hammering one
+controller) are bit-for-bit identical to sequential runs, then reports throughput.
+
+Usage: python scripts/bench_jsk_concurrency.py [--n 2000] [--threads 8]
+"""
+import argparse, pathlib, random, sys, threading, time
+
+root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(root))
+from core.jsk import JSKController, JSKConfig
+
+VOLATILE = ("trace_id", "execution_time_ms", "cache_hit")
+
+def stable(result):
+    return {k: v for k, v in result.items() if k not in VOLATILE}
+
+def make_inputs(n: int, distinct: int):
+    rng = random.Random(11)
+    pool = [{"text": "".join(rng.choice("abc xyz.") for _ in range(rng.randint(1, 400))), "n": i}
+            for i in range(distinct)]
+    return [pool[rng.randrange(distinct)] for _ in range(n)]
+
+def controller(threads: int, cache_size: int) -> JSKController:
+    c = JSKController(cache_size=cache_size, max_workers=threads)
+    # Mixed COHERE / DESTROY / ABSTAIN outcomes
+    c.config = JSKConfig(diff_threshold=0.05, seek_threshold=0.08, abstain_p_value=1e-30)
+    return c
+
+def main():
+    parser = argparse.ArgumentParser(description="JSK concurrency stress benchmark")
+    parser.add_argument("--n", type=int, default=2000, help="Inferences per run")
+    parser.add_argument("--distinct", type=int, default=500, help="Distinct inputs")
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    inputs = make_inputs(args.n, args.distinct)
+    print(f"🧪 {args.n} inferences over {args.distinct} distinct inputs, {args.threads} threads")
+
+    for cache_size in (0, 1024):
+        label = "cache on " if cache_size else "cache off"
+
+        seq = controller(args.threads, cache_size)
+        start = time.perf_counter()
+        expected = [stable(seq.infer(x)) for x in inputs]
+        t_seq = time.perf_counter() - start
+
+        pooled = controller(args.threads, cache_size)
+        start = time.perf_counter()
+        got = [stable(r) for r in pooled.infer_concurrent(inputs)]
+        t_pool = time.perf_counter() - start
+        pooled.shutdown()
+        assert got == expected, "thread pool results differ from sequential run"
+
+        # Raw threads sharing one controller, interleaved inputs
+        shared = controller(args.threads, cache_size)
+        out = [None] * len(inputs)
+
+        def worker(offset):
+            for i in range(offset, len(inputs), args.threads):
+                out[i] = stable(shared.infer(inputs[i]))
+
+        workers = [threading.Thread(target=worker, args=(k,)) for k in range(args.threads)]
+        start = time.perf_counter()
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        t_threads = time.perf_counter() - start
+        assert out == expected, "threaded results differ from sequential run"
+        assert shared.config.get_commit_hash() == seq.config.get_commit_hash(), "config was mutated"
+
+        for name, seconds in (("sequential", t_seq), ("infer_concurrent", t_pool), ("raw threads", t_threads)):
+            print(f"  [{label}] {name:<17} {seconds * 1000:8.1f} ms  {args.n / seconds:9.0f} inf/s")
+    print("✅ Concurrent results identical to sequential runs")
+
+if __name__ == "__main__":
+    main()
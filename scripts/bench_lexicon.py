@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Benchmark: compiled Lexicon scan vs `for keyword in list: if keyword in text.lower()` loops
+
+Reports per-step cost for growing lexicon sizes. The Lexicon timing uses
+uncached scans (each step scanned from scratch).
+
+Usage: python scripts/bench_lexicon.py [--sizes 10,100,1000,10000] [--steps 200] [--repeat 5]
+"""
+import argparse, pathlib, random, sys, timeit
+
+root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(root / "core"))
+from lexicon import Lexicon
+
+ALPHABET = "aąbcćdeęfghijklłmnńoóprsśtuwyzźż"
+
+def random_word(rng: random.Random) -> str:
+    return "".join(rng.choice(ALPHABET) for _ in range(rng.randint(4, 12)))
+
+def main():
+    parser = argparse.ArgumentParser(description="MŚWR lexicon scanner benchmark")
+    parser.add_argument("--sizes", default="10,100,1000,10000")
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"🧪 {args.steps} reasoning steps of ~12 words, keywords of 4-12 chars")
+    for size in map(int, args.sizes.split(",")):
+        categories = {f"c{i}": [random_word(rng) for _ in range(10)] for i in range(max(1, size // 10))}
+        keywords = [k for words in categories.values() for k in words]
+        steps = [" ".join(rng.choice(keywords) if rng.random() < 0.2 else random_word(rng) for _ in range(12)).title()
+                 for _ in range(args.steps)]
+        lexicon = Lexicon(categories)
+
+        def loops():
+            for step in steps:
+                for words in categories.values():
+                    sum(1 for word in words if word in step.lower())
+
+        def scanner():
+            for step in steps:
+                lexicon._scan(step)
+
+        t_loop = min(timeit.repeat(loops, number=1, repeat=args.repeat)) / args.steps
+        t_scan = min(timeit.repeat(scanner, number=1, repeat=args.repeat)) / args.steps
+        print(f"  {len(keywords):>6} keywords   loops {t_loop * 1e6:9.1f} us/step   "
+              f"lexicon {t_scan * 1e6:7.1f} us/step   x{t_loop / t_scan:6.1f}")
+
+if __name__ == "__main__":
+    main()
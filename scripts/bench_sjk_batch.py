@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark: UnifiedCalibrationEngine.calibrate_batch vs a loop of calibrate()
+
+Runs every calibration mode on the same [batch, dim] input and reports
+throughput of the scalar loop and of the batched path.
+
+Usage: python scripts/bench_sjk_batch.py [--batch 2048] [--dim 64] [--batch-size 32] [--workers 4]
+"""
+import argparse, asyncio, logging, pathlib, sys, time, warnings
+
+import numpy as np
+
+root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(root))
+from core.sjk import CalibrationConfig, CalibrationMode, UnifiedCalibrationEngine
+from core.metrics_registry import MetricsRegistry
+
+async def engine_for(mode: CalibrationMode, args) -> UnifiedCalibrationEngine:
+    config = CalibrationConfig(calibration_mode=mode, batch_size=args.batch_size,
+                               parallel_workers=args.workers, abstain_threshold=0.0,
+                               learning_rate=1e-4, monitoring_interval=3600)
+    engine = UnifiedCalibrationEngine(config, registry=MetricsRegistry())
+    await engine.initialize()
+    return engine
+
+async def main():
+    parser = argparse.ArgumentParser(description="S.J.K. batch calibration benchmark")
+    parser.add_argument("--batch", type=int, default=2048)
+    parser.add_argument("--dim", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    warnings.simplefilter("ignore")
+    data = np.random.default_rng(0).standard_normal((args.batch, args.dim)) * 0.1
+    print(f"🧪 {args.batch} inputs x {args.dim} dims, batch_size={args.batch_size}, workers={args.workers}")
+
+    for mode in CalibrationMode:
+        scalar = await engine_for(mode, args)
+        start = time.perf_counter()
+        for row in data:
+            await scalar.calibrate(row)
+        t_scalar = time.perf_counter() - start
+        await scalar.shutdown()
+
+        batched = await engine_for(mode, args)
+        start = time.perf_counter()
+        await batched.calibrate_batch(data)
+        t_batch = time.perf_counter() - start
+        await batched.shutdown()
+
+        print(f"  {mode.value:<13} scalar {args.batch / t_scalar:10.0f} /s   "
+              f"batch {args.batch / t_batch:10.0f} /s   x{t_scalar / t_batch:6.1f}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
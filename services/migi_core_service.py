@@ -5,7 +5,6 @@ Implementuje system MIGI (CORE/NOVA/SOMA/AETHER/HARMONIA)
 
 from fastapi import FastAPI, HTTPException, Query
 from datetime import datetime
-import json
 from typing import Dict, List
 from pathlib import Path
 import sys
@@ -14,6 +13,9 @@ import os
 # Dodajemy core do ścieżki
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from core.consciousness_api import router as consciousness_router
+from rag_index import SEARCH_MODES, get_index, search_records
+
+RAG_INDEX = Path("data/rag_index.jsonl")
 
 app = FastAPI(title="MIGI Core Service", version="1.0.0")
 
@@ -147,43 +149,28 @@ def migi_transmissions():
 
 # RAG Search endpoint
 @app.get("/v1/rag/search")
-def rag_search(q: str = Query(..., min_length=2), k: int = 3):
-    """Search RAG documents"""
-    rag_path = Path("data/rag_index.jsonl")
-    if not rag_path.exists():
+def rag_search(q: str = Query(..., min_length=2), k: int = 3, mode: str = "lexical",
+               alpha: float = Query(0.5, ge=0.0, le=1.0)):
+    """Search RAG documents (BM25, dense vectors, or hybrid fusion of both)"""
+    if mode not in SEARCH_MODES:
+        raise HTTPException(400, f"mode must be one of {', '.join(SEARCH_MODES)}")
+    index = get_index(RAG_INDEX)
+    if index is None:
         raise HTTPException(404, "RAG index not found")
-    
-    docs = []
-    with rag_path.open("r", encoding="utf-8") as f:
-        for line in f:
-            try:
-                docs.append(json.loads(line))
-            except Exception:
-                pass
-    
-    if not docs:
+    if index.n_docs == 0:
         raise HTTPException(404, "RAG index empty")
     
-    # Simple scoring: count query terms in text
-    def score(query, text):
-        query_terms = query.lower().split()
-        text_lower = text.lower()
-        return sum(1 for term in query_terms if term in text_lower)
-    
-    # Rank and return top k
-    ranked = sorted(docs, key=lambda d: score(q, d.get("text", "")), reverse=True)
-    
     results = []
-    for doc in ranked[:k]:
+    for doc in search_records(RAG_INDEX, q, k, mode, alpha):
         snippet = doc["text"][:360].replace("\n", " ").strip()
         results.append({
             "id": doc["id"], 
-            "source": doc["source"], 
-            "score": score(q, doc["text"]), 
+            "source": doc.get("source") or doc.get("source_file"), 
+            "score": round(doc["relevance_score"], 4), 
             "snippet": snippet
         })
     
-    return {"query": q, "results": results}
+    return {"query": q, "mode": mode, "results": results}
 
 # Dodanie routera świadomości 7G
 app.include_router(consciousness_router, tags=["7G Consciousness"])
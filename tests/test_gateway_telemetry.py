@@ -0,0 +1,126 @@
+"""
+Gateway Telemetry Tests
+=======================
+Batched events.jsonl writer, indexed reader
+"""
+
+import json
+import pytest
+import sys
+import os
+import threading
+import time
+
+# Add repo root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from gateway.app.telemetry import EventReader, EventWriter, index_path, segment_paths
+
+def make_writer(tmp_path, **kwargs):
+    kwargs.setdefault("flush_interval", 0.01)
+    kwargs.setdefault("rotate_daily", False)
+    kwargs.setdefault("max_bytes", 0)
+    return EventWriter(tmp_path / "events.jsonl", **kwargs)
+
+class TestEventWriter:
+    """EventWriter counters and lifecycle"""
+
+    def test_concurrent_emit_counts(self, tmp_path):
+        writer = make_writer(tmp_path, batch_size=16)
+
+        def produce(n):
+            for i in range(500):
+                writer.emit({"event_type": "t", "user_id": n, "i": i})
+
+        threads = [threading.Thread(target=produce, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        writer.close()
+
+        stats = writer.get_stats()
+        assert stats["enqueued"] == stats["written"] == 4000 and stats["dropped"] == 0
+        assert len((tmp_path / "events.jsonl").read_text().splitlines()) == 4000
+
+    def test_close_timeout_keeps_writer(self, tmp_path):
+        writer = make_writer(tmp_path)
+        write_batch = writer._write_batch
+        writer._write_batch = lambda batch: (time.sleep(0.3), write_batch(batch))
+        writer.emit({"event_type": "slow"})
+        time.sleep(0.05)  # writer thread is inside the slow batch
+
+        thread = writer._thread
+        writer.close(timeout=0.01)
+        assert writer._thread is thread and thread.is_alive()
+        writer.start()
+        assert writer._thread is thread  # no second writer on the same file
+
+        writer.close()
+        assert writer._thread is None
+        assert json.loads((tmp_path / "events.jsonl").read_text())["event_type"] == "slow"
+
+def write_events(writer, events):
+    for event in events:
+        writer.emit(event)
+        if event["i"] % 10 == 9:
+            time.sleep(0.03)  # several index batches
+    writer.close()
+
+def sample_events(n=100, t0=1_000_000.0):
+    return [{"event_type": "chat" if i % 3 else "login", "user_id": f"u{i % 4}", "unix_time": t0 + i, "i": i}
+            for i in range(n)]
+
+class TestEventReader:
+    """EventReader tail, filters and rotated segments"""
+
+    def test_filters_match_full_scan(self, tmp_path):
+        events = sample_events()
+        write_events(make_writer(tmp_path, batch_size=8), events)
+        assert index_path(tmp_path / "events.jsonl").exists()
+        reader = EventReader(tmp_path / "events.jsonl")
+
+        def expected(limit, **f):
+            found = [e for e in events
+                     if e["event_type"] == f.get("event_type", e["event_type"])
+                     and e["user_id"] == f.get("user_id", e["user_id"])
+                     and f.get("since", -1) <= e["unix_time"] <= f.get("until", float("inf"))]
+            return found[-limit:]
+
+        assert reader.recent(5) == expected(5)
+        assert reader.recent(7, event_type="login") == expected(7, event_type="login")
+        assert reader.recent(50, user_id="u1", event_type="chat") == expected(50, user_id="u1", event_type="chat")
+        assert reader.recent(100, since=1_000_010, until=1_000_019) == expected(100, since=1_000_010, until=1_000_019)
+        assert reader.recent(0) == []
+
+    def test_rotated_segments_and_legacy_lines(self, tmp_path):
+        path = tmp_path / "events.jsonl"
+        legacy = sample_events(5, t0=999_000.0)
+        path.write_text("".join(json.dumps(e) + "\n" for e in legacy))  # written before the index existed
+        events = sample_events(60)
+        write_events(make_writer(tmp_path, batch_size=4, max_bytes=1500), events)
+
+        assert segment_paths(path)
+        reader = EventReader(path)
+        assert reader.recent(1000) == legacy + events
+        assert reader.recent(3, event_type="login") == [e for e in events if e["event_type"] == "login"][-3:]
+        assert reader.recent(1000, until=999_100) == legacy
+
+    def test_since_reads_unindexed_tail(self, tmp_path):
+        path = tmp_path / "events.jsonl"
+        old = sample_events(20)
+        write_events(make_writer(tmp_path, batch_size=8), old)
+        fresh = sample_events(3, t0=2_000_000.0)
+        with open(path, "a") as f:  # written, index entry not (yet) appended
+            f.writelines(json.dumps(e) + "\n" for e in fresh)
+
+        assert EventReader(path).recent(10, since=1_500_000) == fresh
+
+    def test_missing_segment_is_skipped(self, tmp_path, monkeypatch):
+        path = tmp_path / "events.jsonl"
+        events = sample_events(60)
+        write_events(make_writer(tmp_path, batch_size=4, max_bytes=1500), events)
+        oldest = segment_paths(path)[0]
+        monkeypatch.setattr("gateway.app.telemetry.segment_paths", lambda p: [oldest.with_name("gone.jsonl"), *segment_paths(p)])
+
+        assert EventReader(path).recent(1000) == events
@@ -0,0 +1,139 @@
+"""
+Ingestion Pipeline Tests
+========================
+Staged IngestPipeline, span chunker equivalence with the original chunker
+"""
+
+import random
+import threading
+import pytest
+import sys
+import os
+
+# Add repo root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pdf_rag_ingest import IngestPipeline, chunk_text, clean_text, extract_text_from_file, iter_chunk_spans
+from rag_index import tokenize
+
+def make_files(tmp_path, n=12):
+    files = []
+    for i in range(n):
+        path = tmp_path / f"doc{i:02d}.md"
+        path.write_text(f"Dokument {i}. " + "Zdanie o kalibracji systemu numer %d! " % i * (i * 20 + 1))
+        files.append(path)
+    (tmp_path / "short.txt").write_text("za krótki")
+    files.append(tmp_path / "short.txt")
+    return files
+
+def expected_spans(path, chunk_size):
+    cleaned = clean_text(extract_text_from_file(path))
+    return list(iter_chunk_spans(cleaned, chunk_size)) if len(cleaned) >= 50 else []
+
+class TestIngestPipeline:
+    """IngestPipeline ordering, fan-out and stats"""
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_ordered_matches_sequential(self, tmp_path, workers):
+        files = make_files(tmp_path)
+        pipeline = IngestPipeline(chunk_size=300, workers=workers, queue_size=2)
+        results = list(pipeline.run(iter(files)))
+
+        assert [r.file_path for r in results] == files
+        assert [r.spans for r in results] == [expected_spans(f, 300) for f in files]
+        assert results[-1].spans == [] and results[-1].raw_chars > 0
+        stats = pipeline.get_stats()
+        assert all(stats[stage]["items"] == len(files) for stage in ("discover", "extract", "clean", "chunk"))
+
+    def test_unordered_yields_every_file(self, tmp_path):
+        files = make_files(tmp_path)
+        results = list(IngestPipeline(chunk_size=300, workers=2, ordered=False).run(files))
+        assert sorted(r.seq for r in results) == list(range(len(files)))
+        assert {r.file_path for r in results} == set(files)
+
+    def test_stage_error_is_raised(self, tmp_path):
+        def broken_discovery():
+            yield from make_files(tmp_path, 2)
+            raise RuntimeError("discovery failed")
+
+        with pytest.raises(RuntimeError, match="discovery failed"):
+            list(IngestPipeline(workers=1).run(broken_discovery()))
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_early_stop_releases_stages(self, tmp_path, workers):
+        files = make_files(tmp_path) * 5
+        before = threading.active_count()
+        results = IngestPipeline(chunk_size=300, workers=workers, queue_size=1).run(iter(files))
+        next(results)
+        results.close()
+        assert threading.active_count() == before
+
+    def test_stage_error_releases_upstream(self, tmp_path, monkeypatch):
+        files = make_files(tmp_path) * 5
+        pipeline = IngestPipeline(chunk_size=300, workers=1, queue_size=1)
+
+        def broken_clean(in_q, out_q):
+            pipeline._get(in_q)
+            raise ValueError("clean failed")
+        monkeypatch.setattr(pipeline, "_clean", broken_clean)
+
+        before = threading.active_count()
+        with pytest.raises(ValueError, match="clean failed"):
+            list(pipeline.run(iter(files)))
+        assert threading.active_count() == before
+
+def legacy_chunk_text(text, chunk_size=1200, overlap=200):
+    """Chunker before iter_chunk_spans (scans back char by char from each chunk end)"""
+    if len(text) <= chunk_size:
+        return [text]
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + chunk_size, len(text))
+        if end < len(text):
+            for i in range(end, max(start + chunk_size - 200, start), -1):
+                if text[i] in '.!?':
+                    end = i + 1
+                    break
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        start = end - overlap if end < len(text) else end
+    return chunks
+
+def random_text(n_chars, seed):
+    rng = random.Random(seed)
+    words = ["meta", "geniusz", "świadomość", "wektor", "a", "the", "dane", "  ", "\n"]
+    parts = []
+    while sum(map(len, parts)) < n_chars:
+        parts.append(" ".join(rng.choice(words) for _ in range(rng.randint(1, 60))) + rng.choice(".!?,; "))
+    return "".join(parts)[:n_chars]
+
+class TestChunkSpans:
+    """iter_chunk_spans / chunk_text"""
+
+    @pytest.mark.parametrize("seed", range(6))
+    @pytest.mark.parametrize("chunk_size", [600, 1200])  # the legacy chunker loops below 400
+    def test_matches_legacy_chunker(self, seed, chunk_size):
+        text = random_text(20_000, seed)
+        assert chunk_text(text, chunk_size) == legacy_chunk_text(text, chunk_size)
+
+    def test_no_sentence_breaks_and_short_text(self):
+        text = "słowo " * 1000
+        assert chunk_text(text, 300) == legacy_chunk_text(text, 300)
+        assert chunk_text("krótki tekst.", 300) == ["krótki tekst."]
+
+    def test_small_chunks_make_progress(self):
+        spans = list(iter_chunk_spans("ab. " * 50, chunk_size=5, overlap=10))
+        assert spans and all(s < e for s, e in spans)
+        assert [s for s, _ in spans] == sorted(s for s, _ in spans)
+
+    def test_token_unit(self):
+        text = random_text(20_000, 11)
+        spans = list(iter_chunk_spans(text, chunk_size=100, unit="tokens"))
+        assert all(len(tokenize(text[s:e])) <= 100 for s, e in spans)
+        assert spans[0][0] == len(text) - len(text.lstrip()) and spans[-1][1] == len(text.rstrip())
+        covered = set()
+        for s, e in spans:
+            covered.update(range(s, e))
+        assert all(i in covered for i in range(len(text.rstrip())) if not text[i].isspace())
@@ -0,0 +1,139 @@
+"""
+MŚWR Pool Tests
+===============
+Engine pool queue bound, overload rejection, engine hand-back on cancellation
+"""
+
+import asyncio
+import threading
+import pytest
+import sys
+import os
+
+# Add repo root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from gateway.app.mswr_pool import MSWROverloaded, MSWRPool
+
+class FakeEngine:
+    """Engine whose inference blocks until `release` is set"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.running = threading.Event()
+        self.calls = 0
+        self.closed = False
+
+    def zero_time_inference(self, input_data, context=None):
+        self.running.set()
+        self.release.wait(5)
+        self.calls += 1
+        return {"input": input_data}
+
+    def get_system_metrics(self):
+        return {"total_inferences": self.calls, "successful_healings": 0, "p_equals_one_count": 0,
+                "healing_history_count": 0}
+
+    def close(self):
+        self.closed = True
+
+def make_pool(engines, max_queue):
+    it = iter(engines)
+    pool = MSWRPool(factory=lambda: next(it), workers=len(engines), max_queue=max_queue)
+    pool.warmup = False
+    return pool
+
+async def wait_running(engine):
+    await asyncio.to_thread(engine.running.wait, 5)
+
+class TestMSWRPool:
+    """MSWRPool scheduling"""
+
+    def test_queue_bound_rejects(self):
+        engine = FakeEngine()
+        pool = make_pool([engine], max_queue=1)
+
+        async def scenario():
+            await pool.start()
+            busy = asyncio.create_task(pool.infer("a"))
+            await wait_running(engine)
+            queued = asyncio.create_task(pool.infer("b"))
+            await asyncio.sleep(0)
+            with pytest.raises(MSWROverloaded):
+                await pool.infer("c")
+            engine.release.set()
+            results = await asyncio.gather(busy, queued)
+            metrics = await pool.system_metrics()
+            await pool.close()
+            return results, metrics
+
+        results, metrics = asyncio.run(scenario())
+        assert [r["input"] for r in results] == ["a", "b"]
+        assert metrics["total_inferences"] == 2
+        assert pool.get_metrics()["rejected_total"] == 1 and engine.closed
+
+    def test_cancelled_request_returns_engine_when_done(self):
+        engine = FakeEngine()
+        pool = make_pool([engine], max_queue=4)
+
+        async def scenario():
+            await pool.start()
+            first = asyncio.create_task(pool.infer("a"))
+            await wait_running(engine)
+            first.cancel()
+            await asyncio.sleep(0.05)
+            assert pool._idle.qsize() == 0       # still running on the worker thread
+            second = asyncio.create_task(pool.infer("b"))
+            await asyncio.sleep(0.05)
+            assert not second.done()
+            engine.release.set()
+            result = await asyncio.wait_for(second, 5)
+            await pool.close()
+            return first, result
+
+        first, result = asyncio.run(scenario())
+        assert first.cancelled() and result == {"input": "b"}
+        assert engine.calls == 2
+
+class TestGatewayOverload:
+    """MŚWR endpoints map MSWROverloaded to 503"""
+
+    def test_overload_is_503_with_retry_after(self, tmp_path, monkeypatch):
+        from fastapi.testclient import TestClient
+        monkeypatch.chdir(tmp_path)  # events.jsonl goes to the temp dir
+        import unified_gateway_v11 as gateway
+
+        engine = FakeEngine()
+        engine.release.set()
+        pool = make_pool([engine], max_queue=0)
+        monkeypatch.setattr(gateway, "mswr_pool", pool)
+        headers = {"Authorization": f"Bearer {gateway.create_token({'sub': 'u1', 'role': 'User'})}"}
+
+        with TestClient(gateway.app) as client:  # runs the startup hook, which starts the pool
+            response = client.post("/v1/mswr/inference", json={"input": "Ile to 2+2?"}, headers=headers)
+            assert response.status_code == 200 and response.json()["mswr_result"] == {"input": "Ile to 2+2?"}
+
+            async def overloaded(*args, **kwargs):
+                raise MSWROverloaded("MŚWR queue full (0 waiting)")
+            monkeypatch.setattr(pool, "infer", overloaded)
+            response = client.post("/v1/mswr/inference", json={"input": "x"}, headers=headers)
+            assert response.status_code == 503 and response.headers["Retry-After"] == "1"
+        assert engine.closed
+
+    def test_residuals_and_heal_overload_is_503(self, tmp_path, monkeypatch):
+        from fastapi.testclient import TestClient
+        monkeypatch.chdir(tmp_path)
+        import unified_gateway_v11 as gateway
+
+        pool = make_pool([FakeEngine()], max_queue=0)
+        monkeypatch.setattr(gateway, "mswr_pool", pool)
+
+        async def overloaded(*args, **kwargs):
+            raise MSWROverloaded("MŚWR queue full (0 waiting)")
+        monkeypatch.setattr(pool, "run", overloaded)
+        headers = {"Authorization": f"Bearer {gateway.create_token({'sub': 'root', 'role': 'MetaGeniusz'})}"}
+
+        with TestClient(gateway.app) as client:
+            for response in (client.get("/v1/mswr/residuals", headers=headers),
+                             client.post("/v1/mswr/heal", json={}, headers=headers)):
+                assert response.status_code == 503 and response.headers["Retry-After"] == "1"
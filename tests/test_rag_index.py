@@ -0,0 +1,177 @@
+"""
+RAG Index Tests
+===============
+BM25 ranking, persisted index lifecycle, tombstones and compaction, dense and hybrid search
+"""
+
+import json
+import math
+import random
+import pytest
+import sys
+import os
+import threading
+from collections import Counter
+
+# Add repo root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+
+from rag_index import (BM25Index, DenseIndex, _RecordIndex, compact_index, dense_dir, get_dense_index,
+                       get_index, hybrid_search, index_dir, iter_live_records, search_records, tokenize)
+
+WORDS = ["meta", "geniusz", "residual", "świadomość", "inference", "wektor",
+         "kalibracja", "system", "dane", "ontologia", "entropia", "ścieżka"]
+
+def write_records(index_file, texts, start=0):
+    with open(index_file, "a", encoding="utf-8") as f:
+        for i, text in enumerate(texts, start):
+            f.write(json.dumps({"id": f"doc{i}", "text": text}, ensure_ascii=False) + "\n")
+
+def random_texts(n, seed=3):
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 40))) for _ in range(n)]
+
+def reference_bm25(texts, query, k1=1.5, b=0.75):
+    """Straightforward per-document Okapi BM25"""
+    docs = [Counter(tokenize(t)) for t in texts]
+    avgdl = sum(sum(d.values()) for d in docs) / len(docs)
+    scores = []
+    for d in docs:
+        dl, score = sum(d.values()), 0.0
+        for term in set(tokenize(query)):
+            df = sum(1 for other in docs if term in other)
+            if term in d:
+                idf = math.log(1.0 + (len(docs) - df + 0.5) / (df + 0.5))
+                score += idf * d[term] * (k1 + 1) / (d[term] + k1 * (1 - b + b * dl / avgdl))
+        scores.append(score)
+    return scores
+
+class TestBM25Index:
+    """BM25Index ranking and persistence"""
+
+    @pytest.mark.parametrize("query", ["świadomość", "residual inference", "Meta GENIUSZ dane", "nieznane"])
+    def test_matches_reference_ranking(self, tmp_path, query):
+        index_file = tmp_path / "index.jsonl"
+        texts = random_texts(200)
+        write_records(index_file, texts)
+        index = BM25Index.build(index_file)
+
+        expected = reference_bm25(texts, query)
+        hits = index.search(query, top_k=10)
+        best = sorted((s for s in expected if s > 0), reverse=True)[:10]
+        assert [score for _, score in hits] == pytest.approx(best, rel=1e-5)
+        for doc_num, score in hits:
+            assert expected[doc_num] == pytest.approx(score, rel=1e-5)
+        if hits:
+            assert index.search_records(query, 1)[0]["id"] == f"doc{hits[0][0]}"
+
+    def test_open_and_staleness(self, tmp_path):
+        index_file = tmp_path / "index.jsonl"
+        write_records(index_file, ["kalibracja systemu", "entropia resztkowa"])
+        assert BM25Index.open(index_file) is None
+        BM25Index.build(index_file)
+
+        index = BM25Index.open(index_file)
+        assert index is not None and not index.is_stale()
+        assert [doc for doc, _ in index.search("entropia")] == [1]
+
+        write_records(index_file, ["entropia ścieżki"], start=2)
+        assert index.is_stale() and BM25Index.open(index_file) is None
+
+    def test_concurrent_stale_requests_build_once(self, tmp_path, monkeypatch):
+        index_file = tmp_path / "index.jsonl"
+        write_records(index_file, random_texts(300))
+        builds = []
+        for cls in (BM25Index, DenseIndex):
+            build = cls.build.__func__
+            monkeypatch.setattr(cls, "build", classmethod(lambda c, f, _b=build: builds.append(c) or _b(c, f)))
+
+        barrier = threading.Barrier(8)
+        results, errors = [], []
+
+        def request(getter):
+            barrier.wait()
+            try:
+                results.append(getter(index_file))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=request, args=(getter,)) for getter in (get_index, get_dense_index) * 4]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert not errors and builds.count(BM25Index) == 1 and builds.count(DenseIndex) == 1
+        assert len({id(index) for index in results}) == 2
+        leftovers = [p for d in (index_dir(index_file), dense_dir(index_file)) for p in d.iterdir() if "tmp" in p.name]
+        assert leftovers == []
+
+class TestLogStructuredIndex:
+    """Replacement, tombstones and compaction of the JSONL index"""
+
+    def test_tombstones_and_compaction(self, tmp_path):
+        index_file = tmp_path / "index.jsonl"
+        write_records(index_file, ["pierwszy", "drugi", "trzeci"])
+        with open(index_file, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"id": "doc0", "deleted": True}) + "\n")
+            f.write(json.dumps({"id": "doc1", "text": "drugi poprawiony"}) + "\n")
+            f.write("{torn line\n")
+
+        live = [record for _, record in iter_live_records(index_file)]
+        assert [(r["id"], r["text"]) for r in live] == [("doc2", "trzeci"), ("doc1", "drugi poprawiony")]
+        assert [doc for doc, _ in BM25Index.build(index_file).search("drugi")] == [1]
+
+        assert compact_index(index_file) == 2
+        assert [json.loads(line) for line in index_file.read_text(encoding="utf-8").splitlines()] == live
+        assert [record for _, record in iter_live_records(index_file)] == live
+
+class TestDenseAndHybrid:
+    """DenseIndex blocked top-k and hybrid fusion"""
+
+    QUERIES = ["świadomość wektor", "residual inference system", "entropia", "zzz nieznane"]
+
+    def build(self, tmp_path, n=300):
+        index_file = tmp_path / "index.jsonl"
+        write_records(index_file, random_texts(n, seed=5))
+        return index_file, BM25Index.build(index_file), DenseIndex.build(index_file)
+
+    def test_blocked_scan_matches_full_matrix(self, tmp_path):
+        _, _, dense = self.build(tmp_path)
+        q = dense.embedder.embed(self.QUERIES)
+        full = q @ np.asarray(dense.vectors).T
+
+        for block_rows in (7, 64, 65536):
+            for query, row, vec, hits in zip(self.QUERIES, full, q, dense.search_batch(self.QUERIES, 10, block_rows)):
+                if not vec.any():
+                    assert hits == []
+                    continue
+                assert [s for _, s in hits] == pytest.approx(sorted(row, reverse=True)[:10], abs=1e-6)
+                assert all(row[d] == pytest.approx(s, abs=1e-6) for d, s in hits)
+        assert dense.search(self.QUERIES[0], 3) == dense.search_batch(self.QUERIES[:1], 3)[0]
+
+    def test_hybrid_fusion(self, tmp_path):
+        index_file, lexical, dense = self.build(tmp_path)
+        query, alpha = "residual inference system", 0.3
+
+        expected = {}
+        for weight, hits in ((1 - alpha, lexical.search(query, 20)), (alpha, dense.search(query, 20))):
+            best = max(s for _, s in hits)
+            for doc, score in hits:
+                expected[doc] = expected.get(doc, 0.0) + weight * max(score, 0.0) / best
+        fused = hybrid_search(lexical, dense, query, top_k=5, alpha=alpha)
+        assert [s for _, s in fused] == pytest.approx(sorted(expected.values(), reverse=True)[:5])
+        assert all(expected[doc] == pytest.approx(score) for doc, score in fused)
+
+        assert [d for d, _ in hybrid_search(lexical, dense, query, 5, alpha=0.0)] == \
+            [d for d, _ in lexical.search(query, 5)]
+        records = search_records(index_file, query, top_k=3, mode="hybrid")
+        assert len(records) == 3 and all("relevance_score" in r for r in records)
+        with pytest.raises(ValueError):
+            search_records(index_file, query, mode="semantic")
+
+    def test_record_index_is_abstract(self):
+        with pytest.raises(TypeError):
+            _RecordIndex(None, {"n_docs": 0}, None)
@@ -0,0 +1,77 @@
+"""
+RAG Ingestion Tests
+===================
+Incremental ingestion, tombstones and compaction
+"""
+
+import pytest
+import sys
+import os
+
+# Add repo root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pdf_rag_ingest import process_directory
+from rag_index import iter_live_records
+
+LICENSE_TEXT = "Permission is hereby granted, free of charge, to any person obtaining a copy. " * 3
+
+def live_sources(index_file):
+    return sorted(record["source_path"] for _, record in iter_live_records(index_file))
+
+def ingest(docs, index_file, **kwargs):
+    return process_directory(docs, index_file, workers=1, dense=False, **kwargs)
+
+class TestIncrementalIngest:
+    """Chunk ids, tombstones and compaction"""
+
+    def test_same_named_files(self, tmp_path):
+        docs, index_file = tmp_path / "docs", tmp_path / "index.jsonl"
+        for name in ("a", "b"):
+            (docs / name).mkdir(parents=True)
+            (docs / name / "LICENSE.md").write_text(LICENSE_TEXT)
+
+        summary = ingest(docs, index_file)
+        assert summary["live_chunks"] == summary["total_chunks"] == 2
+        assert live_sources(index_file) == [str(docs / "a" / "LICENSE.md"), str(docs / "b" / "LICENSE.md")]
+
+        (docs / "a" / "LICENSE.md").unlink()
+        summary = ingest(docs, index_file, incremental=True)
+        assert summary["tombstoned_chunks"] == 1 and summary["live_chunks"] == 1
+        assert live_sources(index_file) == [str(docs / "b" / "LICENSE.md")]
+
+    def test_changed_file_and_compaction(self, tmp_path):
+        docs, index_file = tmp_path / "docs", tmp_path / "index.jsonl"
+        docs.mkdir()
+        (docs / "notes.md").write_text("Kalibracja systemu. " * 200)
+        (docs / "keep.md").write_text(LICENSE_TEXT)
+        first = ingest(docs, index_file, chunk_size=1200)
+
+        (docs / "notes.md").write_text("Entropia resztkowa. " * 40)
+        summary = ingest(docs, index_file, incremental=True, compact_ratio=0.3)
+        assert summary["unchanged_files"] == 1
+        assert summary["tombstoned_chunks"] == first["total_chunks"] - 1
+        assert summary["compacted"]
+        records = [record for _, record in iter_live_records(index_file)]
+        assert len(records) == summary["live_chunks"] == len(index_file.read_text().splitlines())
+        assert all("Kalibracja" not in record["text"] for record in records)
+
+    def test_suffix_case_and_overlapping_patterns(self, tmp_path):
+        docs, index_file = tmp_path / "docs", tmp_path / "index.jsonl"
+        docs.mkdir()
+        (docs / "Notes.MD").write_text(LICENSE_TEXT)
+        (docs / "readme.md").write_text(LICENSE_TEXT)
+
+        summary = ingest(docs, index_file, file_patterns=["*.md", "*.MD", "read*"])
+        assert summary["processed_files"] == 2
+        assert live_sources(index_file) == [str(docs / "Notes.MD"), str(docs / "readme.md")]
+
+    def test_index_without_manifest_is_rebuilt(self, tmp_path):
+        docs, index_file = tmp_path / "docs", tmp_path / "index.jsonl"
+        docs.mkdir()
+        (docs / "keep.md").write_text(LICENSE_TEXT)
+        index_file.write_text('{"id": "legacy", "source_file": "gone.md", "text": "stary rekord"}\n')
+
+        summary = ingest(docs, index_file, incremental=True)
+        assert not summary["incremental"]
+        assert live_sources(index_file) == [str(docs / "keep.md")]
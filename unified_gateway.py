@@ -14,6 +14,8 @@ import logging
 from datetime import datetime
 from pathlib import Path
 
+from gateway.app.upstream import ServicePool
+
 # Konfiguracja logowania
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -50,6 +52,9 @@ for repo in WORKSPACE.get("repos", []):
     if "service" in repo and "port" in repo:
         SERVICES[repo["service"]] = f"http://localhost:{repo['port']}"
 
+# Shared keep-alive connection pool (one client per service)
+upstream = ServicePool(SERVICES, default_timeout=30)
+
 # Role i autoryzacja (z wcześniejszej implementacji)
 class Role:
     METAGENIUSZ = "MetaGeniusz"
@@ -81,19 +86,11 @@ async def proxy_request(service: str, path: str, method: str = "GET", **kwargs):
     url = f"{base_url.rstrip('/')}/{path.lstrip('/')}"
     
     try:
-        async with httpx.AsyncClient(timeout=30) as client:
-            if method.upper() == "GET":
-                response = await client.get(url, **kwargs)
-            elif method.upper() == "POST":
-                response = await client.post(url, **kwargs)
-            elif method.upper() == "PUT":
-                response = await client.put(url, **kwargs)
-            elif method.upper() == "DELETE":
-                response = await client.delete(url, **kwargs)
-            else:
-                raise HTTPException(405, f"Method {method} not supported")
-            
-            return response.json()
+        if method.upper() not in ("GET", "POST", "PUT", "DELETE"):
+            raise HTTPException(405, f"Method {method} not supported")
+        
+        response = await upstream.request(service, method, url, **kwargs)
+        return response.json()
     except httpx.ConnectError:
         raise HTTPException(503, f"Service {service} unavailable")
     except Exception as e:
@@ -119,13 +116,12 @@ async def list_services():
     
     for service, url in SERVICES.items():
         try:
-            async with httpx.AsyncClient(timeout=5) as client:
-                response = await client.get(f"{url}/health")
-                service_status[service] = {
-                    "status": "online",
-                    "url": url,
-                    "response_time": response.elapsed.total_seconds()
-                }
+            response = await upstream.request(service, "GET", f"{url}/health", timeout=5)
+            service_status[service] = {
+                "status": "online",
+                "url": url,
+                "response_time": response.elapsed.total_seconds()
+            }
         except Exception:
             service_status[service] = {
                 "status": "offline",
@@ -139,6 +135,11 @@ async def list_services():
         "online": len([s for s in service_status.values() if s["status"] == "online"])
     }
 
+@app.get("/services/pool")
+async def upstream_pool_metrics():
+    """Upstream connection pool occupancy and counters"""
+    return upstream.get_metrics()
+
 # === GOD INTERFACE ===
 
 @app.get("/god/dashboard")
@@ -236,9 +237,8 @@ async def admin_audit(x_role: str = Header("User")):
     # Check each service health
     for service, url in SERVICES.items():
         try:
-            async with httpx.AsyncClient(timeout=3) as client:
-                await client.get(f"{url}/health")
-                audit_data["services_status"][service] = "healthy"
+            await upstream.request(service, "GET", f"{url}/health", timeout=3)
+            audit_data["services_status"][service] = "healthy"
         except Exception:
             audit_data["services_status"][service] = "unhealthy"
     
@@ -277,8 +277,13 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 async def startup_event():
     logger.info("🚀 Meta-Genius Unified Gateway starting...")
     logger.info(f"📡 Configured services: {list(SERVICES.keys())}")
+    await upstream.start()
     logger.info("✅ Gateway ready!")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    await upstream.close()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8800)
\ No newline at end of file
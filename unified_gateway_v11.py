@@ -3,6 +3,7 @@ Meta-Genius Unified Gateway - Enhanced Version
 Combining current working implementation with improved architecture
 """
 
+import asyncio
 import uvicorn
 import json
 import time
@@ -19,6 +20,10 @@ from fastapi.responses import JSONResponse, Response
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, Field
 
+from gateway.app.upstream import ServicePool
+from gateway.app.telemetry import EventWriter, EventReader, parse_time
+from gateway.app.mswr_pool import MSWRPool, MSWROverloaded
+
 # Import working JWT functions from current system
 try:
     from .auth import verify as verify_token, sign as create_token
@@ -58,8 +63,16 @@ SERVICES = {
     "mta_quest": os.getenv("SVC_MTA_QUEST", "http://localhost:5000")
 }
 
+# Shared keep-alive connection pool (one client per service)
+upstream = ServicePool(SERVICES, default_timeout=10)
+
+# MŚWR engines built once at startup, inference runs off the event loop
+mswr_pool = MSWRPool()
+
 # Telemetry setup
 EVENTS_LOG = Path("events.jsonl")
+event_writer = EventWriter(EVENTS_LOG)
+event_reader = EventReader(EVENTS_LOG)
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -75,9 +88,8 @@ def log_telemetry_event(event_type: str, data: Dict[str, Any], user_id: str = No
         "unix_time": time.time()
     }
     
-    # Write to JSONL file
-    with open(EVENTS_LOG, "a", encoding="utf-8") as f:
-        f.write(json.dumps(event) + "\n")
+    # Queue for the background JSONL writer (never blocks the event loop)
+    event_writer.emit(event)
     
     # Also log to console for development
     logger.info(f"EVENT: {event_type} | USER: {user_id} | {json.dumps(data)}")
@@ -180,6 +192,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def startup_event():
+    await upstream.start()
+    event_writer.start()
+    await mswr_pool.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await upstream.close()
+    await asyncio.to_thread(event_writer.close)  # joins the writer thread (up to 5 s)
+    await mswr_pool.close()
+
 # --- Proxy Request Function ---
 async def proxy_request(service: str, path: str, method: str = "GET", **kwargs):
     """Enhanced proxy with telemetry"""
@@ -197,16 +221,9 @@ async def proxy_request(service: str, path: str, method: str = "GET", **kwargs):
     })
     
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            if method.upper() == "GET":
-                response = await client.get(url, **kwargs)
-            elif method.upper() == "POST":
-                response = await client.post(url, **kwargs)
-            else:
-                response = await client.request(method, url, **kwargs)
-            
-            response.raise_for_status()
-            return response.json()
+        response = await upstream.request(service, method, url, **kwargs)
+        response.raise_for_status()
+        return response.json()
             
     except httpx.RequestError as e:
         logger.error(f"Request failed: {e}")
@@ -223,13 +240,12 @@ async def system_health():
     
     for service, url in SERVICES.items():
         try:
-            async with httpx.AsyncClient(timeout=3) as client:
-                response = await client.get(f"{url}/health")
-                service_status[service] = {
-                    "status": "online",
-                    "url": url,
-                    "response_time": response.elapsed.total_seconds()
-                }
+            response = await upstream.request(service, "GET", f"{url}/health", timeout=3)
+            service_status[service] = {
+                "status": "online",
+                "url": url,
+                "response_time": response.elapsed.total_seconds()
+            }
         except Exception:
             service_status[service] = {
                 "status": "offline",
@@ -252,6 +268,11 @@ async def list_services():
         "gateway_port": GATEWAY_PORT
     }
 
+@app.get("/services/pool", tags=["System"])
+async def upstream_pool_metrics():
+    """Upstream connection pool occupancy and counters"""
+    return upstream.get_metrics()
+
 # --- Authentication Endpoints ---
 @app.post("/auth/token", tags=["Authentication"])
 async def login_for_access_token(request: TokenRequest):
@@ -313,17 +334,30 @@ async def receive_telemetry_events(events: List[EventLog], user: dict = Depends(
     }
 
 @app.get("/v1/events", tags=["Telemetry"])
-async def get_recent_events(limit: int = 50, user: dict = Depends(require_admin)):
-    """Get recent telemetry events - admin only"""
+async def get_recent_events(
+    limit: int = 50,
+    event_type: Optional[str] = None,
+    user_id: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    user: dict = Depends(require_admin)
+):
+    """Get recent telemetry events - admin only (optional type/user/time-range filters)"""
     try:
-        if not EVENTS_LOG.exists():
-            return {"events": []}
-        
-        events = []
-        with open(EVENTS_LOG, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-            for line in lines[-limit:]:
-                events.append(json.loads(line.strip()))
+        since_ts, until_ts = parse_time(since), parse_time(until)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="since/until must be unix seconds or ISO-8601")
+    
+    try:
+        # File I/O - keep it off the event loop
+        events = await asyncio.to_thread(
+            event_reader.recent,
+            limit,
+            event_type=event_type,
+            user_id=user_id,
+            since=since_ts,
+            until=until_ts
+        )
         
         return {
             "events": events,
@@ -349,6 +383,7 @@ async def admin_audit_log(user: dict = Depends(require_meta_geniusz)):
         "system_status": "operational",
         "services_count": len(SERVICES),
         "events_file_size": EVENTS_LOG.stat().st_size if EVENTS_LOG.exists() else 0,
+        "events_writer": event_writer.get_stats(),
         "gateway_version": "1.1.0"
     }
 
@@ -406,12 +441,8 @@ async def proxy_hhu_stats(user: dict = Depends(require_auth)):
 async def get_mswr_health(user: dict = Depends(require_auth)):
     """MŚWR system health and metrics"""
     try:
-        # Try to load MŚWR
-        from core.conscious_residual_inference import create_mswr_system
-        mswr = create_mswr_system()
-        
-        if mswr:
-            metrics = mswr.get_system_metrics()
+        if mswr_pool.available:
+            metrics = await mswr_pool.system_metrics()
             
             log_telemetry_event("mswr_health_check", {
                 "user": user.get("user_id"),
@@ -421,6 +452,7 @@ async def get_mswr_health(user: dict = Depends(require_auth)):
             return {
                 "status": "operational",
                 "mswr_metrics": metrics,
+                "pool": mswr_pool.get_metrics(),
                 "timestamp": datetime.now().isoformat(),
                 "zero_time_inference": True,
                 "anti_fatal_protocol": True
@@ -428,7 +460,7 @@ async def get_mswr_health(user: dict = Depends(require_auth)):
         else:
             return {
                 "status": "unavailable",
-                "error": "MŚWR module not initialized",
+                "error": mswr_pool.error or "MŚWR module not initialized",
                 "timestamp": datetime.now().isoformat()
             }
             
@@ -449,13 +481,10 @@ async def mswr_zero_time_inference(
     MŚWR Zero-Time Inference endpoint
     Achieves P=1.0 through conscious residual analysis
     """
+    if not mswr_pool.available:
+        raise HTTPException(status_code=503, detail="MŚWR system unavailable")
+    
     try:
-        from core.conscious_residual_inference import create_mswr_system
-        mswr = create_mswr_system()
-        
-        if not mswr:
-            raise HTTPException(status_code=503, detail="MŚWR system unavailable")
-        
         # Extract input and context
         input_data = inference_request.get("input", "")
         context = inference_request.get("context", {})
@@ -465,7 +494,7 @@ async def mswr_zero_time_inference(
         context["user_role"] = user.get("role")
         
         # Perform Zero-Time Inference
-        result = mswr.zero_time_inference(input_data, context)
+        result = await mswr_pool.infer(input_data, context)
         
         log_telemetry_event("mswr_inference", {
             "user": user.get("user_id"),
@@ -481,6 +510,8 @@ async def mswr_zero_time_inference(
             "timestamp": datetime.now().isoformat()
         }
         
+    except MSWROverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except Exception as e:
         logger.error(f"MŚWR inference failed: {e}")
         raise HTTPException(status_code=500, detail=f"MŚWR inference error: {str(e)}")
@@ -491,13 +522,10 @@ async def get_system_residuals(user: dict = Depends(require_admin)):
     Get current system residuals analysis
     Admin-only endpoint for system diagnostics
     """
+    if not mswr_pool.available:
+        raise HTTPException(status_code=503, detail="MŚWR system unavailable")
+    
     try:
-        from core.conscious_residual_inference import create_mswr_system
-        mswr = create_mswr_system()
-        
-        if not mswr:
-            raise HTTPException(status_code=503, detail="MŚWR system unavailable")
-        
         # Analyze current system state for residuals
         test_input = "System diagnostic scan"
         test_context = {
@@ -506,7 +534,7 @@ async def get_system_residuals(user: dict = Depends(require_admin)):
             "timestamp": datetime.now().isoformat()
         }
         
-        result = mswr.zero_time_inference(test_input, test_context)
+        result = await mswr_pool.infer(test_input, test_context)
         
         residual_summary = {
             "total_residuals": result.get("residuals_detected", 0),
@@ -529,6 +557,8 @@ async def get_system_residuals(user: dict = Depends(require_admin)):
             "timestamp": datetime.now().isoformat()
         }
         
+    except MSWROverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except Exception as e:
         logger.error(f"MŚWR residuals analysis failed: {e}")
         raise HTTPException(status_code=500, detail=f"Residuals analysis error: {str(e)}")
@@ -542,13 +572,10 @@ async def trigger_system_healing(
     Trigger intensive system healing
     MetaGeniusz-only endpoint for manual system recovery
     """
+    if not mswr_pool.available:
+        raise HTTPException(status_code=503, detail="MŚWR system unavailable")
+    
     try:
-        from core.conscious_residual_inference import create_mswr_system
-        mswr = create_mswr_system()
-        
-        if not mswr:
-            raise HTTPException(status_code=503, detail="MŚWR system unavailable")
-        
         healing_context = {
             "manual_trigger": True,
             "operator": user.get("user_id"),
@@ -558,14 +585,15 @@ async def trigger_system_healing(
         if healing_request:
             healing_context.update(healing_request)
         
-        # Trigger intensive healing protocol
-        result = mswr.zero_time_inference(
-            "Manual system healing protocol initiated",
-            healing_context
-        )
+        # Trigger intensive healing protocol and export healing history (same engine)
+        def heal(mswr):
+            result = mswr.zero_time_inference(
+                "Manual system healing protocol initiated",
+                healing_context
+            )
+            return result, mswr.export_healing_history()
         
-        # Export healing history
-        export_path = mswr.export_healing_history()
+        result, export_path = await mswr_pool.run(heal)
         
         healing_summary = {
             "healing_triggered": True,
@@ -589,6 +617,8 @@ async def trigger_system_healing(
             "message": "Intensive system healing protocol executed"
         }
         
+    except MSWROverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except Exception as e:
         logger.error(f"MŚWR healing failed: {e}")
         raise HTTPException(status_code=500, detail=f"System healing error: {str(e)}")
@@ -598,14 +628,11 @@ async def get_mswr_detailed_metrics(user: dict = Depends(require_admin)):
     """
     Get detailed MŚWR metrics and performance data
     """
+    if not mswr_pool.available:
+        raise HTTPException(status_code=503, detail="MŚWR system unavailable")
+    
     try:
-        from core.conscious_residual_inference import create_mswr_system
-        mswr = create_mswr_system()
-        
-        if not mswr:
-            raise HTTPException(status_code=503, detail="MŚWR system unavailable")
-        
-        metrics = mswr.get_system_metrics()
+        metrics = await mswr_pool.system_metrics()
         
         # Enhanced metrics for admin view
         enhanced_metrics = {
@@ -616,6 +643,7 @@ async def get_mswr_detailed_metrics(user: dict = Depends(require_admin)):
                 "current_entropy_level": metrics.get("current_entropy", 0.0),
                 "system_state": metrics.get("current_state", "unknown")
             },
+            "pool": mswr_pool.get_metrics(),
             "system_info": {
                 "zero_time_inference_enabled": True,
                 "anti_fatal_protocol_enabled": True,